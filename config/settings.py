@@ -34,6 +34,75 @@ BROWSER_TYPE = "chrome"
 WINDOW_SIZE = (1366, 768)
 PAGE_LOAD_TIMEOUT = 30
 IMPLICIT_WAIT = 10
+# 浏览器配置档：default 为常规配置；lean 为低占用配置（小窗口、关闭后台服务、限制渲染进程与 JS 堆），
+# 适合单机运行大量并发浏览器
+BROWSER_PROFILE = "default"
+LEAN_WINDOW_SIZE = (800, 600)            # 过小会触发页面的移动端布局
+LEAN_RENDERER_PROCESS_LIMIT = 2
+LEAN_JS_HEAP_MB = 256
+# 驱动程序缓存：按浏览器主版本号记录驱动路径，命中时不再调用 webdriver-manager
+DRIVER_CACHE_FILE = "data/.driver_cache.json"
+DRIVER_OFFLINE = False                   # 离线模式：从不调用 webdriver-manager
+
+# 资源拦截：Chrome 通过 CDP Network.setBlockedURLs 按 URL 模式拦截，Firefox 用首选项近似实现
+# 预设：none 不拦截；light 拦截图片和音视频；
+# data-only 另拦截样式表、字体和统计/跟踪脚本，保留渲染职位卡片所需的页面脚本
+RESOURCE_BLOCKING = "data-only"
+RESOURCE_BLOCK_PRESETS = {
+    "none": [],
+    "light": ["image", "media"],
+    "data-only": ["image", "media", "font", "stylesheet", "tracker"],
+}
+BLOCKED_URL_PATTERNS = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp"],
+    "media": ["*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.ogg", "*.wav"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "stylesheet": ["*.css"],
+    "tracker": [
+        "*hm.baidu.com*", "*cnzz.com*", "*growingio.com*", "*sensorsdata*",
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    ],
+}
+EXTRA_BLOCKED_URLS = []                  # 额外拦截的 URL 模式，与预设叠加
+
+# 数据提取配置
+# script: 单次 execute_script 批量提取整页；element: 逐个元素 find_element 提取
+# lxml: 获取一次 page_source 快照后用 lxml 在后台线程解析
+# network: 从浏览器性能日志读取搜索接口的 JSON 响应，不解析 DOM（仅 Chrome）
+EXTRACT_MODE = "script"
+# 可选字段（选择器键），缺失时记为 None 而不是丢弃整条职位
+OPTIONAL_FIELDS = ["salary", "location", "link"]
+
+# 网络捕获配置（EXTRACT_MODE = "network"）
+SEARCH_API_PATTERN = r"zhaopin\.com/api/.*search"   # 搜索接口 URL 正则
+SEARCH_API_LIST_PATH = ""                           # 职位列表在响应中的点分路径，空表示自动查找
+# 输出字段名 -> 接口字段（支持点分路径）
+SEARCH_API_FIELDS = {
+    "职位名称": "name",
+    "公司名称": "companyName",
+    "薪资": "salary60",
+    "工作地点": "workCity",
+    "职位ID": "number",
+    "更新时间": "publishTime",
+    "职位链接": "positionURL",
+}
+
+# HTTP 直连配置
+# browser: 浏览器加载每一页；http: 登录后复用浏览器 Cookie 直接请求，遇到验证页面时回退浏览器
+# tabs: 在同一浏览器中开多个标签页同时加载后续页面，共享登录态（需要页码参数翻页）
+FETCH_MODE = "browser"
+TAB_COUNT = 4                # tabs 模式的标签页数量
+TAB_LOAD_TIMEOUT = 15        # 单个标签页等待数据就绪的超时（秒），超时后重新加载一次
+SEARCH_API_URL = ""          # 搜索接口地址模板（含 {keyword} 与 {page}），为空时请求搜索页 HTML
+HTTP_POOL_SIZE = 10
+HTTP_TIMEOUT = 10
+CHALLENGE_URL_MARKERS = ["passport.zhaopin.com", "/verify", "captcha"]
+CHALLENGE_BODY_MARKERS = ["nc_iconfont", "安全验证", "滑动验证"]
+
+# 分页配置
+# url: 按页码参数直接打开目标页，失败时回退为点击翻页；click: 逐页点击下一页
+PAGINATION_MODE = "url"
+SEARCH_PAGE_PARAM = "pageIndex"
 
 # 登录模式配置
 LOGIN_MODE = "auto"
@@ -57,7 +126,19 @@ ENABLE_PASSWORD_ENCRYPTION = True
 SAVE_CREDENTIALS = False     # 不保存登录凭据，关闭该功能
 CREDENTIALS_FILE = "data/.credentials"
 MAX_LOGIN_ATTEMPTS = 3
-LOGIN_RETRY_DELAY = 3
+LOGIN_RETRY_DELAY = 3        # 首次重试前的退避时间（秒），之后逐次加倍
+LOGIN_BACKOFF_MAX = 10       # 退避时间上限（秒）
+LOGIN_DEADLINE = 90          # 整个登录流程（含全部重试）的总时限（秒）
+LOGIN_STEP_TIMEOUT = 10      # 单个步骤等待就绪条件的上限（秒），同时受总时限约束
+LOGIN_POLL_INTERVAL = 0.1    # 就绪条件的轮询间隔（秒）
+LOGIN_TYPING_DELAY = (0.05, 0.15)   # 模拟人工输入时每个字符的随机间隔（秒）
+# 错误提示包含以下内容时视为账号或密码错误，立即放弃而不重试
+LOGIN_REJECT_MARKERS = ["密码错误", "密码不正确", "账号或密码", "用户名或密码", "账号不存在"]
+# 登录会话复用：登录成功后把 Cookie 和 localStorage 加密保存，之后启动时先注入并探测，失效才完整登录
+SESSION_REUSE = True
+SESSION_FILE = "data/.session"
+SESSION_MAX_AGE = 7 * 24 * 3600          # 会话距最近一次登录或成功复用超过该时长（秒）直接视为过期
+SESSION_PROBE_URL = "https://i.zhaopin.com/"   # 需要登录才能访问的页面，未登录时跳转到登录页
 
 # 密码要求
 PASSWORD_MIN_LENGTH = 6
@@ -66,22 +147,81 @@ PASSWORD_REQUIRE_NUMBER = False
 PASSWORD_REQUIRE_UPPERCASE = False
 
 # 反爬虫与代理
-RANDOM_DELAY_MIN = 2
-RANDOM_DELAY_MAX = 5
+# 自适应节流：按主机的令牌桶，变慢/刷新/验证码时降速，正常时逐步恢复
+PACER_RATE = 0.5             # 初始速率（次/秒）
+PACER_MIN_RATE = 0.1
+PACER_MAX_RATE = 2.0
+PACER_BURST = 2              # 令牌桶容量
+PACER_JITTER = 0.5           # 每次请求额外随机延时上限（秒）
+PACER_SLOW_THRESHOLD = 5.0   # 单次加载超过该秒数视为慢响应
+PACER_RECOVER_STEP = 0.1     # 正常响应后速率增加量
 USE_PROXY = False
 #代理
 USE_PROXY_POOL = True
 PROXY_POOL_FROM_FILE = True
 PROXY_POOL_FILE_PATH = "./data/proxies.txt"
 PROXY_POOL_URL = "http://127.0.0.1:7890/random"
+# 远程代理池客户端：长连接批量预取到本地缓冲区，低于低水位时后台补充
+PROXY_POOL_BATCH_URL = ""            # 批量接口（返回 JSON 列表或每行一个代理），为空时多次调用 PROXY_POOL_URL
+PROXY_BATCH_SIZE = 20
+PROXY_LOW_WATER = 5
+PROXY_TTL = 120                      # 代理从获取起的有效期（秒），过期后不再分配
+PROXY_GET_TIMEOUT = 5                # 缓冲区为空时等待补充的最长时间（秒）
+
+# 代理健康检查：并发探测代理，按成功率和延迟加权选择，失效代理移出并在后台重新验证
+PROXY_HEALTH_CHECK = True
+PROXY_TEST_URL = "https://www.zhaopin.com/"   # 探测地址，可换成本地测试服务
+PROXY_TEST_TIMEOUT = 5
+PROXY_CHECK_WORKERS = 32
+PROXY_STATS_WINDOW = 10                       # 滚动统计最近多少次结果
+PROXY_MAX_FAILURES = 3                        # 连续失败多少次后熔断
+PROXY_REVALIDATE_INTERVAL = 300               # 后台重新验证间隔（秒）
+# 代理熔断：连续失败 PROXY_MAX_FAILURES 次后熔断，冷却期满后放行一次试探，试探失败则冷却期加倍
+PROXY_BREAKER_COOLDOWN = 60
+PROXY_BREAKER_MAX_COOLDOWN = 1800
+PROXY_SCOREBOARD_FILE = "data/proxy_scoreboard.json"   # 代理健康记录，跨运行保留
+PROXY_SCOREBOARD_SAVE_INTERVAL = 30                    # 自动保存间隔（秒）
+
+# 并行爬取
+CRAWL_WORKERS = 1            # 并行浏览器数量，大于 1 时启用多浏览器协调器
+CRAWL_RATE_LIMIT = 1.0       # 全局页面请求速率上限（页/秒），作为共享节流器的最大速率，<= 0 表示不限速
+
+# 浏览器池：预先启动浏览器，按页数或内存占用回收（并行爬取和单浏览器顺序爬取均生效）
+BROWSER_RECYCLE_PAGES = 200          # 单个浏览器处理多少页后回收，0 表示不限
+BROWSER_RECYCLE_RSS_MB = 1500        # 浏览器进程树常驻内存超过该值（MB）后回收，0 表示不限
+BROWSER_PREWARM_RATIO = 0.8          # 达到回收阈值的该比例时提前预热替补浏览器
 
 # 重试设置
 MAX_RETRIES = 3
 RETRY_DELAY = 5
 
+# 职位详情补充
+ENRICH_DETAILS = False
+DETAIL_WORKERS = 4
+DETAIL_RATE_LIMIT = 2.0                  # 详情页全局请求速率上限（次/秒），<= 0 表示不限速
+DETAIL_CACHE_DIR = "data/cache/details"
+DETAIL_CACHE_TTL = 7 * 24 * 3600         # 详情缓存有效期（秒）
+
+# 页面录制（离线回放与基准测试用）
+FIXTURE_RECORD = False
+FIXTURE_FILE = "data/fixtures/pages.jsonl.gz"
+
+# 断点续爬
+CHECKPOINT_ENABLED = True
+CHECKPOINT_FILE = "data/checkpoints.db"
+
+# 跨运行去重与增量爬取
+FINGERPRINT_ENABLED = True
+FINGERPRINT_FILE = "data/fingerprints.db"
+FINGERPRINT_ONLY_NEW = True  # 只输出之前运行中未出现过的职位
+KNOWN_PAGES_STOP = 2         # 连续多少页全是已知职位时停止翻页，0 表示不提前停止
+
 # 输出设置
 OUTPUT_DIR = "data/output"
 OUTPUT_FILENAME = "python_jobs.xlsx"
+# 边爬边写入的流式输出：jsonl / csv，空字符串表示关闭；每爬完一页即写入清洗后的数据，内存中不保留数据
+STREAM_OUTPUT = "jsonl"
+STREAM_EXCEL_EXPORT = False  # 流式输出结束后是否读取输出文件导出 Excel 分类文件（需一次性载入全部数据）
 
 # URL配置
 URLS = {
@@ -125,13 +265,37 @@ SELECTORS = {
             "company": ".position-card__company__name",
             "salary": ".position-card__salary",
             "location": ".position-card__city-name",
+            "link": "a[href]",
             "pagination": ".pagination__inner",
             "next_page": ".pagination__arrow-next:not(.disabled)",
-            "current_page": ".pagination__number--active"
+            "current_page": ".pagination__number--active",
+            # 超出最后一页或无匹配职位时显示的空结果提示，按站点实际页面调整
+            "no_results": ".search-empty, .position-list--empty"
+        },
+        "detail": {
+            "description": ".describtion__detail-content",
+            "requirements": ".describtion__skills-content",
+            "company_size": ".company__size"
         }
     }
 }
 
+# 职位字段：(输出字段名, 选择器键[, 属性名])，给出属性名时取属性值而不是文本
+JOB_FIELDS = (
+    ("职位名称", "title"),
+    ("公司名称", "company"),
+    ("薪资", "salary"),
+    ("工作地点", "location"),
+    ("职位链接", "link", "href"),
+)
+
+# 职位详情字段：输出字段名 -> 详情页选择器键
+DETAIL_FIELDS = (
+    ("职位描述", "description"),
+    ("任职要求", "requirements"),
+    ("公司规模", "company_size"),
+)
+
 def generate_encryption_key():
     return Fernet.generate_key()
 
@@ -11,25 +11,65 @@ from selenium.webdriver.firefox.service import Service as FirefoxService
 from webdriver_manager.chrome import ChromeDriverManager
 from webdriver_manager.firefox import GeckoDriverManager
 from fake_useragent import UserAgent
-from selenium.common.exceptions import WebDriverException
+from selenium.common.exceptions import WebDriverException, SessionNotCreatedException
 
 from utils.logger import logger
 from utils.proxys_pool import ProxyPoolManager
+from utils.driver_cache import DriverCache
 from config.settings import (
     HEADLESS, BROWSER_TYPE, WINDOW_SIZE,
-    PAGE_LOAD_TIMEOUT, IMPLICIT_WAIT
+    BROWSER_PROFILE, LEAN_WINDOW_SIZE, LEAN_RENDERER_PROCESS_LIMIT, LEAN_JS_HEAP_MB,
+    PAGE_LOAD_TIMEOUT, IMPLICIT_WAIT, EXTRACT_MODE,
+    RESOURCE_BLOCKING, RESOURCE_BLOCK_PRESETS, BLOCKED_URL_PATTERNS, EXTRA_BLOCKED_URLS
 )
 
+def process_tree_rss_mb(pid):
+    """进程及其全部子进程的常驻内存之和（MB），读取 /proc，非 Linux 系统返回 None"""
+    if not pid or not os.path.isdir("/proc"):
+        return None
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", 'r') as f:
+                # 进程名可能包含空格，ppid 取最后一个 ')' 之后的第二个字段
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    total_kb = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            with open(f"/proc/{current}/status", 'r') as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except (OSError, ValueError):
+            pass
+        stack.extend(children.get(current, []))
+    return total_kb / 1024
+
 class BrowserManager:
     """多浏览器支持的高级浏览器管理器"""
 
-    def __init__(self, browser_type=None, headless=None, enable_images=False, proxy=None, driver_path=None):
+    def __init__(self, browser_type=None, headless=None, enable_images=False, proxy=None, driver_path=None,
+                 capture_network=None, resource_blocking=None, profile=None):
         self.browser_type = (browser_type or BROWSER_TYPE).lower()
         self.headless = HEADLESS if headless is None else headless
         self.enable_images = enable_images
         self.proxy = proxy
         self.driver_path = driver_path
+        self.capture_network = EXTRACT_MODE == "network" if capture_network is None else capture_network
+        self.blocked_categories = RESOURCE_BLOCK_PRESETS[resource_blocking or RESOURCE_BLOCKING]
+        self.lean = (profile or BROWSER_PROFILE) == "lean"
+        self.window_size = LEAN_WINDOW_SIZE if self.lean else WINDOW_SIZE
         self.driver = None
+        self.driver_cache = DriverCache()
         self.ua = UserAgent()
         self._silence_logs()
 
@@ -58,7 +98,7 @@ class BrowserManager:
 
     def _create_chrome(self):
         options = ChromeOptions()
-        options.add_argument(f"--window-size={WINDOW_SIZE[0]},{WINDOW_SIZE[1]}")
+        options.add_argument(f"--window-size={self.window_size[0]},{self.window_size[1]}")
         options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36")
 
 
@@ -74,28 +114,84 @@ class BrowserManager:
         options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
         options.add_experimental_option("useAutomationExtension", False)
 
+        if self.lean:
+            self._add_lean_chrome_arguments(options)
+
         # 图片加载控制
         prefs = {
             "profile.default_content_setting_values.images": 1 if self.enable_images else 2
         }
         options.add_experimental_option("prefs", prefs)
 
-        service = ChromeService(
-            executable_path=self.driver_path or ChromeDriverManager().install(),
-            log_path=os.devnull
-        )
-        return webdriver.Chrome(service=service, options=options)
+        # 网络捕获：开启性能日志以读取接口响应
+        if self.capture_network:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+        driver_path = self.driver_path or self.driver_cache.resolve("chrome", lambda: ChromeDriverManager().install())
+        service = ChromeService(executable_path=driver_path, log_path=os.devnull)
+        try:
+            return webdriver.Chrome(service=service, options=options)
+        except SessionNotCreatedException:
+            self._evict_cached_driver("chrome", driver_path)
+            raise
+
+    @staticmethod
+    def _add_lean_chrome_arguments(options):
+        """低占用配置：关闭后台服务、扩展、同步和组件更新，限制渲染进程数与 JS 堆大小"""
+        for argument in (
+            "--disable-background-networking",
+            "--disable-extensions",
+            "--disable-sync",
+            "--disable-component-update",
+            "--disable-default-apps",
+            "--disable-client-side-phishing-detection",
+            "--disable-breakpad",
+            "--disable-dev-shm-usage",
+            "--no-first-run",
+            "--metrics-recording-only",
+            "--mute-audio",
+            # 站点隔离会为每个站点单独起渲染进程，使进程数限制失效
+            "--disable-features=Translate,MediaRouter,OptimizationHints,IsolateOrigins,site-per-process",
+            f"--renderer-process-limit={LEAN_RENDERER_PROCESS_LIMIT}",
+            f"--js-flags=--max-old-space-size={LEAN_JS_HEAP_MB}",
+        ):
+            options.add_argument(argument)
 
     def _create_firefox(self):
         options = FirefoxOptions()
         if self.headless:
             options.add_argument("--headless")
+        if self.lean:
+            options.add_argument(f"--width={self.window_size[0]}")
+            options.add_argument(f"--height={self.window_size[1]}")
+            options.set_preference("dom.ipc.processCount", LEAN_RENDERER_PROCESS_LIMIT)
+            options.set_preference("extensions.update.enabled", False)
+            options.set_preference("app.update.auto", False)
+            options.set_preference("browser.safebrowsing.malware.enabled", False)
+            options.set_preference("browser.safebrowsing.phishing.enabled", False)
+            options.set_preference("datareporting.policy.dataSubmissionEnabled", False)
+            options.set_preference("toolkit.telemetry.enabled", False)
         options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36")
 
 
         if not self.enable_images:
             options.set_preference("permissions.default.image", 2)
 
+        if self.capture_network:
+            logger.warning("⚠️ Firefox 不支持性能日志网络捕获，将回退为 DOM 提取")
+            self.capture_network = False
+
+        # 资源拦截：Firefox 没有按 URL 拦截的接口，用首选项近似实现（样式表无法单独禁用）
+        if "media" in self.blocked_categories:
+            options.set_preference("media.autoplay.default", 5)
+            options.set_preference("media.mp4.enabled", False)
+        if "font" in self.blocked_categories:
+            options.set_preference("browser.display.use_document_fonts", 0)
+            options.set_preference("gfx.downloadable_fonts.enabled", False)
+        if "tracker" in self.blocked_categories:
+            options.set_preference("privacy.trackingprotection.enabled", True)
+
         if self.proxy:
             ip_port = self.proxy.replace("http://", "").replace("https://", "").replace("socks5://", "")
             options.set_preference("network.proxy.type", 1)
@@ -104,11 +200,18 @@ class BrowserManager:
             options.set_preference("network.proxy.ssl", ip_port.split(":")[0])
             options.set_preference("network.proxy.ssl_port", int(ip_port.split(":")[1]))
 
-        service = FirefoxService(
-            executable_path=self.driver_path or GeckoDriverManager().install(),
-            log_path=os.devnull
-        )
-        return webdriver.Firefox(service=service, options=options)
+        driver_path = self.driver_path or self.driver_cache.resolve("firefox", lambda: GeckoDriverManager().install())
+        service = FirefoxService(executable_path=driver_path, log_path=os.devnull)
+        try:
+            return webdriver.Firefox(service=service, options=options)
+        except SessionNotCreatedException:
+            self._evict_cached_driver("firefox", driver_path)
+            raise
+
+    def _evict_cached_driver(self, browser_type, driver_path):
+        """缓存的驱动无法创建会话（多为浏览器已升级），移除缓存条目，下次启动重新解析"""
+        if driver_path and not self.driver_path:
+            self.driver_cache.evict(browser_type, driver_path)
 
     def _post_configure(self):
         """页面加载设置与防检测 JavaScript"""
@@ -119,10 +222,48 @@ class BrowserManager:
         self.driver.implicitly_wait(IMPLICIT_WAIT)
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
 
-        if not self.headless:
+        if not self.headless and not self.lean:
             self.driver.maximize_window()
 
         logger.info(f"✅ 浏览器已创建: {self.browser_type}, 无头: {self.headless}, 图片: {self.enable_images}, 代理: {self.proxy}")
+        memory = self.memory_mb()
+        if memory is not None:
+            logger.info(f"📏 浏览器内存占用: {memory:.0f}MB（配置档: {'lean' if self.lean else 'default'}）")
+
+    def blocked_url_patterns(self):
+        """当前拦截预设对应的 URL 模式列表"""
+        patterns = [p for category in self.blocked_categories for p in BLOCKED_URL_PATTERNS[category]]
+        if self.blocked_categories:
+            patterns.extend(EXTRA_BLOCKED_URLS)
+        return patterns
+
+    def apply_resource_blocking(self, driver=None):
+        """
+        通过 CDP 为当前标签页启用资源拦截（仅 Chrome）
+
+        拦截规则只对当前标签页生效，新开标签页需要再次调用；登录页的滑块等依赖样式表，
+        因此建议在登录完成后再调用。Firefox 的拦截在启动时通过首选项完成，这里不做处理。
+        """
+        driver = driver or self.driver
+        patterns = self.blocked_url_patterns()
+        if not patterns or self.browser_type != "chrome":
+            return False
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        except WebDriverException as e:
+            logger.warning(f"⚠️ 启用资源拦截失败: {e}")
+            return False
+        logger.info(f"🚫 已启用资源拦截（{'、'.join(self.blocked_categories)}），共 {len(patterns)} 条规则")
+        return True
+
+    def memory_mb(self):
+        """当前浏览器（驱动服务及其启动的浏览器进程）占用的常驻内存（MB），无法测量时返回 None"""
+        try:
+            pid = self.driver.service.process.pid
+        except AttributeError:
+            return None
+        return process_tree_rss_mb(pid)
 
     def close_browser(self):
         """安全关闭浏览器"""
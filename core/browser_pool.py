@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+浏览器池模块 - 在后台预先启动并配置好浏览器，按需租借给爬虫；
+浏览器处理页数或内存占用达到阈值后回收，并提前预热替补浏览器
+"""
+
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from core.browser import BrowserManager
+from utils.logger import logger
+from config.settings import (
+    CRAWL_WORKERS, BROWSER_RECYCLE_PAGES, BROWSER_RECYCLE_RSS_MB, BROWSER_PREWARM_RATIO
+)
+
+
+class PooledBrowser:
+    """池中的一个浏览器"""
+
+    def __init__(self, slot, manager):
+        self.slot = slot
+        self.manager = manager
+        self.driver = manager.driver
+        self.pages = 0
+        self.rss_mb = None
+        self.created_at = time.monotonic()
+        self.crawler = None          # 租借方可在此缓存与该浏览器绑定的爬虫实例
+        self.replacement_started = False
+
+
+class BrowserLease:
+    """
+    单个租借方持续占用池中的浏览器（如单浏览器顺序爬取）
+
+    每处理一批页面调用一次 renew 归还页数并重新租借，浏览器达到回收阈值后自动换成预热好的替补浏览器
+    """
+
+    def __init__(self, pool, timeout=None):
+        self.pool = pool
+        self.timeout = timeout
+        self.browser = pool.lease(timeout)
+
+    @property
+    def driver(self):
+        return self.browser.driver
+
+    @property
+    def manager(self):
+        return self.browser.manager
+
+    def renew(self, pages):
+        """归还本批处理的页数并重新租借，返回当前可用的 driver；浏览器被回收时为替补浏览器的 driver"""
+        browser, self.browser = self.browser, None
+        self.pool.release(browser, pages=pages)
+        self.browser = self.pool.lease(self.timeout)
+        return self.browser.driver
+
+    def release(self, broken=False):
+        """结束租借"""
+        if self.browser:
+            self.pool.release(self.browser, broken=broken)
+            self.browser = None
+
+
+class BrowserPool:
+    """预热浏览器池"""
+
+    def __init__(self, size=None, factory=None, setup=None, max_pages=None, max_rss_mb=None,
+                 prewarm_ratio=None, max_start_failures=3, teardown=None):
+        """
+        Args:
+            size: 同时保持就绪的浏览器数量
+            factory: 启动浏览器的函数 factory(slot) -> 已调用 create_browser 的 BrowserManager
+            setup: 启动后的初始化回调 setup(manager)，如登录，返回 False 视为失败
+            max_pages: 单个浏览器处理多少页后回收，0 表示不限
+            max_rss_mb: 浏览器进程树内存超过该值（MB）后回收，0 表示不限
+            prewarm_ratio: 达到阈值的该比例时提前预热替补浏览器
+            max_start_failures: 连续启动失败次数上限，超过后 lease 抛出异常
+            teardown: 浏览器关闭前的回调 teardown(manager)，如释放代理租约
+        """
+        self.size = size or CRAWL_WORKERS
+        self.factory = factory or self._default_factory
+        self.setup = setup
+        self.teardown = teardown
+        self.max_pages = BROWSER_RECYCLE_PAGES if max_pages is None else max_pages
+        self.max_rss_mb = BROWSER_RECYCLE_RSS_MB if max_rss_mb is None else max_rss_mb
+        self.prewarm_ratio = prewarm_ratio or BROWSER_PREWARM_RATIO
+        self.max_start_failures = max_start_failures
+
+        self.ready = queue.Queue()
+        self._browsers = set()
+        self._warming = 0
+        self._start_failures = 0
+        self._slots = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.size + 1, thread_name_prefix="browser-pool")
+
+    def start(self):
+        """在后台启动 size 个浏览器，立即返回"""
+        for _ in range(self.size):
+            self._warm()
+        return self
+
+    def lease(self, timeout=None):
+        """
+        租借一个就绪的浏览器，必要时等待预热完成
+
+        Raises:
+            RuntimeError: 浏览器池已关闭，或连续启动失败次数过多
+            TimeoutError: 超过 timeout 秒仍没有可用浏览器
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                return self.ready.get(timeout=0.5)
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("浏览器池已关闭")
+                idle = self._warming == 0 and not self._browsers
+                if idle and self._start_failures >= self.max_start_failures:
+                    raise RuntimeError(f"浏览器连续启动失败 {self._start_failures} 次")
+            self._replenish()
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError("等待可用浏览器超时")
+
+    def adopt(self, manager):
+        """
+        把已在池外启动并初始化好的浏览器（如需要交互式登录的首个浏览器）加入池中，
+        之后与池中启动的浏览器一样租借和回收
+
+        Returns:
+            PooledBrowser: 已放入就绪队列的浏览器
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("浏览器池已关闭")
+            self._slots += 1
+            browser = PooledBrowser(self._slots, manager)
+            self._browsers.add(browser)
+        self.ready.put(browser)
+        return browser
+
+    def release(self, browser, pages=0, broken=False):
+        """
+        归还浏览器
+
+        Args:
+            pages: 本次租借期间处理的页数
+            broken: 浏览器已不可用（异常、崩溃等），直接回收
+        """
+        browser.pages += pages
+        if pages and self.max_rss_mb:
+            browser.rss_mb = browser.manager.memory_mb()
+
+        if broken or self._should_recycle(browser, 1.0):
+            reason = "异常" if broken else f"已处理 {browser.pages} 页，内存 {browser.rss_mb or 0:.0f}MB"
+            self._retire(browser, reason)
+            return
+
+        if not browser.replacement_started and self._should_recycle(browser, self.prewarm_ratio):
+            browser.replacement_started = True
+            logger.info(f"[B{browser.slot}] 接近回收阈值，提前预热替补浏览器")
+            self._warm()
+        self.ready.put(browser)
+
+    def close(self):
+        """关闭浏览器池及其中的全部浏览器"""
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            browsers = list(self._browsers)
+            self._browsers.clear()
+        self._report_memory(browsers)
+        for browser in browsers:
+            self._close_manager(browser.manager)
+        logger.info(f"🧹 浏览器池已关闭，共关闭 {len(browsers)} 个浏览器")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @staticmethod
+    def _report_memory(browsers):
+        """记录每个浏览器实例的内存占用"""
+        usage = [m for m in (browser.manager.memory_mb() for browser in browsers) if m is not None]
+        if usage:
+            logger.info(
+                f"📏 浏览器内存占用: 平均 {sum(usage) / len(usage):.0f}MB，"
+                f"最高 {max(usage):.0f}MB，共 {len(usage)} 个实例"
+            )
+
+    def _should_recycle(self, browser, ratio):
+        if self.max_pages and browser.pages >= self.max_pages * ratio:
+            return True
+        return bool(self.max_rss_mb and browser.rss_mb and browser.rss_mb >= self.max_rss_mb * ratio)
+
+    def _replenish(self):
+        """已启动和正在预热的浏览器少于 size 时补足；连续启动失败达到上限后不再补充"""
+        slots = []
+        with self._lock:
+            if self._closed or self._start_failures >= self.max_start_failures:
+                return
+            for _ in range(self.size - len(self._browsers) - self._warming):
+                self._warming += 1
+                self._slots += 1
+                slots.append(self._slots)
+        for slot in slots:
+            self._executor.submit(self._launch, slot)
+
+    def _warm(self):
+        """提交一个后台启动任务"""
+        with self._lock:
+            if self._closed:
+                return
+            self._warming += 1
+            self._slots += 1
+            slot = self._slots
+        self._executor.submit(self._launch, slot)
+
+    def _launch(self, slot):
+        """启动并初始化一个浏览器，完成后放入就绪队列"""
+        started = time.monotonic()
+        manager = None
+        try:
+            manager = self.factory(slot)
+            if self.setup and self.setup(manager) is False:
+                raise RuntimeError("浏览器初始化失败")
+        except Exception as e:
+            logger.warning(f"[B{slot}] 浏览器启动失败: {str(e)}")
+            if manager:
+                self._close_manager(manager)
+            with self._lock:
+                self._warming -= 1
+                self._start_failures += 1
+            self._replenish()
+            return
+
+        browser = PooledBrowser(slot, manager)
+        with self._lock:
+            self._warming -= 1
+            self._start_failures = 0
+            closed = self._closed
+            if not closed:
+                self._browsers.add(browser)
+        if closed:
+            self._close_manager(manager)
+            return
+        logger.info(f"[B{slot}] 浏览器已预热，耗时 {time.monotonic() - started:.1f} 秒")
+        self.ready.put(browser)
+
+    def _retire(self, browser, reason):
+        """回收浏览器；尚未预热替补时补充一个"""
+        with self._lock:
+            self._browsers.discard(browser)
+            closed = self._closed
+        logger.info(f"♻️ [B{browser.slot}] 回收浏览器（{reason}）")
+        if not closed:
+            self._executor.submit(self._close_manager, browser.manager)
+            self._replenish()
+        else:
+            self._close_manager(browser.manager)
+
+    def _close_manager(self, manager):
+        if self.teardown:
+            try:
+                self.teardown(manager)
+            except Exception as e:
+                logger.warning(f"浏览器关闭回调异常: {str(e)}")
+        manager.close_browser()
+
+    @staticmethod
+    def _default_factory(slot):
+        manager = BrowserManager()
+        manager.create_browser()
+        return manager
@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+并行爬取协调器 - 从浏览器池租借多个无头浏览器，从共享任务队列中领取 (关键词, 页码) 任务
+"""
+
+import queue
+import threading
+
+import requests
+from selenium.common.exceptions import (
+    WebDriverException, TimeoutException, NoSuchElementException, StaleElementReferenceException
+)
+
+from core.browser import BrowserManager
+from core.browser_pool import BrowserPool
+from core.crawler import ZhilianCrawler
+from core.session import ChallengeDetected
+from utils.logger import logger
+from utils.rate_limiter import AdaptivePacer
+from utils.fingerprint import job_fingerprint
+from config.settings import CRAWL_WORKERS, CRAWL_RATE_LIMIT, MAX_RETRIES
+
+
+class CrawlCoordinator:
+    """多浏览器并行爬取协调器，按页码分片并按页序合并结果"""
+
+    def __init__(self, workers=None, proxies=None, headless=True, rate_limit=None,
+                 max_retries=None, login=None, recorder=None, proxy_pool=None, on_page=None):
+        """
+        Args:
+            workers: 并行浏览器数量
+            proxies: 代理列表，按浏览器序号轮流分配；为空时直连
+            headless: 是否使用无头模式
+            rate_limit: 全局页面请求速率上限（页/秒），所有浏览器共享同一节流器
+            max_retries: 单页最大尝试次数
+            login: 可选的登录回调 login(driver) -> bool，每个浏览器启动后调用一次
+            recorder: 可选的 FixtureRecorder，所有浏览器共享，录制抓取到的结果页
+            proxy_pool: 可选的 ProxyPoolManager，每个浏览器在生命周期内租用固定代理，
+                页面成败反馈给代理的熔断器；提供时忽略 proxies
+            on_page: 可选回调 on_page(keyword, page, page_data)，每页完成后立即调用（按完成顺序，未跨关键词去重）
+        """
+        self.workers = workers or CRAWL_WORKERS
+        self.proxies = list(proxies or [])
+        self.headless = headless
+        self.pacer = AdaptivePacer(max_rate=CRAWL_RATE_LIMIT if rate_limit is None else rate_limit)
+        self.max_retries = max_retries or MAX_RETRIES
+        self.login = login
+        self.recorder = recorder
+        self.proxy_pool = proxy_pool
+        self.on_page = on_page
+
+        self.tasks = queue.Queue()
+        self.results = {}
+        self.failed = []
+        self.last_pages = {}
+        self._lock = threading.Lock()
+        self.pool = None
+
+    def crawl(self, keywords, max_pages=5):
+        """
+        并行爬取
+
+        Args:
+            keywords: 关键词或关键词列表
+            max_pages: 每个关键词的最大页数
+
+        Returns:
+            list: 按关键词顺序、页码顺序合并的职位数据，带 "关键词" 字段并跨关键词去重
+        """
+        if isinstance(keywords, str):
+            keywords = [keywords]
+
+        for keyword in keywords:
+            for page in range(1, max_pages + 1):
+                self.tasks.put((keyword, page, 0))
+
+        logger.info(f"🚀 启动 {self.workers} 个浏览器并行爬取，共 {self.tasks.qsize()} 个页面任务")
+        self.pool = BrowserPool(
+            size=self.workers, factory=self._launch_browser,
+            setup=self._setup_browser, teardown=self._teardown_browser
+        )
+        with self.pool:
+            threads = [
+                threading.Thread(target=self._worker_loop, args=(worker_id,), daemon=True)
+                for worker_id in range(self.workers)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        if not self.tasks.empty():
+            logger.error(f"所有浏览器均已退出，剩余 {self.tasks.qsize()} 个页面未爬取")
+        if self.failed:
+            logger.warning(f"以下页面多次失败已放弃: {self.failed}")
+
+        return self._merge(keywords)
+
+    def _worker_loop(self, worker_id):
+        """单个工作线程的任务循环：每页租借一个浏览器，异常只影响当前浏览器和当前页面"""
+        failures = 0
+        while True:
+            try:
+                keyword, page, attempt = self.tasks.get_nowait()
+            except queue.Empty:
+                break
+
+            if self._is_past_end(keyword, page):
+                continue
+
+            browser = None
+            try:
+                browser = self.pool.lease()
+                # 等待租借期间其他浏览器可能已确认了最后一页
+                if self._is_past_end(keyword, page):
+                    self.pool.release(browser)
+                    continue
+                if browser.crawler is None:
+                    browser.crawler = ZhilianCrawler(
+                        browser.driver, pacer=self.pacer, recorder=self.recorder,
+                        capture_network=browser.manager.capture_network
+                    )
+                crawler = browser.crawler
+                crawler.give_up = lambda: self._is_past_end(keyword, page)
+
+                page_data = crawler.fetch_page(keyword, page)
+                # 空结果提示或没有下一页是正常的结果末尾；其他原因的空页面（翻页、提取失败）重试该页
+                if crawler.is_last_page(page_data):
+                    self._mark_end(keyword, page)
+                elif not page_data:
+                    logger.warning(f"[W{worker_id}] '{keyword}' 第 {page} 页未获取到数据，稍后重试")
+                    self.pool.release(browser, pages=1)
+                    self._retry(keyword, page, attempt)
+                    continue
+                self._store(keyword, page, page_data)
+                self._report_proxy(browser.manager, True)
+                self.pool.release(browser, pages=1)
+                failures = 0
+                logger.info(f"[W{worker_id}] '{keyword}' 第 {page} 页获取到 {len(page_data)} 条数据")
+
+            except Exception as e:
+                if self._is_past_end(keyword, page):
+                    # 加载期间已确认该页超出最后一页，等待超时是预期结果
+                    logger.debug(f"[W{worker_id}] '{keyword}' 第 {page} 页超出最后一页，跳过")
+                    if browser is not None:
+                        self.pool.release(browser, pages=1)
+                    continue
+
+                logger.warning(f"[W{worker_id}] '{keyword}' 第 {page} 页失败: {str(e)}")
+                timed_out = isinstance(e, TimeoutException)
+                if browser is not None:
+                    if self._is_proxy_error(e):
+                        self._report_proxy(browser.manager, False)
+                    # 等待页面数据超时不代表浏览器异常，继续复用
+                    self.pool.release(browser, pages=1, broken=not timed_out)
+                self._retry(keyword, page, attempt)
+
+                if timed_out:
+                    continue
+                failures += 1
+                if failures >= self.max_retries:
+                    logger.error(f"[W{worker_id}] 连续失败 {failures} 次，该工作线程退出")
+                    break
+
+    def _launch_browser(self, slot):
+        """启动一个浏览器；有代理池时租用固定代理，否则按启动序号轮流分配"""
+        manager = BrowserManager(headless=self.headless)
+        if self.proxy_pool:
+            manager.proxy = self.proxy_pool.lease(manager)
+        elif self.proxies:
+            manager.proxy = self.proxies[slot % len(self.proxies)]
+        try:
+            manager.create_browser()
+        except Exception:
+            if self.proxy_pool and manager.proxy:
+                self.proxy_pool.remove_proxy(manager.proxy)
+                self.proxy_pool.release(manager)
+            raise
+        logger.info(f"[B{slot}] 浏览器已启动，代理: {manager.proxy}")
+        return manager
+
+    def _setup_browser(self, manager):
+        """浏览器启动后登录，登录完成后再启用资源拦截"""
+        if self.login and not self.login(manager.driver):
+            raise RuntimeError("登录失败")
+        manager.apply_resource_blocking()
+
+    def _teardown_browser(self, manager):
+        """浏览器关闭时归还代理租约"""
+        if self.proxy_pool:
+            self.proxy_pool.release(manager)
+
+    @staticmethod
+    def _is_proxy_error(error):
+        """网络、代理或风控错误才计入代理的熔断器；等待页面数据超时、元素缺失等由站点页面引起的错误不计入"""
+        if isinstance(error, (ChallengeDetected, requests.RequestException)):
+            return True
+        return isinstance(error, WebDriverException) and not isinstance(
+            error, (TimeoutException, NoSuchElementException, StaleElementReferenceException)
+        )
+
+    def _report_proxy(self, manager, ok):
+        if self.proxy_pool and manager.proxy:
+            self.proxy_pool.report(manager.proxy, ok)
+
+    def _retry(self, keyword, page, attempt):
+        """失败页面重新入队，超过重试次数则记为失败"""
+        if self._is_past_end(keyword, page):
+            return
+        if attempt + 1 < self.max_retries:
+            self.tasks.put((keyword, page, attempt + 1))
+        else:
+            with self._lock:
+                self.failed.append((keyword, page))
+
+    def _store(self, keyword, page, page_data):
+        with self._lock:
+            self.results[(keyword, page)] = page_data
+            if self.on_page:
+                self.on_page(keyword, page, page_data)
+
+    def _mark_end(self, keyword, page):
+        """记录关键词的最后一页，之后的页面任务直接跳过"""
+        with self._lock:
+            if page < self.last_pages.get(keyword, float("inf")):
+                self.last_pages[keyword] = page
+
+    def _is_past_end(self, keyword, page):
+        with self._lock:
+            return page > self.last_pages.get(keyword, float("inf"))
+
+    def _merge(self, keywords):
+        """按关键词顺序、页码顺序合并结果，同一职位只保留首次出现的关键词"""
+        merged = []
+        seen = set()
+        for keyword in keywords:
+            pages = sorted(page for kw, page in self.results if kw == keyword)
+            for page in pages:
+                if self._is_past_end(keyword, page):
+                    continue
+                for record in self.results[(keyword, page)]:
+                    if not record:
+                        continue
+                    fp = job_fingerprint(record)
+                    if fp in seen:
+                        continue
+                    seen.add(fp)
+                    merged.append(dict(record, 关键词=keyword))
+        logger.info(f"并行爬取完成，共获取 {len(merged)} 条数据")
+        return merged
@@ -1,5 +1,9 @@
 import time
-import random
+import asyncio
+import itertools
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, quote
 import pandas as pd
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -9,49 +13,154 @@ from selenium.common.exceptions import (
     NoSuchElementException,
 )
 
+from core.driver import DriverProtocol
+from core.parser import JobListParser
+from core.network import NetworkCapture, ApiRecordMapper
+from core.session import HttpSession, ChallengeDetected
 from utils.logger import logger
-from config.settings import URLS, SELECTORS, RANDOM_DELAY_MIN, RANDOM_DELAY_MAX
+from utils.rate_limiter import shared_pacer
+from utils.fingerprint import job_fingerprint
+from config.settings import (
+    URLS, SELECTORS, CHALLENGE_URL_MARKERS,
+    IMPLICIT_WAIT, EXTRACT_MODE, OPTIONAL_FIELDS, JOB_FIELDS,
+    PAGINATION_MODE, SEARCH_PAGE_PARAM, FETCH_MODE, SEARCH_API_URL,
+    FINGERPRINT_ONLY_NEW, KNOWN_PAGES_STOP, TAB_COUNT, TAB_LOAD_TIMEOUT
+)
+
+# 单次往返批量提取整页职位卡片，缺失必需字段的卡片返回 null，缺失可选字段记为 null
+BULK_EXTRACT_SCRIPT = """
+var items = document.querySelectorAll(arguments[0]);
+var fields = arguments[1];
+var result = [];
+for (var i = 0; i < items.length; i++) {
+    var record = {};
+    for (var j = 0; j < fields.length; j++) {
+        var item = items[i], attr = fields[j][3];
+        var node = item.matches(fields[j][1]) ? item : item.querySelector(fields[j][1]);
+        if (!node && !fields[j][2]) { record = null; break; }
+        if (!node) { record[fields[j][0]] = null; }
+        else if (attr) { record[fields[j][0]] = node[attr] || node.getAttribute(attr); }
+        else { record[fields[j][0]] = node.innerText; }
+    }
+    result.push(record);
+}
+return result;
+"""
+
+# 标签页模式：给旧文档打标记后跳转，新文档没有该标记，借此区分"仍是旧页面"与"新页面已加载"
+TAB_LOAD_SCRIPT = "window.__tabPending = true; window.location.href = arguments[0];"
+# 返回 [readyState, 是否有职位列表, 当前 URL, 是否显示空结果提示]
+TAB_STATE_SCRIPT = """
+if (window.__tabPending) { return null; }
+return [document.readyState, !!document.querySelector(arguments[0]), location.href,
+        !!(arguments[1] && document.querySelector(arguments[1]))];
+"""
 
 class BaseCrawler:
     """爬虫基类，包含通用方法"""
 
-    def __init__(self, driver, site_name):
+    # (输出字段名, 选择器键[, 属性名])
+    FIELDS = JOB_FIELDS
+
+    def __init__(self, driver: DriverProtocol, site_name, pacer=None):
+        """driver 可以是 Selenium WebDriver 或 FakeDriver"""
         self.driver = driver
         self.site_name = site_name
         self.search_url_template = URLS[site_name]["search"]
         self.selectors = SELECTORS[site_name]["search"]
         self.job_data = []
         self.retry_count = 0
+        self.optional_fields = set(OPTIONAL_FIELDS)
+        self.pacer = pacer or shared_pacer
+        self.host = urlsplit(self.search_url_template).netloc
+        self._refreshed = False
+        self.give_up = None          # 可选回调 give_up() -> bool，为真时不再等待职位列表（如已确认超出最后一页）
 
-    def _random_sleep(self, min_time=None, max_time=None):
-        """随机延时，模拟人工浏览"""
-        min_time = min_time or RANDOM_DELAY_MIN
-        max_time = max_time or RANDOM_DELAY_MAX
-        sleep_time = random.uniform(min_time, max_time)
-        time.sleep(sleep_time)
+    def _paced(self, action, browser=True):
+        """在节流器许可下执行一次页面加载，并把耗时、刷新和验证码情况反馈给节流器"""
+        self.pacer.wait(self.host)
+        self._refreshed = False
+        started = time.monotonic()
+        try:
+            result = action()
+        except ChallengeDetected:
+            self.pacer.record(self.host, captcha=True)
+            raise
+        except Exception:
+            self.pacer.record(self.host, ok=False)
+            raise
+        self.pacer.record(
+            self.host,
+            latency=time.monotonic() - started,
+            refreshed=self._refreshed,
+            captcha=browser and self._on_challenge_page()
+        )
+        return result
+
+    def _on_challenge_page(self):
+        """浏览器当前是否停留在登录或验证页面"""
+        try:
+            current_url = self.driver.current_url
+        except Exception:
+            return False
+        return any(marker in current_url for marker in CHALLENGE_URL_MARKERS)
 
     def _wait_for_job_list(self):
-        """等待职位列表加载完成"""
+        """等待职位列表加载完成；页面显示空结果提示时立即返回，交给调用方按无数据处理"""
+        with self._no_implicit_wait():
+            try:
+                state = WebDriverWait(self.driver, 10).until(self._job_list_or_empty)
+            except TimeoutException:
+                logger.warning("等待职位列表加载超时，尝试刷新页面")
+                self._refreshed = True
+                self.driver.refresh()
+                state = WebDriverWait(self.driver, 15).until(self._job_list_or_empty)
+        if state == "empty":
+            logger.info("页面显示没有更多职位")
+
+    def _job_list_or_empty(self, driver):
+        """就绪条件：职位列表出现时返回 list，出现空结果提示时返回 empty"""
+        if driver.find_elements(By.CSS_SELECTOR, self.selectors["job_list"]):
+            return "list"
+        if self._showing_no_results():
+            return "empty"
+        if self.give_up and self.give_up():
+            return "empty"
+        return False
+
+    def _showing_no_results(self):
+        """当前页面是否显示空结果提示（调用方需处于无隐式等待上下文）"""
+        no_results = self.selectors.get("no_results")
+        return bool(no_results and self.driver.find_elements(By.CSS_SELECTOR, no_results))
+
+    @contextmanager
+    def _no_implicit_wait(self):
+        """临时关闭隐式等待，使缺失元素立即返回而不是阻塞到超时"""
+        self.driver.implicitly_wait(0)
         try:
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, self.selectors["job_list"]))
-            )
-        except TimeoutException:
-            logger.warning("等待职位列表加载超时，尝试刷新页面")
-            self.driver.refresh()
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, self.selectors["job_list"]))
-            )
+            yield
+        finally:
+            self.driver.implicitly_wait(IMPLICIT_WAIT)
+
+    def _find_text(self, parent, key, attr=None):
+        """查找字段文本（或属性值），可选字段缺失返回 None，必需字段缺失抛出 NoSuchElementException"""
+        nodes = parent.find_elements(By.CSS_SELECTOR, self.selectors[key])
+        if nodes:
+            return nodes[0].get_attribute(attr) if attr else nodes[0].text
+        if key in self.optional_fields:
+            return None
+        raise NoSuchElementException(f"未找到元素: {self.selectors[key]}")
+
+    def _extract_fields(self, item):
+        """按 FIELDS 提取职位项的全部字段（调用方需处于无隐式等待上下文）"""
+        return {name: self._find_text(item, key, *attr) for name, key, *attr in self.FIELDS}
 
     def _extract_job_item(self, job_item):
         """从职位项中提取数据"""
         try:
-            return {
-                "职位名称": job_item.find_element(By.CSS_SELECTOR, self.selectors["title"]).text.strip(),
-                "公司名称": job_item.find_element(By.CSS_SELECTOR, self.selectors["company_name"]).text.strip(),
-                "薪资": job_item.find_element(By.CSS_SELECTOR, self.selectors["salary"]).text.strip(),
-                "工作地点": job_item.find_element(By.CSS_SELECTOR, self.selectors["location"]).text.strip()
-            }
+            with self._no_implicit_wait():
+                record = self._extract_fields(job_item)
+            return {name: value.strip() if value else value for name, value in record.items()}
         except NoSuchElementException as e:
             logger.warning(f"提取职位数据时未找到元素: {str(e)}")
             return None
@@ -76,63 +185,628 @@ class BaseCrawler:
 class ZhilianCrawler(BaseCrawler):
     """智联招聘爬虫（带分页功能）"""
 
-    def __init__(self, driver):
-        super().__init__(driver, "zhilian")
+    def __init__(self, driver: DriverProtocol, extract_mode=None, pagination_mode=None, fetch_mode=None, pacer=None,
+                 checkpoint=None, fingerprints=None, recorder=None, tabs=None, tab_setup=None,
+                 capture_network=True, browser_lease=None):
+        super().__init__(driver, "zhilian", pacer)
         self.current_page = 1
+        self.extract_mode = extract_mode or EXTRACT_MODE
+        self.pagination_mode = pagination_mode or PAGINATION_MODE
+        self.fetch_mode = fetch_mode or FETCH_MODE
+        self.http = None
+        self._fetched_over_http = False
+        self.checkpoint = checkpoint
+        self._reached_end = False
+        self.fingerprints = fingerprints
+        self.only_new = FINGERPRINT_ONLY_NEW
+        self.known_pages_stop = KNOWN_PAGES_STOP if fingerprints is not None else 0
+        self._run_fingerprints = set()
+        self.pending_fingerprints = {}   # 本次运行爬到、尚未写入指纹索引的 {指纹: 关键词}
+        self.recorder = recorder
+        self.tabs = tabs or TAB_COUNT
+        self.tab_setup = tab_setup
+        self.parser = JobListParser(self.site_name, self.FIELDS, self.optional_fields)
+        # 浏览器未开启性能日志（如 Firefox）时不创建捕获器，network 模式直接走 DOM 批量提取
+        self.network = NetworkCapture(driver) if self.extract_mode == "network" and capture_network else None
+        self._network_records = None
+        # 可选的浏览器池租约（BrowserLease），按已处理页数归还，浏览器被回收时切换到替补浏览器
+        self.browser_lease = browser_lease
+        self._browser_pages = 0
+
+    def search_jobs(self, keyword, max_pages=5, resume=False):
+        """
+        搜索职位并爬取数据（带分页），返回全部数据
+
+        resume=True 且配置了断点存储时，先载入已提交页面的数据，再从最后提交的页之后继续
+        """
+        if resume and self.checkpoint:
+            restored = [record for record in self.checkpoint.iter_records(keyword) if record]
+            if self.fingerprints is not None:
+                for record in restored:
+                    self.pending_fingerprints.setdefault(job_fingerprint(record), keyword)
+            self.job_data.extend(restored)
+        for _, page_data in self.iter_pages(keyword, max_pages, resume):
+            self.job_data.extend(page_data)
+        logger.info(f"爬取完成，共获取 {len(self.job_data)} 条数据")
+        return self.job_data
+
+    def reset(self):
+        """重置单个关键词的爬取状态，跨关键词去重所用的指纹集合保留"""
+        self.current_page = 1
+        self.job_data = []
+        self._network_records = None
+        self._reached_end = False
+
+    def search_batch(self, keywords, max_pages=5, resume=False):
+        """在同一浏览器会话中依次爬取多个关键词，返回带关键词标签、跨关键词去重后的数据"""
+        results = list(self.iter_batch(keywords, max_pages, resume))
+        logger.info(f"批量爬取完成，{len(keywords)} 个关键词共获取 {len(results)} 条数据")
+        return results
+
+    def iter_batch(self, keywords, max_pages=5, resume=False):
+        """
+        流式批量爬取多个关键词
+
+        Args:
+            keywords: 关键词列表
+            max_pages: 每个关键词的最大页数
+            resume: 从断点继续，先产出已提交页面的数据
 
-    def search_jobs(self, keyword, max_pages=5):
-        """搜索职位并爬取数据（带分页）"""
-        logger.info(f"开始在智联招聘搜索 '{keyword}'，最大页数: {max_pages}")
+        Yields:
+            dict: 带 "关键词" 字段的职位数据，同一职位只在首次出现的关键词下产出
+        """
+        seen = set()
+        if self.checkpoint and not resume:
+            # 不续爬时先清除全部关键词的旧断点，避免中途出错后下次续爬读到更早运行的数据
+            for keyword in keywords:
+                self.checkpoint.reset(keyword)
+        for index, keyword in enumerate(keywords, 1):
+            logger.info(f"🔎 [{index}/{len(keywords)}] 关键词: {keyword}")
+            self._renew_browser()
+            self.reset()
+            records = self.iter_jobs(keyword, max_pages, resume=resume)
+            if resume and self.checkpoint:
+                records = itertools.chain(self.checkpoint.iter_records(keyword), records)
 
+            for record in records:
+                if not record:
+                    continue
+                fp = job_fingerprint(record)
+                if self.fingerprints is not None:
+                    self.pending_fingerprints.setdefault(fp, keyword)
+                if fp in seen:
+                    continue
+                seen.add(fp)
+                yield dict(record, 关键词=keyword)
+
+    def commit_fingerprints(self):
+        """数据导出成功后调用，把本次爬到的职位指纹写入索引"""
+        if self.fingerprints is None or not self.pending_fingerprints:
+            return
+        self.fingerprints.commit(self.pending_fingerprints)
+        logger.info(f"指纹索引新增/更新 {len(self.pending_fingerprints)} 条")
+        self.pending_fingerprints = {}
+
+    def iter_jobs(self, keyword, max_pages=5, batch=False, resume=False):
+        """
+        流式爬取职位数据，每提取完一页立即产出，不在内存中累积
+
+        Args:
+            keyword: 搜索关键词
+            max_pages: 最大页数
+            batch: True 时按页产出职位列表，否则逐条产出职位字典
+            resume: 从断点继续，只产出新爬取的页面（已提交的数据可通过 checkpoint.iter_records 读取）
+
+        Yields:
+            dict 或 list: 职位字典（batch=False）或单页职位列表（batch=True）
+        """
+        for _, page_data in self.iter_pages(keyword, max_pages, resume):
+            records = [record for record in page_data if record]
+            if batch:
+                yield records
+            else:
+                yield from records
+
+    async def aiter_jobs(self, keyword, max_pages=5, batch=False, resume=False):
+        """iter_jobs 的异步版本，浏览器操作在线程中执行，不阻塞事件循环"""
+        iterator = self.iter_jobs(keyword, max_pages, batch, resume)
+        done = object()
+        while True:
+            item = await asyncio.to_thread(next, iterator, done)
+            if item is done:
+                break
+            yield item
+
+    def iter_pages(self, keyword, max_pages=5, resume=False):
+        """逐页爬取，产出 (页码, 页面数据)；配置了断点存储时每页先提交再产出"""
+        start_page = self._start_page(keyword, resume)
+        if start_page is None or start_page > max_pages:
+            return
+
+        logger.info(f"开始在智联招聘搜索 '{keyword}'，第 {start_page} 页起，最大页数: {max_pages}")
+        self._reached_end = False
+        if self.fetch_mode == "http":
+            pages = self._iter_pages_http(keyword, start_page, max_pages)
+        elif self.fetch_mode == "tabs" and self.pagination_mode == "url":
+            pages = self._iter_pages_tabs(keyword, start_page, max_pages)
+        else:
+            pages = self._iter_pages_browser(keyword, start_page, max_pages)
+
+        known_streak = 0
+        last_page_no = start_page - 1
+        stopped_early = False
+        for page_no, page_data in pages:
+            last_page_no = page_no
+            self._browser_pages += 1
+            if self.fingerprints is not None:
+                page_data, all_known = self._dedupe(keyword, page_data)
+                known_streak = known_streak + 1 if all_known else 0
+
+            if self.checkpoint:
+                self.checkpoint.commit_page(keyword, page_no, page_data)
+            yield page_no, page_data
+
+            if self.known_pages_stop and known_streak >= self.known_pages_stop:
+                logger.info(f"连续 {known_streak} 页均为已爬取过的职位，提前结束翻页")
+                pages.close()
+                stopped_early = True
+                break
+
+        # 到达最后一页、爬满 max_pages 或提前停止都是正常结束，只有中途出错的爬取留作断点
+        if self.checkpoint and (self._reached_end or stopped_early or last_page_no >= max_pages):
+            self.checkpoint.mark_finished(keyword)
+
+    def _dedupe(self, keyword, page_data):
+        """
+        基于指纹索引去重
+
+        Returns:
+            tuple: (去重后的页面数据, 该页是否全部为已知职位)
+        """
+        records = [record for record in page_data if record]
+        fingerprints = [job_fingerprint(record) for record in records]
+        # 只查询不写入，导出成功后再由 commit_fingerprints 写入
+        known = self.fingerprints.lookup(fingerprints)
+        for fp in fingerprints:
+            self.pending_fingerprints.setdefault(fp, keyword)
+
+        kept = []
+        all_known = bool(records)
+        for record, fp in zip(records, fingerprints):
+            all_known = all_known and (fp in known or fp in self._run_fingerprints)
+            if fp in self._run_fingerprints:
+                continue
+            self._run_fingerprints.add(fp)
+            if fp in known and self.only_new:
+                continue
+            kept.append(record)
+
+        if len(kept) < len(records):
+            logger.info(f"去重: {len(records)} 条中保留 {len(kept)} 条")
+        return kept, all_known
+
+    def _start_page(self, keyword, resume):
+        """确定起始页：续爬时取最后提交页的下一页，已爬完返回 None；否则清除旧断点"""
+        if not self.checkpoint:
+            return self.current_page
+        if not resume:
+            self.checkpoint.reset(keyword)
+            return self.current_page
+        if self.checkpoint.is_finished(keyword):
+            logger.info(f"'{keyword}' 上次已爬取完成，无需续爬")
+            return None
+        last_page = self.checkpoint.last_page(keyword)
+        if last_page:
+            logger.info(f"🔖 '{keyword}' 从断点继续：已提交到第 {last_page} 页")
+        return last_page + 1
+
+    def _iter_pages_browser(self, keyword, start_page, max_pages):
+        """浏览器模式：打开起始页后逐页翻页；出错时记录日志并结束"""
+        executor = ThreadPoolExecutor(max_workers=1) if self.extract_mode == "lxml" else None
         try:
-            search_url = self.search_url_template.format(keyword=keyword)
-            self.driver.get(search_url)
+            if self.pagination_mode == "url":
+                if not self.goto_page(keyword, start_page):
+                    return
+            else:
+                self.current_page = 1
+                self._load(self.search_url_template.format(keyword=keyword))
+                # 点击翻页模式只能逐页点到起始页，但不会重复提取已完成的页面
+                if start_page > 1 and not self._click_to_page(start_page):
+                    self._reached_end = True
+                    return
 
             while self.current_page <= max_pages:
                 logger.info(f"正在处理第 {self.current_page}/{max_pages} 页")
 
-                self._wait_for_job_list()
-                self._random_sleep(2, 3)
-
-                page_data = self._extract_page_data()
-                if page_data:
-                    self.job_data.extend(page_data)
-                    logger.info(f"第 {self.current_page} 页获取到 {len(page_data)} 条数据")
+                page_no = self.current_page
+                self._record_current_page(keyword, page_no)
+                if executor:
+                    # 解析交给后台线程，浏览器同时加载下一页
+                    pending = executor.submit(
+                        self.parser.parse, self.driver.page_source, page_no, self.driver.current_url
+                    )
                 else:
-                    logger.warning(f"第 {self.current_page} 页未获取到数据")
+                    yield page_no, self._log_page_data(page_no, self._extract_page_data())
+
+                try:
+                    has_next = page_no < max_pages and self._advance(keyword)
+                except Exception:
+                    # 加载下一页出错时，已取得的当前页仍然产出（并提交断点）
+                    if executor:
+                        yield page_no, self._log_page_data(page_no, pending.result())
+                    raise
+                if executor:
+                    yield page_no, self._log_page_data(page_no, pending.result())
+
+                if not has_next:
+                    if page_no < max_pages:
+                        logger.info("无法翻页，可能已达最后一页")
+                        self._reached_end = True
+                    break
+
+        except Exception as e:
+            logger.error(f"爬取失败: {str(e)}")
+        finally:
+            if executor:
+                executor.shutdown(wait=False)
+
+    def _iter_pages_tabs(self, keyword, start_page, max_pages):
+        """
+        标签页模式：多个标签页同时加载后续页面，哪个先就绪先提取，按页码顺序产出
 
-                if not self._go_to_next_page():
-                    logger.info("无法翻页，可能已达最后一页")
+        网络捕获模式下各标签页的性能日志混在一起，因此该模式始终从 DOM 提取数据。
+        页码参数未生效时回退为单标签页的浏览器模式。
+        """
+        handles = []
+        fallback_page = None
+        try:
+            handles = self._open_tabs()
+            idle = list(reversed(handles))
+            loading = {}                     # 标签页 -> [页码, 开始时间, 已尝试次数]
+            done = {}                        # 页码 -> 页面数据
+            next_page, expected, last_page = start_page, start_page, max_pages
+
+            while expected <= last_page:
+                while idle and next_page <= last_page:
+                    handle = idle.pop()
+                    self._start_tab_load(handle, keyword, next_page)
+                    loading[handle] = [next_page, time.monotonic(), 1]
+                    next_page += 1
+
+                progressed = False
+                for handle, (page, started, attempts) in list(loading.items()):
+                    self.driver.switch_to.window(handle)
+                    state = self.driver.execute_script(
+                        TAB_STATE_SCRIPT, self.selectors["job_list"], self.selectors.get("no_results") or ""
+                    )
+                    if state and any(marker in state[2] for marker in CHALLENGE_URL_MARKERS):
+                        self.pacer.record(self.host, captcha=True)
+                        raise ChallengeDetected(state[2], "跳转到登录或验证页面")
+
+                    if state and not state[1] and state[3]:
+                        # 空结果提示与职位列表一样表示页面已就绪，且说明已超出结果末尾
+                        self.pacer.record(self.host, latency=time.monotonic() - started, refreshed=attempts > 1)
+                        logger.info(f"第 {page} 页显示无结果")
+                        page_data, has_next = [], False
+                    elif not (state and state[1]):
+                        if time.monotonic() - started <= TAB_LOAD_TIMEOUT:
+                            continue
+                        if attempts < 2:
+                            logger.warning(f"第 {page} 页加载超时，重新加载")
+                            self.pacer.record(self.host, refreshed=True)
+                            self._start_tab_load(handle, keyword, page)
+                            loading[handle] = [page, time.monotonic(), attempts + 1]
+                            continue
+                        logger.warning(f"第 {page} 页多次加载超时，跳过")
+                        page_data, has_next = [], True
+                    else:
+                        self.pacer.record(self.host, latency=time.monotonic() - started, refreshed=attempts > 1)
+                        self.current_page = page
+                        active = self._active_page_number()
+                        if active is not None and active != page:
+                            logger.warning(f"标签页模式下第 {page} 页实际为第 {active} 页，页码参数未生效，回退为浏览器模式")
+                            fallback_page = expected
+                            break
+                        self._record_current_page(keyword, page)
+                        page_data = self._extract_page_data()
+                        has_next = self.has_next_page()
+
+                    del loading[handle]
+                    idle.append(handle)
+                    progressed = True
+                    done[page] = page_data
+                    if not has_next and page < last_page:
+                        last_page = page
+                        self._reached_end = True
+                        logger.info("无法翻页，可能已达最后一页")
+
+                if fallback_page is not None:
                     break
 
-                self.current_page += 1
+                while expected in done and expected <= last_page:
+                    yield expected, self._log_page_data(expected, done.pop(expected))
+                    expected += 1
+                if not progressed:
+                    time.sleep(0.05)
+
+        except Exception as e:
+            logger.error(f"爬取失败: {str(e)}")
+        finally:
+            if handles:
+                self.driver.switch_to.window(handles[0])
+
+        if fallback_page is not None:
+            yield from self._iter_pages_browser(keyword, fallback_page, max_pages)
+
+    def _open_tabs(self):
+        """确保浏览器中有 tabs 个标签页，新开的标签页执行 tab_setup（如 CDP 资源拦截），返回标签页句柄"""
+        main_handle = self.driver.current_window_handle
+        handles = [main_handle] + [h for h in self.driver.window_handles if h != main_handle]
+        while len(handles) < self.tabs:
+            self.driver.switch_to.new_window("tab")
+            if self.tab_setup:
+                self.tab_setup(self.driver)
+            handles.append(self.driver.current_window_handle)
+        self.driver.switch_to.window(main_handle)
+        return handles[:self.tabs]
+
+    def _start_tab_load(self, handle, keyword, page):
+        """在标签页中发起加载，不等待加载完成"""
+        self.pacer.wait(self.host)
+        self.driver.switch_to.window(handle)
+        self.driver.execute_script(TAB_LOAD_SCRIPT, self.build_page_url(keyword, page))
+
+    def _iter_pages_http(self, keyword, start_page, max_pages):
+        """HTTP 直连模式：逐页请求，直到空页或达到最大页数"""
+        try:
+            for page in range(start_page, max_pages + 1):
+                self.current_page = page
+                logger.info(f"正在处理第 {page}/{max_pages} 页")
 
-            logger.info(f"爬取完成，共获取 {len(self.job_data)} 条数据")
-            return self.job_data
+                page_data = self.fetch_page(keyword, page)
+                yield page, self._log_page_data(page, page_data)
+                if not page_data:
+                    logger.info("当前页无数据，可能已达最后一页")
+                    self._reached_end = True
+                    break
 
         except Exception as e:
             logger.error(f"爬取失败: {str(e)}")
-            return self.job_data
+
+    def build_page_url(self, keyword, page):
+        """构造第 page 页的搜索 URL"""
+        parts = urlsplit(self.search_url_template.format(keyword=keyword))
+        query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != SEARCH_PAGE_PARAM]
+        query.append((SEARCH_PAGE_PARAM, str(page)))
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
+    def goto_page(self, keyword, page):
+        """直接打开第 page 页；页码参数未生效时回退为点击翻页"""
+        self._load(self.build_page_url(keyword, page))
+
+        active = self._active_page_number()
+        if active is None or active == page:
+            self.current_page = page
+            return True
+
+        logger.warning(f"直接访问第 {page} 页失败（当前为第 {active} 页），回退为点击翻页")
+        if not self._click_to_page(page):
+            return False
+        self._wait_for_page_ready()
+        return True
+
+    def _load(self, url):
+        """受节流控制地打开 URL 并等待数据就绪"""
+        def load():
+            if self.network:
+                self.network.drain()
+            self.driver.get(url)
+            self._wait_for_page_ready()
+        self._paced(load)
+
+    def _wait_for_page_ready(self):
+        """等待页面数据就绪：网络捕获模式等待接口响应，否则等待职位列表元素"""
+        if self.network:
+            with self._no_implicit_wait():
+                self._network_records = self.network.wait_for_records(
+                    settled=lambda: self._job_list_or_empty(self.driver)
+                )
+            if self._network_records is not None:
+                return
+            if not self.network.available:
+                self.network = None
+            logger.warning("未捕获到搜索接口响应，回退为等待页面元素")
+        self._wait_for_job_list()
+
+    def fetch_page(self, keyword, page):
+        """独立抓取第 page 页数据，可跳页、单页重试或乱序抓取"""
+        self._fetched_over_http = self.fetch_mode == "http"
+        if self.fetch_mode == "http":
+            try:
+                return self._fetch_page_http(keyword, page)
+            except ChallengeDetected as e:
+                logger.warning(f"HTTP 请求遇到验证页面（{e.reason}），第 {page} 页改用浏览器加载")
+                self._fetched_over_http = False
+                page_data = self._fetch_page_browser(keyword, page)
+                # 浏览器可能获得了新的 Cookie，重新同步
+                self.http.sync_from_driver(self.driver)
+                return page_data
+        return self._fetch_page_browser(keyword, page)
+
+    def _fetch_page_browser(self, keyword, page):
+        """通过浏览器抓取第 page 页"""
+        if not self.goto_page(keyword, page):
+            return []
+        self._record_current_page(keyword, page)
+        return self._extract_page_data()
+
+    def _record_current_page(self, keyword, page):
+        """录制当前浏览器页面，供离线回放"""
+        if self.recorder:
+            self.recorder.record(self.driver.page_source, self.driver.current_url, page, keyword)
+
+    def _fetch_page_http(self, keyword, page):
+        """通过 HTTP 会话直接抓取第 page 页（接口 JSON 或页面 HTML）"""
+        if self.http is None:
+            self.http = HttpSession(self.driver)
+        if SEARCH_API_URL:
+            url = SEARCH_API_URL.format(keyword=quote(keyword), page=page)
+            payload = self._paced(lambda: self.http.get_json(url), browser=False)
+            return ApiRecordMapper().extract_records(payload, page)
+        url = self.build_page_url(keyword, page)
+        html = self._paced(lambda: self.http.get_text(url), browser=False)
+        if self.recorder:
+            self.recorder.record(html, url, page, keyword)
+        return self.parser.parse(html, page, url)
+
+    def _advance(self, keyword):
+        """前进到下一页，成功后 current_page 指向新页码"""
+        if self.pagination_mode == "url":
+            if not self.has_next_page():
+                return False
+            # URL 翻页不依赖当前页面，可在翻页前换用替补浏览器；点击翻页只在关键词之间更换
+            self._renew_browser()
+            return self.goto_page(keyword, self.current_page + 1)
+
+        def click_next():
+            if self.network:
+                self.network.drain()
+            if not self._go_to_next_page():
+                return False
+            self._wait_for_page_ready()
+            return True
+
+        if self._paced(click_next):
+            self.current_page += 1
+            return True
+        return False
+
+    def _renew_browser(self):
+        """向浏览器池归还已处理的页数；浏览器达到回收阈值被替换时，改用替补浏览器继续"""
+        if not self.browser_lease or not self._browser_pages:
+            return
+        driver = self.browser_lease.renew(self._browser_pages)
+        self._browser_pages = 0
+        if driver is self.driver:
+            return
+        logger.info("♻️ 已切换到替补浏览器")
+        self.driver = driver
+        # HTTP 会话和网络捕获都绑定在旧浏览器上，按新浏览器重建
+        if self.http is not None:
+            self.http.close()
+            self.http = None
+        if self.network is not None:
+            self.network = NetworkCapture(driver)
+
+    def has_next_page(self):
+        """当前页是否存在可用的下一页按钮；网络捕获模式下以当前页是否有数据判断"""
+        if self._network_records is not None:
+            return bool(self._network_records)
+        with self._no_implicit_wait():
+            return bool(self.driver.find_elements(By.CSS_SELECTOR, self.selectors["next_page"]))
+
+    def is_last_page(self, page_data):
+        """
+        fetch_page 之后调用：刚抓取的页面是否为结果末尾
+
+        浏览器加载时以空结果提示或没有下一页为准，提取失败导致的空数据不算末尾；
+        HTTP 直连时接口或页面没有返回职位即为末尾。
+        """
+        if self._fetched_over_http:
+            return not page_data
+        if self._network_records is not None:
+            return not self._network_records
+        if not self.has_next_page():
+            return True
+        with self._no_implicit_wait():
+            return self._showing_no_results()
+
+    def _active_page_number(self):
+        """读取分页器中的当前页码，无分页器时返回 None"""
+        with self._no_implicit_wait():
+            nodes = self.driver.find_elements(By.CSS_SELECTOR, self.selectors["current_page"])
+        text = nodes[0].text.strip() if nodes else ""
+        return int(text) if text.isdigit() else None
+
+    def _click_to_page(self, page):
+        """点击翻页回退方案：从当前页逐页点击到目标页"""
+        while True:
+            active = self._active_page_number() or 1
+            self.current_page = active
+            if active >= page:
+                return active == page
+            if not self._paced(self._go_to_next_page):
+                return False
+
+    def _log_page_data(self, page_no, page_data):
+        """记录单页提取结果并原样返回"""
+        if page_data:
+            logger.info(f"第 {page_no} 页获取到 {len(page_data)} 条数据")
+        else:
+            logger.warning(f"第 {page_no} 页未获取到数据")
+        return page_data
 
     def _extract_page_data(self):
         """提取当前页数据"""
+        if self.extract_mode == "script":
+            return self._extract_page_data_script()
+        if self.extract_mode == "lxml":
+            return self._extract_page_data_lxml()
+        if self.extract_mode == "network":
+            return self._extract_page_data_network()
         try:
-            items = self.driver.find_elements(By.CSS_SELECTOR, self.selectors["job_item"])
-            return [self._parse_job_item(item) for item in items if item]
+            # 页面就绪已由 _wait_for_job_list 显式等待保证，字段查找不再受隐式等待影响
+            with self._no_implicit_wait():
+                items = self.driver.find_elements(By.CSS_SELECTOR, self.selectors["job_item"])
+                return [self._parse_job_item(item) for item in items if item]
         except Exception as e:
             logger.error(f"提取页面数据失败: {str(e)}")
             return []
 
+    def _extract_page_data_script(self):
+        """通过一次 execute_script 调用提取整页数据"""
+        fields = [
+            [name, self.selectors[key], key in self.optional_fields, attr[0] if attr else None]
+            for name, key, *attr in self.FIELDS
+        ]
+        try:
+            records = self.driver.execute_script(
+                BULK_EXTRACT_SCRIPT, self.selectors["job_item"], fields
+            ) or []
+        except Exception as e:
+            logger.error(f"批量提取页面数据失败: {str(e)}")
+            return []
+
+        page_data = []
+        for record in records:
+            if record is None:
+                logger.warning("提取职位信息时元素未找到")
+                page_data.append(None)
+                continue
+            record["页码"] = self.current_page
+            page_data.append(record)
+        return page_data
+
+    def _extract_page_data_network(self):
+        """使用已捕获的接口响应生成当前页数据，未捕获时回退为批量 DOM 提取"""
+        if self._network_records is None:
+            return self._extract_page_data_script()
+        return [dict(record, 页码=self.current_page) for record in self._network_records]
+
+    def _extract_page_data_lxml(self):
+        """对 page_source 快照做一次 lxml 解析"""
+        try:
+            return self.parser.parse(self.driver.page_source, self.current_page, self.driver.current_url)
+        except Exception as e:
+            logger.error(f"解析页面源码失败: {str(e)}")
+            return []
+
     def _parse_job_item(self, item):
         """解析单个职位项"""
         try:
-            return {
-                "职位名称": item.find_element(By.CSS_SELECTOR, self.selectors["title"]).text,
-                "公司名称": item.find_element(By.CSS_SELECTOR, self.selectors["company"]).text,
-                "薪资": item.find_element(By.CSS_SELECTOR, self.selectors["salary"]).text,
-                "工作地点": item.find_element(By.CSS_SELECTOR, self.selectors["location"]).text,
-                "页码": self.current_page
-            }
+            record = self._extract_fields(item)
+            record["页码"] = self.current_page
+            return record
         except NoSuchElementException as e:
             logger.warning(f"提取职位信息时元素未找到: {str(e)}")
             return None
@@ -145,7 +819,6 @@ class ZhilianCrawler(BaseCrawler):
             )
 
             self.driver.execute_script("arguments[0].scrollIntoView()", next_btn)
-            self._random_sleep(1, 2)
             next_btn.click()
 
             WebDriverWait(self.driver, 10).until(
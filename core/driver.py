@@ -0,0 +1,535 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+驱动抽象模块 - 定义爬虫与登录代码依赖的最小驱动接口，并提供基于 lxml 的进程内假驱动，
+无需浏览器即可对翻页、等待和提取循环做性能分析与基准测试
+
+基准测试：python -m core.driver [--pages N] [--latency 秒] [--load-time 秒] [--tabs K] [--fixtures 归档路径]
+"""
+
+import time
+import argparse
+from collections import Counter
+from functools import lru_cache
+from typing import Protocol, runtime_checkable
+from urllib.parse import urljoin
+
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+
+from core.parser import node_text
+from utils.logger import logger
+
+EMPTY_PAGE = "<html><head></head><body></body></html>"
+
+
+@runtime_checkable
+class DriverProtocol(Protocol):
+    """
+    爬虫、登录处理器使用的驱动接口，Selenium WebDriver 与 FakeDriver 均满足
+
+    核心方法为 get / find_elements / execute_script / page_source / current_url，
+    另外用到 find_element（显式等待条件）、refresh、implicitly_wait、Cookie 读写，
+    以及标签页模式的 switch_to / window_handles / current_window_handle。
+    get_log 与 execute_cdp_cmd 只有 Chrome 支持，调用方需处理其抛出的异常（FakeDriver 同样抛出）。
+    可用 isinstance(driver, DriverProtocol) 做结构检查（只检查成员是否存在）。
+    """
+
+    def get(self, url):
+        ...
+
+    def find_elements(self, by, value):
+        ...
+
+    def find_element(self, by, value):
+        ...
+
+    def execute_script(self, script, *args):
+        ...
+
+    @property
+    def page_source(self):
+        ...
+
+    @property
+    def current_url(self):
+        ...
+
+    def refresh(self):
+        ...
+
+    def implicitly_wait(self, seconds):
+        ...
+
+    def get_cookies(self):
+        ...
+
+    def add_cookie(self, cookie):
+        ...
+
+    def delete_all_cookies(self):
+        ...
+
+    @property
+    def switch_to(self):
+        ...
+
+    @property
+    def window_handles(self):
+        ...
+
+    @property
+    def current_window_handle(self):
+        ...
+
+    def get_log(self, log_type):
+        ...
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        ...
+
+
+@lru_cache(maxsize=256)
+def compile_locator(by, value):
+    """把 Selenium 定位方式编译为 lxml 选择器"""
+    if by == By.CSS_SELECTOR:
+        return CSSSelector(value)
+    if by == By.XPATH:
+        return etree.XPath(value)
+    if by == By.ID:
+        return CSSSelector(f'[id="{value}"]')
+    if by == By.CLASS_NAME:
+        return CSSSelector(f".{value}")
+    if by == By.TAG_NAME:
+        return CSSSelector(value)
+    if by == By.NAME:
+        return CSSSelector(f'[name="{value}"]')
+    if by == By.LINK_TEXT:
+        return etree.XPath(f'.//a[normalize-space(.)="{value}"]')
+    if by == By.PARTIAL_LINK_TEXT:
+        return etree.XPath(f'.//a[contains(., "{value}")]')
+    raise ValueError(f"不支持的定位方式: {by}")
+
+
+class FakeElement:
+    """FakeDriver 返回的元素，包装一个 lxml 节点"""
+
+    def __init__(self, driver, node):
+        self.driver = driver
+        self.node = node
+
+    @property
+    def text(self):
+        self.driver._round_trip("text")
+        return node_text(self.node)
+
+    @property
+    def tag_name(self):
+        return self.node.tag
+
+    def get_attribute(self, name):
+        self.driver._round_trip("get_attribute")
+        if name == "value":
+            return self.node.get("value", "")
+        value = self.node.get(name)
+        if value is not None and name in ("href", "src"):
+            return urljoin(self.driver._url, value)
+        return value
+
+    def find_elements(self, by, value):
+        self.driver._round_trip("find_elements")
+        return self.driver._wrap(self.node, by, value)
+
+    def find_element(self, by, value):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"未找到元素: {value}")
+        return elements[0]
+
+    def is_displayed(self):
+        style = (self.node.get("style") or "").replace(" ", "")
+        return "display:none" not in style and self.node.get("hidden") is None
+
+    def is_enabled(self):
+        return self.node.get("disabled") is None
+
+    def is_selected(self):
+        return self.node.get("checked") is not None
+
+    def click(self):
+        """点击：元素或其祖先为链接时跳转，否则交给 driver.on_click 处理"""
+        self.driver._round_trip("click")
+        link = next(
+            (n for n in [self.node, *self.node.iterancestors()] if n.tag == "a" and n.get("href")),
+            None
+        )
+        href = link.get("href") if link is not None else None
+        if self.node.tag == "input" and self.node.get("type") == "checkbox":
+            if self.node.get("checked") is None:
+                self.node.set("checked", "checked")
+            else:
+                del self.node.attrib["checked"]
+        if href and not href.startswith(("#", "javascript:")):
+            self.driver.get(urljoin(self.driver._url, href))
+        elif self.driver.on_click:
+            self.driver.on_click(self.driver, self)
+
+    def clear(self):
+        self.node.set("value", "")
+
+    def send_keys(self, *values):
+        self.driver._round_trip("send_keys")
+        self.node.set("value", self.node.get("value", "") + "".join(str(v) for v in values))
+
+    def __eq__(self, other):
+        return isinstance(other, FakeElement) and other.node is self.node
+
+    def __hash__(self):
+        return id(self.node)
+
+
+class FakeTab:
+    """FakeDriver 中的一个标签页"""
+
+    def __init__(self, handle):
+        self.handle = handle
+        self.url = "about:blank"
+        self.source = EMPTY_PAGE
+        self.root = lxml_html.fromstring(EMPTY_PAGE)
+        self.pending = None          # (URL, 就绪时间)：脚本发起、尚未完成的跳转
+
+
+class FakeSwitchTo:
+    """driver.switch_to 的最小实现，只支持标签页切换"""
+
+    def __init__(self, driver):
+        self._driver = driver
+
+    def window(self, handle):
+        self._driver._round_trip("switch_to_window")
+        if handle not in self._driver._tabs:
+            raise NoSuchElementException(f"标签页不存在: {handle}")
+        self._driver._tab = self._driver._tabs[handle]
+
+    def new_window(self, type_hint=None):
+        self._driver._round_trip("new_window")
+        self._driver._tab = self._driver._new_tab()
+
+
+class FakeDriver:
+    """
+    进程内假驱动：按 URL 提供预置的页面源码，用 lxml 实现元素查找，并模拟每次调用的往返延迟
+
+    Args:
+        pages: URL -> 页面源码 的字典，或 callable(url) -> 页面源码；未知 URL 返回空页面
+        latency: 每次驱动调用的模拟延迟（秒），也可以是 {方法名: 秒} 的字典
+        load_time: 页面加载耗时（秒）；get 阻塞等待，脚本发起的跳转在后台计时，到时后才显示新页面
+        on_click: 点击非链接元素时的回调 on_click(driver, element)
+        scripts: 额外的脚本处理器 {脚本源码: callable(driver, *args)}
+    """
+
+    def __init__(self, pages=None, latency=0, load_time=0, on_click=None, scripts=None):
+        from core.crawler import BULK_EXTRACT_SCRIPT, TAB_LOAD_SCRIPT, TAB_STATE_SCRIPT
+
+        self.pages = pages or {}
+        self.latency = latency
+        self.load_time = load_time
+        self.on_click = on_click
+        self.calls = Counter()
+        self.cookies = []
+        self.user_agent = "Mozilla/5.0 (FakeDriver)"
+        self.scripts = {
+            BULK_EXTRACT_SCRIPT: FakeDriver._bulk_extract,
+            "return navigator.userAgent": lambda driver: driver.user_agent,
+            "return document.readyState": lambda driver: "complete",
+            "arguments[0].click();": lambda driver, element: element.click(),
+            "arguments[0].scrollIntoView()": lambda driver, element: None,
+            TAB_LOAD_SCRIPT: FakeDriver._navigate,
+            TAB_STATE_SCRIPT: FakeDriver._tab_state,
+        }
+        self.scripts.update(scripts or {})
+        self.switch_to = FakeSwitchTo(self)
+        self._tabs = {}
+        self._tab = self._new_tab()
+
+    @classmethod
+    def from_fixtures(cls, path=None, **kwargs):
+        """使用录制的页面归档（见 utils.fixtures）构造假驱动"""
+        from utils.fixtures import iter_fixtures
+        return cls({fixture["url"]: fixture["html"] for fixture in iter_fixtures(path)}, **kwargs)
+
+    # ---- DriverProtocol ----
+
+    def get(self, url):
+        self._round_trip("get")
+        if self.load_time:
+            time.sleep(self.load_time)
+        self._tab.pending = None
+        self._open(url)
+
+    def find_elements(self, by, value):
+        self._round_trip("find_elements")
+        return self._wrap(self._root, by, value)
+
+    def find_element(self, by, value):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"未找到元素: {value}")
+        return elements[0]
+
+    def execute_script(self, script, *args):
+        self._round_trip("execute_script")
+        handler = self.scripts.get(script.strip()) or self.scripts.get(script)
+        if handler is None:
+            logger.debug(f"FakeDriver 忽略未支持的脚本: {script.strip()[:40]}")
+            return None
+        return handler(self, *args)
+
+    @property
+    def page_source(self):
+        self._round_trip("page_source")
+        return self._source
+
+    @property
+    def current_url(self):
+        self._round_trip("current_url")
+        return self._url
+
+    def refresh(self):
+        self._round_trip("refresh")
+        if self.load_time:
+            time.sleep(self.load_time)
+        self._tab.pending = None
+        self._open(self._tab.url)
+
+    def implicitly_wait(self, seconds):
+        self._round_trip("implicitly_wait")
+
+    def get_cookies(self):
+        self._round_trip("get_cookies")
+        return list(self.cookies)
+
+    def add_cookie(self, cookie):
+        self._round_trip("add_cookie")
+        self.cookies.append(cookie)
+
+    def delete_all_cookies(self):
+        self._round_trip("delete_all_cookies")
+        self.cookies.clear()
+
+    @property
+    def window_handles(self):
+        self._round_trip("window_handles")
+        return list(self._tabs)
+
+    @property
+    def current_window_handle(self):
+        self._round_trip("current_window_handle")
+        return self._tab.handle
+
+    def get_log(self, log_type):
+        """与 Firefox 一样没有性能日志"""
+        self._round_trip("get_log")
+        raise WebDriverException(f"FakeDriver 不支持日志类型: {log_type}")
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        """与非 Chrome 浏览器一样不支持 CDP，调用方回退为 WebDriver 接口"""
+        self._round_trip("execute_cdp_cmd")
+        raise WebDriverException(f"FakeDriver 不支持 CDP 命令: {cmd}")
+
+    def close(self):
+        """关闭当前标签页，之后需要 switch_to.window 切换到其他标签页"""
+        self._tabs.pop(self._tab.handle, None)
+
+    def quit(self):
+        pass
+
+    # ---- 内部实现 ----
+
+    @property
+    def _url(self):
+        self._settle()
+        return self._tab.url
+
+    @property
+    def _source(self):
+        self._settle()
+        return self._tab.source
+
+    @property
+    def _root(self):
+        self._settle()
+        return self._tab.root
+
+    def _new_tab(self):
+        handle = f"tab-{len(self._tabs) + 1}"
+        while handle in self._tabs:
+            handle += "'"
+        self._tabs[handle] = FakeTab(handle)
+        return self._tabs[handle]
+
+    def _open(self, url):
+        source = self.pages(url) if callable(self.pages) else self.pages.get(url)
+        if source is None:
+            logger.debug(f"FakeDriver 未预置页面: {url}")
+        tab = self._tab
+        tab.url = url
+        tab.source = source or EMPTY_PAGE
+        tab.root = lxml_html.fromstring(tab.source)
+
+    def _settle(self):
+        """当前标签页的后台跳转到时后切换为新页面"""
+        pending = self._tab.pending
+        if pending and time.monotonic() >= pending[1]:
+            self._tab.pending = None
+            self._open(pending[0])
+
+    def _navigate(self, url):
+        """模拟 TAB_LOAD_SCRIPT：发起跳转后立即返回"""
+        self._tab.pending = (url, time.monotonic() + self.load_time)
+
+    def _tab_state(self, list_selector, no_results_selector=""):
+        """模拟 TAB_STATE_SCRIPT：跳转未完成时返回 None"""
+        self._settle()
+        if self._tab.pending:
+            return None
+        has_list = bool(compile_locator(By.CSS_SELECTOR, list_selector)(self._tab.root))
+        empty = bool(no_results_selector and compile_locator(By.CSS_SELECTOR, no_results_selector)(self._tab.root))
+        return ["complete", has_list, self._tab.url, empty]
+
+    def _round_trip(self, name):
+        """记录一次驱动调用并模拟往返延迟"""
+        self.calls[name] += 1
+        delay = self.latency.get(name, 0) if isinstance(self.latency, dict) else self.latency
+        if delay:
+            time.sleep(delay)
+
+    def _wrap(self, node, by, value):
+        # 与浏览器一致：在元素上查找时只匹配后代，不包括元素自身
+        return [FakeElement(self, n) for n in compile_locator(by, value)(node) if n is not node or node is self._root]
+
+    def _bulk_extract(self, item_selector, fields):
+        """模拟 BULK_EXTRACT_SCRIPT：CSS 选择器匹配包括卡片自身"""
+        result = []
+        for item in compile_locator(By.CSS_SELECTOR, item_selector)(self._root):
+            record = {}
+            for name, selector, optional, attr in fields:
+                nodes = compile_locator(By.CSS_SELECTOR, selector)(item)
+                if not nodes and not optional:
+                    record = None
+                    break
+                if not nodes:
+                    record[name] = None
+                elif attr:
+                    value = nodes[0].get(attr)
+                    record[name] = urljoin(self._url, value) if value and attr in ("href", "src") else value
+                else:
+                    record[name] = node_text(nodes[0])
+            result.append(record)
+        return result
+
+
+class FakeBrowserManager:
+    """BrowserManager 的进程内替身，供浏览器池和并行协调器在没有浏览器时运行"""
+
+    def __init__(self, driver=None, proxy=None, rss_mb=None):
+        self.driver = driver or FakeDriver()
+        self.proxy = proxy
+        self.rss_mb = rss_mb
+        self.capture_network = False
+        self.closed = False
+
+    def create_browser(self):
+        return self.driver
+
+    def apply_resource_blocking(self, driver=None):
+        return False
+
+    def memory_mb(self):
+        return self.rss_mb
+
+    def close_browser(self):
+        self.closed = True
+        self.driver = None
+
+
+def synthetic_pages(crawler, keyword="python", pages=10, jobs_per_page=20):
+    """按站点选择器生成带分页器的合成结果页，键为 crawler.build_page_url 生成的 URL"""
+    card = (
+        '<div class="position-list__item"><a href="/jobs/CC{page}J{i:04d}.htm">'
+        '<span class="position-card__job-name">Python开发工程师 {page}-{i}</span></a>'
+        '<span class="position-card__company__name">某某科技有限公司</span>'
+        '<span class="position-card__salary">1.5-2.5万</span>'
+        '<span class="position-card__city-name">北京·海淀</span></div>'
+    )
+    result = {}
+    for page in range(1, pages + 1):
+        cards = "".join(card.format(page=page, i=i) for i in range(jobs_per_page))
+        next_class = "pagination__arrow-next" + (" disabled" if page == pages else "")
+        result[crawler.build_page_url(keyword, page)] = (
+            f'<html><body><div class="position-list">{cards}</div>'
+            f'<div class="pagination__inner"><span class="pagination__number--active">{page}</span>'
+            f'<a class="{next_class}" href="{crawler.build_page_url(keyword, page + 1)}">下一页</a>'
+            f'</div></body></html>'
+        )
+    return result
+
+
+def benchmark(pages=10, latency=0.0, fixtures=None, keyword="python", load_time=0.0, tabs=4,
+              modes=("script", "element", "lxml", "tabs")):
+    """
+    使用假驱动测量各模式下翻页、等待和提取循环的耗时与驱动调用次数
+
+    modes 中的 script / element / lxml 为浏览器逐页加载时的提取模式，tabs 为多标签页并发加载（script 提取）。
+    使用录制归档时，只有 URL 与 build_page_url(keyword, 页码) 一致的页面会被访问到。
+    """
+    from core.crawler import ZhilianCrawler
+    from utils.rate_limiter import AdaptivePacer
+
+    results = {}
+    for mode in modes:
+        if fixtures is None:
+            driver = FakeDriver(latency=latency, load_time=load_time)
+        else:
+            driver = FakeDriver.from_fixtures(fixtures, latency=latency, load_time=load_time)
+        pacer = AdaptivePacer(max_rate=0)
+        crawler = ZhilianCrawler(
+            driver,
+            extract_mode="script" if mode == "tabs" else mode,
+            pagination_mode="url",
+            fetch_mode="tabs" if mode == "tabs" else "browser",
+            pacer=pacer,
+            tabs=tabs,
+        )
+        if fixtures is None:
+            driver.pages = synthetic_pages(crawler, keyword, pages=pages)
+
+        start = time.perf_counter()
+        job_data = crawler.search_jobs(keyword, max_pages=pages)
+        elapsed = time.perf_counter() - start
+
+        results[mode] = {
+            "耗时(秒)": round(elapsed, 3),
+            "职位数": len(job_data),
+            "驱动调用次数": sum(driver.calls.values()),
+            "调用明细": dict(driver.calls.most_common()),
+        }
+        print(f"\n[{mode}]")
+        for k, v in results[mode].items():
+            print(f"{k}: {v}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="使用假驱动对爬取循环做基准测试")
+    parser.add_argument("--pages", type=int, default=10, help="合成页面数")
+    parser.add_argument("--latency", type=float, default=0.0, help="每次驱动调用的模拟延迟（秒）")
+    parser.add_argument("--load-time", type=float, default=0.0, help="每个页面的模拟加载耗时（秒）")
+    parser.add_argument("--tabs", type=int, default=4, help="tabs 模式的标签页数量")
+    parser.add_argument("--fixtures", help="使用录制的页面归档代替合成页面")
+    parser.add_argument("--keyword", default="python", help="搜索关键词，使用录制归档时需与录制时一致")
+    args = parser.parse_args()
+    benchmark(args.pages, args.latency, args.fixtures, args.keyword, args.load_time, args.tabs)
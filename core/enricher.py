@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+职位详情补充模块 - 根据职位卡片中的链接并发抓取详情页，补充职位描述、任职要求、公司规模等字段
+"""
+
+import re
+import time
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from core.parser import DetailParser
+from core.session import HttpSession, ChallengeDetected
+from utils.cache import DiskCache
+from utils.logger import logger
+from utils.rate_limiter import AdaptivePacer
+from config.settings import (
+    DETAIL_WORKERS, DETAIL_RATE_LIMIT, DETAIL_CACHE_DIR, DETAIL_CACHE_TTL
+)
+
+
+def posting_id(record):
+    """职位 ID：优先取 "职位ID" 字段，否则从详情链接中解析，都没有时退回完整链接"""
+    if record.get("职位ID"):
+        return str(record["职位ID"])
+    link = record.get("职位链接")
+    if not link:
+        return None
+    match = re.search(r'/([A-Za-z0-9_]+)\.html?(?:[?#]|$)', link)
+    return match.group(1) if match else link
+
+
+class DetailEnricher:
+    """使用线程池内的独立 HTTP 会话并发抓取详情页，全局限速并按职位 ID 缓存结果"""
+
+    def __init__(self, http=None, workers=None, pacer=None, cache=None, parser=None):
+        """
+        Args:
+            http: 已同步登录态的 HttpSession，每个工作线程会复制一份独立连接池的会话
+            workers: 并发线程数
+            pacer: 限速器，默认使用速率上限为 DETAIL_RATE_LIMIT 的独立限速器
+            cache: 详情缓存，默认使用 DETAIL_CACHE_DIR 下的磁盘缓存
+        """
+        self.http = http or HttpSession()
+        self.workers = workers or DETAIL_WORKERS
+        self.pacer = pacer or AdaptivePacer(rate=DETAIL_RATE_LIMIT, max_rate=DETAIL_RATE_LIMIT)
+        self.cache = cache or DiskCache(DETAIL_CACHE_DIR, DETAIL_CACHE_TTL)
+        self.parser = parser or DetailParser()
+        self._local = threading.local()
+        self._sessions = []
+        self._sessions_lock = threading.Lock()
+
+    def enrich(self, records):
+        """补充全部记录的详情字段，返回列表"""
+        return list(self.iter_enrich(records))
+
+    def iter_enrich(self, records):
+        """按输入顺序逐条产出补充了详情字段的记录，抓取失败的记录原样产出"""
+        records = list(records)
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="detail") as executor:
+            for record, detail in zip(records, executor.map(self._fetch_detail, records)):
+                if detail:
+                    record = {**record, **detail}
+                yield record
+        logger.info(f"📄 {len(records)} 条职位详情补充完成，耗时 {time.time() - start_time:.1f} 秒")
+
+    def iter_enrich_chunked(self, records, chunk_size=20):
+        """分块补充详情并逐条产出，每次只持有一块记录，可直接消费 iter_jobs 等生成器"""
+        records = iter(records)
+        while True:
+            chunk = list(itertools.islice(records, chunk_size))
+            if not chunk:
+                return
+            yield from self.iter_enrich(chunk)
+
+    def close(self):
+        with self._sessions_lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions.clear()
+
+    def _fetch_detail(self, record):
+        """获取单个职位的详情，优先读取缓存"""
+        key = posting_id(record)
+        url = record.get("职位链接")
+        if not key or not url:
+            return None
+
+        detail = self.cache.get(key)
+        if detail is not None:
+            return detail
+
+        self.pacer.wait(url)
+        started = time.monotonic()
+        try:
+            html = self._session().get_text(url)
+        except ChallengeDetected as e:
+            self.pacer.record(url, captcha=True)
+            logger.warning(f"⚠️ 详情页触发验证，跳过: {e}")
+            return None
+        except requests.RequestException as e:
+            self.pacer.record(url, ok=False)
+            logger.warning(f"获取职位详情失败 {url}: {str(e)}")
+            return None
+        self.pacer.record(url, latency=time.monotonic() - started)
+
+        detail = self.parser.parse(html)
+        if any(detail.values()):
+            self.cache.set(key, detail)
+        return detail
+
+    def _session(self):
+        """当前线程专用的 HTTP 会话"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self.http.clone()
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
@@ -10,14 +10,118 @@ import json
 import time
 import random
 import re
+import threading
+import requests
+from contextlib import contextmanager
+from urllib.parse import urlparse
 from cryptography.fernet import Fernet
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+from core.driver import DriverProtocol
+from core.session import HttpSession, ChallengeDetected
 from utils.logger import logger
 from config.settings import URLS, SELECTORS, ENABLE_PASSWORD_ENCRYPTION, SAVE_CREDENTIALS, CREDENTIALS_FILE, MAX_LOGIN_ATTEMPTS, LOGIN_RETRY_DELAY, get_encryption_key
+from config.settings import SESSION_REUSE, SESSION_FILE, SESSION_MAX_AGE, SESSION_PROBE_URL
+from config.settings import (
+    LOGIN_DEADLINE, LOGIN_STEP_TIMEOUT, LOGIN_BACKOFF_MAX, LOGIN_POLL_INTERVAL,
+    LOGIN_TYPING_DELAY, LOGIN_REJECT_MARKERS, IMPLICIT_WAIT
+)
+
+# 导出当前页面的 localStorage
+LOCAL_STORAGE_DUMP_SCRIPT = """
+var items = {};
+for (var i = 0; i < window.localStorage.length; i++) {
+    var key = window.localStorage.key(i);
+    items[key] = window.localStorage.getItem(key);
+}
+return items;
+"""
+
+LOCAL_STORAGE_LOAD_SCRIPT = """
+var items = arguments[0];
+for (var key in items) { window.localStorage.setItem(key, items[key]); }
+"""
+
+# 页面加载状态与已发起的资源请求数，用于判断网络空闲
+NETWORK_STATE_SCRIPT = "return [document.readyState, performance.getEntriesByType('resource').length]"
+
+_session_lock = threading.Lock()
+
+class LoginRejected(Exception):
+    """账号或密码错误等重试也无法成功的登录失败"""
+
+
+class NetworkIdle:
+    """就绪条件：页面加载完成，且 quiet 秒内没有发起新的资源请求"""
+
+    def __init__(self, quiet=0.5):
+        self.quiet = quiet
+        self._count = None
+        self._since = None
+
+    def __call__(self, driver):
+        state = driver.execute_script(NETWORK_STATE_SCRIPT)
+        if not state:
+            # 驱动不支持 Performance API 时只能视为空闲
+            return True
+        ready, count = state
+        now = time.monotonic()
+        if ready != "complete" or count != self._count:
+            self._count = count
+            self._since = now
+            return False
+        return now - self._since >= self.quiet
+
+
+class LoginBudget:
+    """
+    登录时间预算：一次 login_with_retry 中的所有步骤和重试共用一个截止时间，
+    步骤之间等待就绪条件而不是固定休眠，并记录各步骤耗时
+    """
+
+    def __init__(self, driver: DriverProtocol, deadline=None):
+        self.driver = driver
+        self.deadline_seconds = deadline or LOGIN_DEADLINE
+        self.deadline = time.monotonic() + self.deadline_seconds
+        self.timings = []
+
+    def remaining(self):
+        return max(0.0, self.deadline - time.monotonic())
+
+    def until(self, condition, timeout=None, message=""):
+        """等待条件成立并返回其结果，最长等待 timeout 秒且不超过剩余预算"""
+        limit = min(timeout or LOGIN_STEP_TIMEOUT, self.remaining())
+        if limit <= 0:
+            raise TimeoutException(f"登录总时限 {self.deadline_seconds} 秒已用尽: {message}")
+        return WebDriverWait(self.driver, limit, poll_frequency=LOGIN_POLL_INTERVAL).until(condition, message)
+
+    @contextmanager
+    def step(self, name):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.timings.append((name, time.monotonic() - started))
+
+    def backoff(self, attempt):
+        """第 attempt 次失败后退避；剩余预算不够退避后再试一次时返回 False"""
+        delay = min(LOGIN_RETRY_DELAY * 2 ** (attempt - 1), LOGIN_BACKOFF_MAX)
+        if self.remaining() <= delay + LOGIN_STEP_TIMEOUT:
+            return False
+        logger.warning(f"登录失败，{delay}秒后重试（剩余时限 {self.remaining():.0f} 秒）...")
+        time.sleep(delay)
+        return True
+
+    def report(self, attempt):
+        """输出本次尝试各步骤耗时并清空记录"""
+        if self.timings:
+            summary = "，".join(f"{name} {elapsed:.1f}s" for name, elapsed in self.timings)
+            logger.info(f"⏱️ 第{attempt}次登录步骤耗时: {summary}")
+        self.timings = []
+
 
 class PasswordValidator:
     """密码验证器"""
@@ -86,74 +190,266 @@ class CredentialsManager:
         
         return username, password
 
+class SessionStore:
+    """登录会话存储：每个站点的 Cookie 与 localStorage 用 Fernet 加密后保存在同一个文件中"""
+
+    def __init__(self, path=None, credentials_manager=None, max_age=None):
+        self.path = path or SESSION_FILE
+        self.cipher_suite = (credentials_manager or CredentialsManager()).cipher_suite
+        self.max_age = SESSION_MAX_AGE if max_age is None else max_age
+
+    def save(self, site_name, cookies, local_storage, username=None):
+        session = {
+            "saved_at": time.time(),
+            "username": username,
+            "cookies": cookies,
+            "local_storage": local_storage,
+        }
+        token = self.cipher_suite.encrypt(json.dumps(session, ensure_ascii=False).encode()).decode()
+        with _session_lock:
+            sessions = self._read()
+            sessions[site_name] = token
+            self._write(sessions)
+
+    def load(self, site_name, username=None):
+        """返回仍可能有效的会话；没有保存、无法解密、属于其他账号或已过期时返回 None"""
+        with _session_lock:
+            token = self._read().get(site_name)
+        if not token:
+            return None
+        try:
+            session = json.loads(self.cipher_suite.decrypt(token.encode()).decode())
+        except Exception as e:
+            logger.warning(f"会话解密失败，将重新登录: {str(e)}")
+            return None
+
+        if username and session.get("username") and session["username"] != username:
+            return None
+        if self.max_age and time.time() - session["saved_at"] > self.max_age:
+            logger.info("保存的会话已超过有效期")
+            return None
+        now = time.time()
+        session["cookies"] = [c for c in session["cookies"] if not c.get("expiry") or c["expiry"] > now]
+        return session if session["cookies"] else None
+
+    def clear(self, site_name):
+        with _session_lock:
+            sessions = self._read()
+            if sessions.pop(site_name, None) is not None:
+                self._write(sessions)
+
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取会话文件失败: {str(e)}")
+            return {}
+
+    def _write(self, sessions):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(sessions, f)
+        os.replace(tmp_path, self.path)
+
+
 class BaseLoginHandler:
     """登录处理器基类"""
-    def __init__(self, driver):
+    def __init__(self, driver: DriverProtocol):
+        """driver 可以是 Selenium WebDriver 或 FakeDriver"""
         self.driver = driver
         self.credentials_manager = CredentialsManager()
         self.password_validator = PasswordValidator()
-    
-   
-    
-    def login_with_retry(self, username, password, save_credentials=False):
-        """带重试机制的登录（通用实现）"""
-        for attempt in range(MAX_LOGIN_ATTEMPTS):
+        self.session_store = SessionStore(credentials_manager=self.credentials_manager)
+        self.budget = None           # 当前 login_with_retry 的时间预算
+
+    def ensure_login(self, username, password):
+        """优先复用保存的登录会话，失效时完整登录并保存新会话"""
+        if SESSION_REUSE and self.restore_session(username):
+            return True
+        if not self.login_with_retry(username, password):
+            return False
+        if SESSION_REUSE:
+            self.save_session(username)
+        return True
+
+    def restore_session(self, username=None):
+        """
+        复用保存的登录会话
+
+        先用保存的 Cookie 通过 HTTP 请求一次需要登录的页面，确认仍处于登录状态后
+        再注入浏览器，避免为失效的会话加载页面
+
+        Returns:
+            bool: 会话有效且已注入浏览器
+        """
+        started = time.monotonic()
+        session = self.session_store.load(self.site_name, username)
+        if not session:
+            return False
+        if not self._probe_session(session["cookies"]):
+            logger.info("保存的登录会话已失效，需要重新登录")
+            return False
+
+        self._inject_cookies(session["cookies"])
+        for origin, items in session.get("local_storage", {}).items():
+            self.driver.get(origin)
+            self.driver.execute_script(LOCAL_STORAGE_LOAD_SCRIPT, items)
+        logger.info(f"♻️ 已复用保存的登录会话，耗时 {time.monotonic() - started:.1f} 秒")
+        # 重新保存浏览器中的最新 Cookie，SESSION_MAX_AGE 从最近一次成功复用起算
+        self.save_session(session.get("username") or username)
+        return True
+
+    def save_session(self, username=None):
+        """登录成功后加密保存浏览器的 Cookie 和当前站点的 localStorage"""
+        try:
+            cookies = self._export_cookies()
+            origin = self.driver.execute_script("return window.location.origin")
+            items = self.driver.execute_script(LOCAL_STORAGE_DUMP_SCRIPT)
+            local_storage = {origin: items} if items and str(origin).startswith("http") else {}
+            self.session_store.save(self.site_name, cookies, local_storage, username)
+            logger.info(f"🔐 已加密保存登录会话（{len(cookies)} 个 Cookie）")
+        except Exception as e:
+            logger.warning(f"保存登录会话失败: {str(e)}")
+
+    def _probe_session(self, cookies):
+        """不经过浏览器请求探测页面，被跳转到登录或验证页面即视为失效"""
+        http = HttpSession()
+        try:
+            http.session.headers["User-Agent"] = self.driver.execute_script("return navigator.userAgent")
+            http.set_cookies(cookies)
+            http.get(SESSION_PROBE_URL)
+            return True
+        except ChallengeDetected:
+            return False
+        except requests.RequestException as e:
+            logger.warning(f"会话探测请求失败: {str(e)}")
+            return False
+        finally:
+            http.close()
+
+    def _export_cookies(self):
+        """导出浏览器全部域名下的 Cookie；Chrome 通过 CDP 获取，其他浏览器只能取当前域名"""
+        if hasattr(self.driver, "execute_cdp_cmd"):
             try:
-                logger.info(f"第{attempt + 1}次尝试登录...")
-                success = self.login(username, password)
-                
+                cookies = self.driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+                return [self._from_cdp_cookie(cookie) for cookie in cookies]
+            except Exception as e:
+                logger.debug(f"CDP 导出 Cookie 失败，改为读取当前域名: {str(e)}")
+        return self.driver.get_cookies()
+
+    def _inject_cookies(self, cookies):
+        """写入 Cookie；Chrome 通过 CDP 一次写入所有域名，其他浏览器需要逐个打开对应域名"""
+        if hasattr(self.driver, "execute_cdp_cmd"):
+            try:
+                self.driver.execute_cdp_cmd(
+                    "Network.setCookies", {"cookies": [self._to_cdp_cookie(c) for c in cookies]})
+                return
+            except Exception as e:
+                logger.debug(f"CDP 写入 Cookie 失败，改为逐个域名写入: {str(e)}")
+
+        by_host = {}
+        for cookie in cookies:
+            by_host.setdefault(cookie.get("domain", "").lstrip("."), []).append(cookie)
+        for host, host_cookies in by_host.items():
+            if not host:
+                continue
+            self.driver.get(f"https://{host}/")
+            for cookie in host_cookies:
+                try:
+                    self.driver.add_cookie(cookie)
+                except Exception as e:
+                    logger.debug(f"写入 Cookie {cookie.get('name')} 失败: {str(e)}")
+
+    @staticmethod
+    def _from_cdp_cookie(cookie):
+        """CDP Cookie 转为 WebDriver 格式"""
+        converted = {
+            "name": cookie["name"],
+            "value": cookie["value"],
+            "domain": cookie["domain"],
+            "path": cookie.get("path", "/"),
+            "secure": cookie.get("secure", False),
+            "httpOnly": cookie.get("httpOnly", False),
+        }
+        if cookie.get("sameSite"):
+            converted["sameSite"] = cookie["sameSite"]
+        if not cookie.get("session") and cookie.get("expires", -1) > 0:
+            converted["expiry"] = int(cookie["expires"])
+        return converted
+
+    @staticmethod
+    def _to_cdp_cookie(cookie):
+        """WebDriver 格式 Cookie 转为 CDP Network.setCookies 参数"""
+        converted = {
+            "name": cookie["name"],
+            "value": cookie["value"],
+            "domain": cookie.get("domain", ""),
+            "path": cookie.get("path", "/"),
+            "secure": cookie.get("secure", False),
+            "httpOnly": cookie.get("httpOnly", False),
+        }
+        if cookie.get("sameSite"):
+            converted["sameSite"] = cookie["sameSite"]
+        if cookie.get("expiry"):
+            converted["expires"] = cookie["expiry"]
+        return converted
+
+    def login_with_retry(self, username, password, save_credentials=False):
+        """
+        带重试机制的登录（通用实现）
+
+        所有尝试共用 LOGIN_DEADLINE 秒的总时限，失败后按指数退避重试；
+        账号或密码错误时立即放弃
+        """
+        self.budget = LoginBudget(self.driver)
+        started = time.monotonic()
+        # 就绪条件会反复查找通常不存在的元素，隐式等待会让每次查找阻塞到超时
+        self.driver.implicitly_wait(0)
+        try:
+            for attempt in range(1, MAX_LOGIN_ATTEMPTS + 1):
+                logger.info(f"第{attempt}次尝试登录...")
+                try:
+                    success = self.login(username, password)
+                except LoginRejected as e:
+                    logger.error(f"登录被拒绝，不再重试: {str(e)}")
+                    return False
+                except Exception as e:
+                    logger.error(f"登录尝试{attempt}失败: {str(e)}")
+                    success = False
+                finally:
+                    self.budget.report(attempt)
+
                 if success:
+                    logger.info(f"登录完成，总耗时 {time.monotonic() - started:.1f} 秒")
                     if save_credentials:
                         self.credentials_manager.save_credentials(self.site_name, username, password)
                     return True
-                else:
-                    if attempt < MAX_LOGIN_ATTEMPTS - 1:
-                        logger.warning(f"登录失败，{LOGIN_RETRY_DELAY}秒后重试...")
-                        time.sleep(LOGIN_RETRY_DELAY)
-                    
-            except Exception as e:
-                logger.error(f"登录尝试{attempt + 1}失败: {str(e)}")
-                if attempt < MAX_LOGIN_ATTEMPTS - 1:
-                    time.sleep(LOGIN_RETRY_DELAY)
-        
-        logger.error(f"登录失败，已尝试{MAX_LOGIN_ATTEMPTS}次")
-        return False
-    
+                if attempt < MAX_LOGIN_ATTEMPTS and not self.budget.backoff(attempt):
+                    logger.error(f"登录总时限 {self.budget.deadline_seconds} 秒内无法再次尝试")
+                    break
+
+            logger.error(f"登录失败，已尝试{attempt}次，耗时 {time.monotonic() - started:.1f} 秒")
+            return False
+        finally:
+            self.budget = None
+            self.driver.implicitly_wait(IMPLICIT_WAIT)
+
+    def _budget(self):
+        """当前时间预算；直接调用 login 时新建一个"""
+        if self.budget is None:
+            self.budget = LoginBudget(self.driver)
+        return self.budget
+
     def _input_text_with_delay(self, element, text):
         """模拟人工输入文本，带有随机延迟"""
         element.clear()
-        time.sleep(0.5)
         for char in text:
             element.send_keys(char)
-            time.sleep(random.uniform(0.05, 0.15))
-    
-    def _wait_for_login_success(self, success_selector):
-        """等待登录成功（通用实现）"""
-        try:
-            logger.info("等待登录成功...")
-            
-            # 检查错误信息（各平台通用）
-            error_selectors = [".error-msg", ".ant-message-error"]
-            time.sleep(2)
-            
-            for selector in error_selectors:
-                error_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if error_elements and error_elements[0].is_displayed():
-                    error_text = error_elements[0].text
-                    if error_text and ("错误" in error_text or "失败" in error_text):
-                        logger.error(f"登录失败: {error_text}")
-                        return False
-            
-            # 等待平台特定的成功标志
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, success_selector)))
-            
-            logger.info(f"{self.site_name} 登录成功")
-            return True
-            
-        except Exception as e:
-            logger.error(f"等待登录成功失败: {str(e)}")
-            return False
+            time.sleep(random.uniform(*LOGIN_TYPING_DELAY))
 
 
 class ZhilianLoginHandler(BaseLoginHandler):
@@ -171,109 +467,144 @@ class ZhilianLoginHandler(BaseLoginHandler):
         "input.zppp-input[type='password']",
     ]
 
-    def __init__(self, driver):
+    def __init__(self, driver: DriverProtocol):
         super().__init__(driver)
         self.site_name = "zhilian"
         self.login_url = URLS[self.site_name]["login"]
         self.selectors = SELECTORS[self.site_name]["login"]
-        self.max_retries = 3  # 最大重试次数
     
+    password_tab_selectors = [
+        "li.zppp-panel-tab[data-bind*='账密登录']",
+        "//li[contains(@class, 'zppp-panel-tab') and contains(text(), '账密登录')]",
+        "li.zppp-panel-tab--active"
+    ]
+
+    qrcode_selectors = [
+        "div.zppp-panel-qrcode-bar__img",
+        "[data-bind*='loginPanelToggle']"
+    ]
+
+    challenge_selectors = [".nc_iconfont.btn_slide", ".captcha-img"]
+
     def login(self, username, password):
-        """执行登录流程"""
-        for attempt in range(1, self.max_retries + 1):
-            try:
-                logger.info(f"第 {attempt} 次尝试登录智联招聘...")
-                
-                #  访问登录页
-                self.driver.get(self.login_url)
-                time.sleep(random.uniform(1, 2))  # 随机延迟防检测
-
-                
-                #  确保切换到账密登录模式
-                if not self._switch_to_password_login():
-                    continue
-                
-                # 输入凭据
-                self._input_credentials(username, password)
+        """执行一次登录：每一步等待页面就绪条件，重试与总时限由 login_with_retry 控制"""
+        budget = self._budget()
+        logger.info("正在登录智联招聘...")
 
-                #协议处理
-                try:
-                    # 等待复选框出现
-                    accept_checkbox = WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "input.zppp-accept__checkbox"))
-                    )
-                    
-                    # 检查是否已经勾选
-                    if not accept_checkbox.is_selected():
-                        # 使用JavaScript点击，避免元素被遮挡
-                        self.driver.execute_script("arguments[0].click();", accept_checkbox)
-                        logger.info("已勾选用户协议复选框")
-                        time.sleep(0.5)  # 等待状态更新
-                except Exception as e:
-                    logger.warning(f"勾选用户协议时出错: {str(e)}")
-                
-
-                self._submit_login()
-                
-                # 验证登录结果
-                if self._verify_login_success():
-                    logger.info("智联招聘登录成功")
-                    return True
-                
-            except Exception as e:
-                logger.error(f"登录尝试 {attempt} 失败: {str(e)}")
-                if attempt == self.max_retries:
-                    logger.error("已达到最大重试次数")
-                else:
-                    time.sleep(2 ** attempt)  # 指数退避
-        
-        return False
+        with budget.step("打开登录页"):
+            self.driver.get(self.login_url)
+            budget.until(self._login_form_ready, message="登录页加载")
 
-    def _switch_to_password_login(self):
+        with budget.step("切换账密登录"):
+            if not self._switch_to_password_login():
+                return False
 
-        password_selectors = [
-            "li.zppp-panel-tab[data-bind*='账密登录']",
-            "//li[contains(@class, 'zppp-panel-tab') and contains(text(), '账密登录')]",
-            "li.zppp-panel-tab--active"
-        ]
+        with budget.step("输入账号密码"):
+            self._input_credentials(username, password)
 
-        qrcode_selectors = [
-            "div.zppp-panel-qrcode-bar__img",
-            "[data-bind*='loginPanelToggle']"
-        ]
+        with budget.step("勾选用户协议"):
+            self._accept_agreement()
 
+        with budget.step("提交并等待结果"):
+            self._submit_login()
+            outcome, detail = budget.until(self._login_outcome, message="登录结果")
 
-        for attempt in range(3):
-            logger.info(f"尝试切换到账密登录（第{attempt + 1}次）")
+        if outcome == "rejected":
+            raise LoginRejected(detail)
+        if outcome != "success":
+            logger.warning(f"登录未成功: {detail}")
+            return False
+
+        with budget.step("等待跳转完成"):
             try:
-                # 点击二维码标签以重置状态
-                for qr_selector in qrcode_selectors:
-                    try:
-                        qr_tab = WebDriverWait(self.driver, 3).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, qr_selector)))
-                        qr_tab.click()
-                        time.sleep(1)
-                    except:
-                        continue
+                # 登录后的跳转会继续写入 Cookie，网络空闲后再交给后续流程
+                budget.until(NetworkIdle(), 5, "跳转后网络空闲")
+            except TimeoutException:
+                pass
+        logger.info("智联招聘登录成功")
+        return True
 
-                    # 点击账密登录标签
-                    for pwd_selector in password_selectors:
-                        try:
-                            by_method = By.XPATH if "//" in pwd_selector else By.CSS_SELECTOR
-                            pwd_tab = WebDriverWait(self.driver, 3).until(
-                                EC.element_to_be_clickable((by_method, pwd_selector)))
-                            pwd_tab.click()
-                            time.sleep(1)
-                            return True  # 直接认为点击完成即可
-                        except:
-                            continue
-            except Exception as e:
-                logger.warning(f"第{attempt + 1}次尝试异常: {e}")
-                time.sleep(2 ** attempt)
+    def _login_form_ready(self, driver):
+        """就绪条件：登录面板（标签页或输入框）已渲染"""
+        selectors = ", ".join(self.passwd_selector + ["li.zppp-panel-tab"] + self.qrcode_selectors)
+        return bool(driver.find_elements(By.CSS_SELECTOR, selectors))
+
+    def _password_form_visible(self, driver):
+        """就绪条件：密码输入框可见"""
+        return any(
+            element.is_displayed()
+            for element in driver.find_elements(By.CSS_SELECTOR, ", ".join(self.passwd_selector))
+        )
+
+    def _switch_to_password_login(self):
+        """切换到账密登录：点击标签后等待密码框出现，不成功时先点二维码切换再试"""
+        if self._password_form_visible(self.driver):
+            return True
+
+        budget = self._budget()
+        for toggle in [None] + self.qrcode_selectors:
+            if toggle:
+                toggles = self.driver.find_elements(By.CSS_SELECTOR, toggle)
+                if not toggles or not toggles[0].is_displayed():
+                    continue
+                toggles[0].click()
+
+            for pwd_selector in self.password_tab_selectors:
+                by_method = By.XPATH if "//" in pwd_selector else By.CSS_SELECTOR
+                tabs = self.driver.find_elements(by_method, pwd_selector)
+                if not tabs or not tabs[0].is_displayed():
+                    continue
+                tabs[0].click()
+                try:
+                    budget.until(self._password_form_visible, 3, "账密登录表单")
+                    return True
+                except TimeoutException:
+                    continue
 
         logger.error("自动切换到账密登录失败")
         return False
 
+    def _accept_agreement(self):
+        """勾选用户协议，等待复选框状态变为已勾选"""
+        budget = self._budget()
+        try:
+            accept_checkbox = budget.until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "input.zppp-accept__checkbox")),
+                3, "用户协议复选框"
+            )
+            if not accept_checkbox.is_selected():
+                # 使用JavaScript点击，避免元素被遮挡
+                self.driver.execute_script("arguments[0].click();", accept_checkbox)
+                budget.until(lambda driver: accept_checkbox.is_selected(), 2, "勾选用户协议")
+                logger.info("已勾选用户协议复选框")
+        except Exception as e:
+            logger.warning(f"勾选用户协议时出错: {str(e)}")
+
+    def _login_outcome(self, driver):
+        """
+        提交后的就绪条件
+
+        Returns:
+            (结果, 说明)：离开登录页为 success，账号密码错误为 rejected，
+            其他错误提示或验证码为 failed；仍在等待时返回 False
+        """
+        if urlparse(driver.current_url).netloc != urlparse(self.login_url).netloc:
+            return "success", driver.current_url
+
+        for selector in [self.selectors["error_message"], ".ant-message-error"]:
+            for element in driver.find_elements(By.CSS_SELECTOR, selector):
+                text = element.text.strip() if element.is_displayed() else ""
+                if not text:
+                    continue
+                if any(marker in text for marker in LOGIN_REJECT_MARKERS):
+                    return "rejected", text
+                return "failed", text
+
+        for selector in self.challenge_selectors:
+            elements = driver.find_elements(By.CSS_SELECTOR, selector)
+            if elements and elements[0].is_displayed():
+                return "failed", f"出现安全验证 {selector}"
+        return False
 
     def _input_credentials(self, username, password):
         """最终修正版凭证输入"""
@@ -297,8 +628,8 @@ class ZhilianLoginHandler(BaseLoginHandler):
             def get_input(selectors, name):
                 for selector in selectors:
                     try:
-                        return WebDriverWait(self.driver, 3).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
+                        return self._budget().until(
+                            EC.element_to_be_clickable((By.CSS_SELECTOR, selector)), 3, f"{name}输入框")
                     except:
                         continue
                 raise NoSuchElementException(f"找不到{name}输入框")
@@ -315,35 +646,7 @@ class ZhilianLoginHandler(BaseLoginHandler):
             
         except Exception as e:
             logger.error(f"输入凭证失败: {str(e)}")
-            self._save_screenshot("input_credentials_failed")
             raise
-    def _handle_security_checks(self):
-        """处理安全验证（验证码/滑块等）"""
-        try:
-            # 检查图形验证码
-            captcha = self.driver.find_elements(
-                By.CSS_SELECTOR, self.selectors["captcha"])
-            if captcha and captcha[0].is_displayed():
-                logger.warning("检测到图形验证码")
-                print("\n" + "="*50)
-                print("⚠️ 请手动输入验证码")
-                print("="*50)
-                input("完成后按回车继续...")
-                
-            # 检查滑块验证
-            slider = self.driver.find_elements(
-                By.CSS_SELECTOR, ".nc_iconfont.btn_slide")
-            if slider and slider[0].is_displayed():
-                logger.warning("检测到滑块验证")
-                print("\n" + "="*50)
-                print("⚠️ 请手动完成滑块验证")
-                print("="*50)
-                input("完成后按回车继续...")
-                
-            return True
-        except Exception as e:
-            logger.error(f"安全验证处理失败: {str(e)}")
-            return False
 
     def _submit_login(self):
         login_selectors = [
@@ -353,35 +656,13 @@ class ZhilianLoginHandler(BaseLoginHandler):
 
         for by, selector in login_selectors:
             try:
-                login_button = WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable((by, selector))
-                )
+                login_button = self._budget().until(
+                    EC.element_to_be_clickable((by, selector)), 5, "登录按钮")
                 login_button.click()
-                time.sleep(2)
-                print(f"点击成功: {selector}")
+                logger.debug(f"点击成功: {selector}")
                 return
             except Exception as e:
-                print(f"尝试 {selector} 失败: {e}")
+                logger.debug(f"尝试 {selector} 失败: {e}")
                 continue
 
         raise Exception("未找到可点击的登录按钮")
-
-    def _verify_login_success(self):
-        """验证登录是否成功"""
-        try:
-            # 方式1：检查URL变化
-            if "login" not in self.driver.current_url.lower():
-                return True
-                
-            # 方式2：检查用户信息元素
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, self.selectors["success_indicator"])))
-            return True
-        except:
-            # 方式3：检查错误提示
-            error_msg = self.driver.find_elements(
-                By.CSS_SELECTOR, self.selectors["error_msg"])
-            if error_msg and error_msg[0].is_displayed():
-                logger.error(f"登录失败: {error_msg[0].text}")
-            return False
\ No newline at end of file
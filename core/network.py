@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+网络捕获模块 - 从 Chrome 性能日志中读取搜索接口的 JSON 响应，直接生成结构化职位数据
+"""
+
+import re
+import json
+import time
+import base64
+
+from core.driver import DriverProtocol
+from utils.logger import logger
+from config.settings import SEARCH_API_PATTERN, SEARCH_API_LIST_PATH, SEARCH_API_FIELDS
+
+
+def get_path(data, path):
+    """按点分路径读取嵌套字段，如 "company.name"，缺失时返回 None"""
+    for key in path.split("."):
+        if isinstance(data, dict):
+            data = data.get(key)
+        elif isinstance(data, list) and key.isdigit() and int(key) < len(data):
+            data = data[int(key)]
+        else:
+            return None
+    return data
+
+
+class ApiRecordMapper:
+    """搜索接口响应到职位字典的映射器，网络捕获与 HTTP 直连共用"""
+
+    def __init__(self, list_path=None, field_map=None):
+        self.list_path = SEARCH_API_LIST_PATH if list_path is None else list_path
+        self.field_map = field_map or SEARCH_API_FIELDS
+
+    def extract_records(self, payload, page=None):
+        """将接口响应映射为职位字典列表"""
+        items = get_path(payload, self.list_path) if self.list_path else self._find_item_list(payload)
+        if not isinstance(items, list):
+            logger.warning("接口响应中未找到职位列表")
+            return []
+
+        records = []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            record = {name: get_path(item, path) for name, path in self.field_map.items()}
+            if page is not None:
+                record["页码"] = page
+            records.append(record)
+        return records
+
+    def _find_item_list(self, data):
+        """未配置列表路径时，查找第一个包含职位名称字段的字典列表"""
+        title_path = next(iter(self.field_map.values()))
+        if isinstance(data, list):
+            if data and isinstance(data[0], dict) and get_path(data[0], title_path) is not None:
+                return data
+            candidates = data
+        elif isinstance(data, dict):
+            candidates = data.values()
+        else:
+            return None
+        for value in candidates:
+            found = self._find_item_list(value)
+            if found is not None:
+                return found
+        return None
+
+
+class NetworkCapture:
+    """
+    搜索接口响应捕获器，依赖浏览器启用 goog:loggingPrefs 性能日志
+
+    第一次读取性能日志失败（浏览器不支持或未开启）后停用，available 变为 False，之后不再读取。
+    """
+
+    def __init__(self, driver: DriverProtocol, url_pattern=None, list_path=None, field_map=None):
+        self.driver = driver
+        self.url_pattern = re.compile(url_pattern or SEARCH_API_PATTERN)
+        self.mapper = ApiRecordMapper(list_path, field_map)
+        self.available = True
+        self._requested = set()
+        self._pending = {}
+
+    def drain(self):
+        """丢弃已缓冲的日志，只关注之后发生的请求"""
+        self._read_log()
+        self._requested.clear()
+        self._pending.clear()
+
+    def capture(self):
+        """
+        读取新增日志，返回已完成加载的接口响应
+
+        Returns:
+            list: 解析后的 JSON 对象列表，按响应完成顺序排列
+        """
+        payloads = []
+        for method, params in self._read_log():
+            if method == "Network.requestWillBeSent":
+                if self.url_pattern.search(params.get("request", {}).get("url", "")):
+                    self._requested.add(params.get("requestId"))
+            elif method == "Network.loadingFailed":
+                self._requested.discard(params.get("requestId"))
+                self._pending.pop(params.get("requestId"), None)
+            elif method == "Network.responseReceived":
+                response = params.get("response", {})
+                if "json" in response.get("mimeType", "") and self.url_pattern.search(response.get("url", "")):
+                    self._pending[params["requestId"]] = response["url"]
+            elif method == "Network.loadingFinished" and params.get("requestId") in self._pending:
+                self._requested.discard(params["requestId"])
+                url = self._pending.pop(params["requestId"])
+                payload = self._get_body(params["requestId"], url)
+                if payload is not None:
+                    payloads.append(payload)
+        return payloads
+
+    def wait_for_records(self, timeout=10, poll_interval=0.2, settled=None):
+        """
+        轮询性能日志直到捕获到接口响应，返回最后一次响应中的职位记录；超时或捕获不可用时返回 None
+
+        Args:
+            settled: 可选回调 settled() -> bool，页面已就绪（如职位列表已渲染）时返回真；
+                此时若没有进行中的接口请求，说明该页不会再发出接口请求，立即返回 None
+        """
+        deadline = time.monotonic() + timeout
+        while self.available:
+            payloads = self.capture()
+            if payloads:
+                return self.mapper.extract_records(payloads[-1])
+            if time.monotonic() >= deadline:
+                return None
+            if settled and not self._requested and not self._pending and settled():
+                return None
+            time.sleep(poll_interval)
+        return None
+
+    def _read_log(self):
+        """读取并解析性能日志条目"""
+        if not self.available:
+            return []
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception as e:
+            logger.warning(f"读取性能日志失败，本会话停用网络捕获: {str(e)}")
+            self.available = False
+            return []
+
+        events = []
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+                events.append((message.get("method"), message.get("params", {})))
+            except (KeyError, ValueError):
+                continue
+        return events
+
+    def _get_body(self, request_id, url):
+        """通过 CDP 获取响应体并解析 JSON"""
+        try:
+            result = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            body = result.get("body", "")
+            if result.get("base64Encoded"):
+                body = base64.b64decode(body).decode("utf-8", errors="replace")
+            return json.loads(body)
+        except Exception as e:
+            logger.warning(f"获取接口响应失败 {url}: {str(e)}")
+            return None
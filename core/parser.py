@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+页面解析模块 - 基于 lxml 解析页面源码快照，可用于在线 page_source 与本地保存的 HTML 文件
+"""
+
+import re
+from urllib.parse import urljoin
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
+
+from utils.logger import logger
+from config.settings import SELECTORS, OPTIONAL_FIELDS, JOB_FIELDS, DETAIL_FIELDS
+
+
+def compile_selector(selector):
+    """编译选择器，以 / 或 ( 开头视为 XPath，其余视为 CSS"""
+    if selector.startswith(("/", "(")):
+        return etree.XPath(selector)
+    return CSSSelector(selector)
+
+
+def node_text(node):
+    """提取节点文本并压缩空白，近似浏览器中的 innerText"""
+    return re.sub(r'\s+', ' ', node.text_content()).strip()
+
+
+class JobListParser:
+    """职位列表解析器，对整页 HTML 一次性解析全部职位卡片"""
+
+    def __init__(self, site_name="zhilian", fields=None, optional_fields=None):
+        selectors = SELECTORS[site_name]["search"]
+        fields = fields or JOB_FIELDS
+        optional_fields = OPTIONAL_FIELDS if optional_fields is None else optional_fields
+
+        self.item_selector = compile_selector(selectors["job_item"])
+        self.field_selectors = [
+            (name, compile_selector(selectors[key]), key in optional_fields, attr[0] if attr else None)
+            for name, key, *attr in fields
+        ]
+
+    def parse(self, html, page=None, base_url=None):
+        """
+        解析页面源码
+
+        Args:
+            html: 页面源码（str 或 bytes）
+            page: 页码，非 None 时写入每条记录的 "页码" 字段
+            base_url: 页面地址，用于把链接类属性转换为绝对地址
+
+        Returns:
+            list: 职位字典列表，缺失必需字段的卡片为 None
+        """
+        if not html or not html.strip():
+            return []
+        try:
+            root = lxml_html.fromstring(html)
+        except (etree.ParserError, ValueError) as e:
+            logger.error(f"解析页面源码失败: {str(e)}")
+            return []
+        return [self._parse_item(item, page, base_url) for item in self.item_selector(root)]
+
+    def parse_file(self, path, page=None, encoding="utf-8"):
+        """解析本地保存的 HTML 文件"""
+        with open(path, 'r', encoding=encoding) as f:
+            return self.parse(f.read(), page)
+
+    def _parse_item(self, item, page, base_url=None):
+        """解析单个职位卡片"""
+        record = {}
+        for name, selector, optional, attr in self.field_selectors:
+            nodes = selector(item)
+            if not nodes:
+                if optional:
+                    record[name] = None
+                    continue
+                logger.warning(f"提取职位信息时元素未找到: {name}")
+                return None
+            if attr:
+                value = nodes[0].get(attr)
+                record[name] = urljoin(base_url, value) if base_url and value else value
+            else:
+                record[name] = node_text(nodes[0])
+        if page is not None:
+            record["页码"] = page
+        return record
+
+
+class DetailParser:
+    """职位详情页解析器"""
+
+    def __init__(self, site_name="zhilian", fields=None):
+        selectors = SELECTORS[site_name]["detail"]
+        self.field_selectors = [
+            (name, compile_selector(selectors[key]))
+            for name, key in (fields or DETAIL_FIELDS)
+        ]
+
+    def parse(self, html):
+        """解析详情页，多个匹配节点的文本按行拼接，缺失字段为 None"""
+        if not html or not html.strip():
+            return {}
+        try:
+            root = lxml_html.fromstring(html)
+        except (etree.ParserError, ValueError) as e:
+            logger.error(f"解析详情页失败: {str(e)}")
+            return {}
+        return {
+            name: "\n".join(node_text(node) for node in selector(root)) or None
+            for name, selector in self.field_selectors
+        }
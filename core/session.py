@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+HTTP 会话模块 - 复用浏览器登录后的 Cookie 与 User-Agent，通过连接池直接请求页面或接口
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.logger import logger
+from config.settings import HTTP_POOL_SIZE, HTTP_TIMEOUT, CHALLENGE_URL_MARKERS, CHALLENGE_BODY_MARKERS
+
+
+class ChallengeDetected(Exception):
+    """遇到登录跳转、验证码或风控页面，需要浏览器处理"""
+
+    def __init__(self, url, reason):
+        super().__init__(f"{reason}: {url}")
+        self.url = url
+        self.reason = reason
+
+
+class HttpSession:
+    """带连接池和 keep-alive 的 requests 会话，登录态来自浏览器"""
+
+    def __init__(self, driver=None, pool_size=None, timeout=None):
+        self.pool_size = pool_size or HTTP_POOL_SIZE
+        self.timeout = timeout or HTTP_TIMEOUT
+        self.session = requests.Session()
+
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Connection": "keep-alive",
+            "Accept-Language": "zh-CN,zh;q=0.9",
+        })
+
+        if driver is not None:
+            self.sync_from_driver(driver)
+
+    def sync_from_driver(self, driver):
+        """从浏览器导出 Cookie 和 User-Agent"""
+        self.session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent")
+        cookies = driver.get_cookies()
+        self.set_cookies(cookies)
+        logger.info(f"🍪 已从浏览器同步 {len(cookies)} 个 Cookie 到 HTTP 会话")
+
+    def set_cookies(self, cookies):
+        """写入 WebDriver 格式的 Cookie 列表"""
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie["name"], cookie["value"],
+                domain=cookie.get("domain"), path=cookie.get("path", "/")
+            )
+
+    def clone(self):
+        """复制一个共享登录态但拥有独立连接池的会话，供多线程使用"""
+        other = HttpSession(pool_size=self.pool_size, timeout=self.timeout)
+        other.session.headers.update(self.session.headers)
+        other.session.cookies.update(self.session.cookies)
+        return other
+
+    def get(self, url, **kwargs):
+        """发送 GET 请求，检测到挑战页时抛出 ChallengeDetected"""
+        kwargs.setdefault("timeout", self.timeout)
+        response = self.session.get(url, **kwargs)
+        self._check_challenge(response)
+        response.raise_for_status()
+        return response
+
+    def get_text(self, url, **kwargs):
+        return self.get(url, **kwargs).text
+
+    def get_json(self, url, **kwargs):
+        return self.get(url, **kwargs).json()
+
+    def close(self):
+        self.session.close()
+
+    @staticmethod
+    def _check_challenge(response):
+        """根据状态码、跳转地址和页面内容判断是否为挑战页"""
+        if response.status_code in (401, 403, 429):
+            raise ChallengeDetected(response.url, f"HTTP {response.status_code}")
+        if any(marker in response.url for marker in CHALLENGE_URL_MARKERS):
+            raise ChallengeDetected(response.url, "跳转到登录或验证页面")
+        if "html" in response.headers.get("Content-Type", ""):
+            text = response.text
+            for marker in CHALLENGE_BODY_MARKERS:
+                if marker in text:
+                    raise ChallengeDetected(response.url, f"页面包含验证标记 {marker}")
@@ -4,15 +4,24 @@
 import os
 import sys
 import getpass
+import argparse
 from datetime import datetime
 import pandas as pd
 
 from core.browser import BrowserManager
+from core.browser_pool import BrowserPool, BrowserLease
 from core.login import ZhilianLoginHandler, PasswordValidator
 from core.crawler import ZhilianCrawler
+from core.coordinator import CrawlCoordinator
+from core.enricher import DetailEnricher
+from core.session import HttpSession
 from utils import data_cleaner
 from utils.logger import logger
 from utils.proxys_pool import ProxyPoolManager 
+from utils.checkpoint import CheckpointStore
+from utils.fingerprint import FingerprintIndex
+from utils.fixtures import FixtureRecorder
+from utils.sinks import JsonLinesSink, CsvSink, drain_to
 
 from config.settings import (
     MAX_RESULTS, OUTPUT_DIR, OUTPUT_FILENAME, 
@@ -21,7 +30,10 @@ from config.settings import (
     PASSWORD_MIN_LENGTH,
     PASSWORD_REQUIRE_SPECIAL_CHAR,
     PASSWORD_REQUIRE_NUMBER,
-    PASSWORD_REQUIRE_UPPERCASE
+    PASSWORD_REQUIRE_UPPERCASE,
+    CRAWL_WORKERS, USE_PROXY,
+    CHECKPOINT_ENABLED, FINGERPRINT_ENABLED, ENRICH_DETAILS,
+    FIXTURE_RECORD, SESSION_REUSE, STREAM_OUTPUT, STREAM_EXCEL_EXPORT
 )
 
 def clear_screen():
@@ -44,6 +56,28 @@ def input_search_keyword():
         keyword = input("\n请输入要搜索的职位关键词 (默认: Python): ").strip()
         return keyword if keyword else "Python"
 
+def load_keywords_file(path):
+    """从文件读取关键词，每行一个，忽略空行和 # 开头的注释"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="智联招聘职位数据爬虫")
+    parser.add_argument("-k", "--keywords", help="关键词列表，以逗号分隔，如 \"Python,Java\"")
+    parser.add_argument("-f", "--keywords-file", help="关键词文件，每行一个关键词")
+    parser.add_argument("-n", "--max-pages", type=int, help="每个关键词的最大页数")
+    return parser.parse_args()
+
+def collect_keywords(args):
+    """合并命令行与文件中的关键词（保序去重），均未提供时交互输入"""
+    keywords = []
+    if args.keywords:
+        keywords += [k.strip() for k in args.keywords.split(",") if k.strip()]
+    if args.keywords_file:
+        keywords += load_keywords_file(args.keywords_file)
+    keywords = list(dict.fromkeys(keywords))
+    return keywords or [input_search_keyword()]
+
 def input_max_results():
     while True:
         try:
@@ -52,6 +86,18 @@ def input_max_results():
         except ValueError:
             print("请输入有效数字!")
 
+def input_resume(checkpoint, keywords, max_pages):
+    """存在未完成、且在 max_pages 页以内还能继续的断点时询问是否续爬"""
+    unfinished = [
+        f"'{keyword}'（已完成 {checkpoint.last_page(keyword)} 页）"
+        for keyword in keywords
+        if checkpoint.resumable(keyword, max_pages)
+    ]
+    if not unfinished:
+        return False
+    choice = input(f"\n发现未完成的爬取: {'、'.join(unfinished)}，是否继续? [Y/n]: ").strip().lower()
+    return choice != "n"
+
 def show_env_setup_guide():
     print("\n📋 环境变量设置指南:")
     print("export ZHILIAN_USERNAME=\"your_username\"")
@@ -103,7 +149,132 @@ def get_login_credentials():
                 sys.exit(0)
     return input_login_credentials_interactive()
 
+def export_job_data(keyword, job_data, cleaned=False):
+    """清洗、分类并导出职位数据；cleaned=True 表示数据已清洗（如读取自流式输出文件）"""
+    if not job_data:
+        print("\n⚠️ 未获取到任何职位数据")
+        return
+
+    # 1. 数据清洗
+    if not cleaned:
+        job_data = data_cleaner.DataCleaner.clean_job_data(job_data)
+    df = pd.DataFrame(job_data)
+
+    # 2. 分类优先级：实习 > 面议 > 正式
+    is_intern = df["职位名称"].str.contains("实习", case=False, na=False)
+    is_negotiable = df["薪资"].str.contains("面议", na=False)
+
+    df_intern = df[is_intern]
+    df_negotiable = df[~is_intern & is_negotiable]  # 排除实习中的面议
+    df_filtered = df[~is_intern & ~is_negotiable]   # 剩下的正式岗位
+
+    # 3. 输出目录准备
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    base_dir = os.path.join(OUTPUT_DIR, f"zhilian_{keyword}_{timestamp}")
+    os.makedirs(base_dir, exist_ok=True)
+
+    file_main = os.path.join(base_dir, "正式岗位_已清洗.xlsx")
+    file_intern = os.path.join(base_dir, "实习岗位.xlsx")
+    file_negotiable = os.path.join(base_dir, "面议岗位.xlsx")
+
+    df_filtered.to_excel(file_main, index=False)
+    df_intern.to_excel(file_intern, index=False)
+    df_negotiable.to_excel(file_negotiable, index=False)
+
+    # 4. 仅对正式岗位分析
+    stats = data_cleaner.DataCleaner.analyze_data(df_filtered)
+    print("\n📊 正式岗位数据统计:")
+    for k, v in stats.items():
+        print(f"{k}: {v}")
+
+    # 5. 总结
+    print(f"\n✅ 清洗完成，共 {len(df)} 条数据")
+    print(f"📁 正式岗位：{len(df_filtered)} 条，文件：{file_main}")
+    print(f"📁 实习岗位：{len(df_intern)} 条，文件：{file_intern}")
+    print(f"📁 面议岗位(非实习)：{len(df_negotiable)} 条，文件：{file_negotiable}")
+
+def open_enricher(driver=None):
+    """开启详情补充时创建详情补充器，传入 driver 时复用其登录态；未开启时返回 None"""
+    if not ENRICH_DETAILS:
+        return None
+    return DetailEnricher(HttpSession(driver))
+
+def enrich_details(job_data, driver=None):
+    """抓取职位详情页补充描述、要求等字段"""
+    enricher = open_enricher(driver) if job_data else None
+    if not enricher:
+        return job_data
+    print(f"\n📄 正在补充 {len(job_data)} 条职位的详情信息...")
+    try:
+        return enricher.enrich(job_data)
+    finally:
+        enricher.close()
+
+def open_stream_sink(label):
+    """按 STREAM_OUTPUT 创建边爬边写入的输出，未开启时返回 None"""
+    if not STREAM_OUTPUT:
+        return None
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = os.path.join(OUTPUT_DIR, f"zhilian_{label}_{timestamp}.{STREAM_OUTPUT}")
+    print(f"📝 数据将边爬边写入: {path}")
+    return CsvSink(path) if STREAM_OUTPUT == "csv" else JsonLinesSink(path)
+
+def load_stream_output(path):
+    """读取流式输出文件中已清洗的数据"""
+    if not os.path.exists(path):
+        return []
+    df = pd.read_csv(path) if path.endswith(".csv") else pd.read_json(path, lines=True)
+    return df.to_dict("records")
+
+def stream_crawl(crawler, keywords, max_pages, resume, sink, enricher=None):
+    """
+    消费 iter_batch：按页补充详情（可选）、逐条清洗后立即写入流式输出，内存中不保留数据
+
+    Returns:
+        int: 写入条数
+    """
+    records = crawler.iter_batch(keywords, max_pages, resume=resume)
+    if enricher:
+        records = enricher.iter_enrich_chunked(records)
+    # 每页约 20 条，按页刷新，中途中断时已爬取的数据也已落盘
+    count = drain_to(data_cleaner.DataCleaner.iter_clean(records), sink, flush_every=20)
+    logger.info(f"爬取完成，共写入 {count} 条数据")
+    return count
+
+def crawl_parallel(keywords, max_pages, sink=None):
+    """多浏览器并行爬取，每个浏览器独立登录"""
+    credentials = get_login_credentials()
+    if not credentials or not credentials[0]:
+        return None
+    username, password = credentials
+
+    proxy_pool = ProxyPoolManager() if USE_PROXY else None
+    if proxy_pool:
+        proxy_pool.start_background_validation()
+    recorder = FixtureRecorder() if FIXTURE_RECORD else None
+
+    def write_page(keyword, page, page_data):
+        records = (dict(record, 关键词=keyword) for record in page_data if record)
+        drain_to(data_cleaner.DataCleaner.iter_clean(records), sink)
+
+    coordinator = CrawlCoordinator(
+        workers=CRAWL_WORKERS,
+        login=lambda driver: ZhilianLoginHandler(driver).ensure_login(username, password),
+        recorder=recorder,
+        proxy_pool=proxy_pool,
+        on_page=write_page if sink else None
+    )
+    print(f"\n🕷️ 使用 {CRAWL_WORKERS} 个浏览器并行爬取智联招聘的 {'、'.join(keywords)} 职位数据...")
+    try:
+        return coordinator.crawl(keywords, max_pages)
+    finally:
+        if recorder:
+            recorder.close()
+        if proxy_pool:
+            proxy_pool.close()
+
 def main():
+    args = parse_args()
     try:
         clear_screen()
         print_banner()
@@ -111,82 +282,117 @@ def main():
         print(f"\n🔧 当前配置:")
         print(f"   支持网站: 智联招聘")
 
-        keyword = input_search_keyword()
-        max_results = input_max_results()
-        
-        # ✅ 加载代理池并获取一个代理
-        proxy_manager = ProxyPoolManager()
-        proxy = proxy_manager.get_proxy()
-        if proxy:
-            print(f"🌐 使用代理: {proxy}")
-        else:
-            print("⚠️ 未获取到可用代理，使用直连")
+        keywords = collect_keywords(args)
+        max_results = args.max_pages or input_max_results()
+        label = keywords[0] if len(keywords) == 1 else f"{keywords[0]}等{len(keywords)}个关键词"
+
+        if CRAWL_WORKERS > 1:
+            sink = open_stream_sink(label)
+            try:
+                job_data = crawl_parallel(keywords, max_results, sink)
+            finally:
+                if sink:
+                    sink.close()
+            if job_data is not None:
+                export_job_data(label, enrich_details(job_data))
+            return
+
+        checkpoint = CheckpointStore() if CHECKPOINT_ENABLED else None
+        resume = bool(checkpoint) and input_resume(checkpoint, keywords, max_results)
+
+        # ✅ 加载代理池并为本次会话租用一个固定代理
+        proxy = None
+        proxy_pool = ProxyPoolManager() if USE_PROXY else None
+        if proxy_pool:
+            proxy_pool.start_background_validation()
+            proxy = proxy_pool.lease("main")
+            if proxy:
+                print(f"🌐 使用代理: {proxy}")
+            else:
+                print("⚠️ 未获取到可用代理，使用直连")
 
         print("\n🌐 初始化浏览器...")
-        browser_manager = BrowserManager()
+        browser_manager = BrowserManager(proxy=proxy)
         driver = browser_manager.create_browser()
 
         login_handler = ZhilianLoginHandler(driver)
-        credentials = get_login_credentials()
-        if not credentials or not credentials[0]:
-            browser_manager.close_browser()
-            return
-
-        username, password = credentials
-
-        print("\n🔐 正在登录，请稍候...")
-        # 去掉保存登录凭证的相关参数
-        login_success = login_handler.login_with_retry(username, password)
+        username, password = ZHILIAN_USERNAME or None, None
+        # 先尝试复用保存的会话，有效时无需输入账号密码
+        login_success = SESSION_REUSE and login_handler.restore_session(username)
+        if not login_success:
+            credentials = get_login_credentials()
+            if not credentials or not credentials[0]:
+                browser_manager.close_browser()
+                return
+
+            username, password = credentials
+
+            print("\n🔐 正在登录，请稍候...")
+            # 去掉保存登录凭证的相关参数
+            login_success = login_handler.login_with_retry(username, password)
+            if login_success and SESSION_REUSE:
+                login_handler.save_session(username)
+        if proxy:
+            proxy_pool.report(proxy, login_success)
+            proxy_pool.save_scoreboard()
         if not login_success:
             print("\n❌ 登录失败，请检查用户名和密码是否正确!")
             browser_manager.close_browser()
             return
-
-        crawler = ZhilianCrawler(driver)
-        print(f"\n🕷️ 开始爬取智联招聘的 {keyword} 职位数据...")
-        job_data = crawler.search_jobs(keyword, max_results)
-
-        if job_data:
-            # 1. 数据清洗
-            cleaned = data_cleaner.DataCleaner.clean_job_data(job_data)
-            df = pd.DataFrame(cleaned)
-
-            # 2. 分类优先级：实习 > 面议 > 正式
-            is_intern = df["职位名称"].str.contains("实习", case=False, na=False)
-            is_negotiable = df["薪资"].str.contains("面议", na=False)
-
-            df_intern = df[is_intern]
-            df_negotiable = df[~is_intern & is_negotiable]  # 排除实习中的面议
-            df_filtered = df[~is_intern & ~is_negotiable]   # 剩下的正式岗位
-
-            # 3. 输出目录准备
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            base_dir = os.path.join(OUTPUT_DIR, f"zhilian_{keyword}_{timestamp}")
-            os.makedirs(base_dir, exist_ok=True)
-
-            file_main = os.path.join(base_dir, "正式岗位_已清洗.xlsx")
-            file_intern = os.path.join(base_dir, "实习岗位.xlsx")
-            file_negotiable = os.path.join(base_dir, "面议岗位.xlsx")
-
-            df_filtered.to_excel(file_main, index=False)
-            df_intern.to_excel(file_intern, index=False)
-            df_negotiable.to_excel(file_negotiable, index=False)
-
-            # 4. 仅对正式岗位分析
-            stats = data_cleaner.DataCleaner.analyze_data(df_filtered)
-            print("\n📊 正式岗位数据统计:")
-            for k, v in stats.items():
-                print(f"{k}: {v}")
-
-            # 5. 总结
-            print(f"\n✅ 清洗完成，共 {len(df)} 条数据")
-            print(f"📁 正式岗位：{len(df_filtered)} 条，文件：{file_main}")
-            print(f"📁 实习岗位：{len(df_intern)} 条，文件：{file_intern}")
-            print(f"📁 面议岗位(非实习)：{len(df_negotiable)} 条，文件：{file_negotiable}")
-
-        else:
-            print("\n⚠️ 未获取到任何职位数据")
-        browser_manager.close_browser()
+        browser_manager.apply_resource_blocking()
+
+        def launch_browser(slot):
+            manager = BrowserManager(proxy=proxy)
+            manager.create_browser()
+            return manager
+
+        def setup_browser(manager):
+            # 替补浏览器在后台登录：有密码时复用会话或完整登录，只复用了会话时只能再次复用会话
+            handler = ZhilianLoginHandler(manager.driver)
+            logged_in = handler.ensure_login(username, password) if password else handler.restore_session(username)
+            if logged_in:
+                manager.apply_resource_blocking()
+            return logged_in
+
+        # 已登录的首个浏览器交给浏览器池，按处理页数和内存占用回收，替补浏览器提前在后台预热
+        browser_pool = BrowserPool(size=1, factory=launch_browser, setup=setup_browser)
+        browser_pool.adopt(browser_manager)
+        lease = BrowserLease(browser_pool)
+
+        fingerprints = FingerprintIndex() if FINGERPRINT_ENABLED else None
+        recorder = FixtureRecorder() if FIXTURE_RECORD else None
+        crawler = ZhilianCrawler(
+            lease.driver, checkpoint=checkpoint, fingerprints=fingerprints, recorder=recorder,
+            tab_setup=lambda tab_driver: lease.manager.apply_resource_blocking(tab_driver),
+            capture_network=browser_manager.capture_network,
+            browser_lease=lease
+        )
+        print(f"\n🕷️ 开始爬取智联招聘的 {'、'.join(keywords)} 职位数据...")
+        try:
+            sink = open_stream_sink(label)
+            if sink:
+                enricher = open_enricher(crawler.driver)
+                try:
+                    stream_crawl(crawler, keywords, max_results, resume, sink, enricher)
+                finally:
+                    sink.close()
+                    if enricher:
+                        enricher.close()
+                if STREAM_EXCEL_EXPORT:
+                    export_job_data(label, load_stream_output(sink.path), cleaned=True)
+            else:
+                job_data = crawler.search_batch(keywords, max_results, resume=resume)
+                export_job_data(label, enrich_details(job_data, crawler.driver))
+        finally:
+            if recorder:
+                recorder.close()
+            lease.release()
+            browser_pool.close()
+
+        # 导出成功后才把职位记为已爬取，中途失败的职位下次运行仍会输出
+        crawler.commit_fingerprints()
+        if proxy_pool:
+            proxy_pool.close()
 
     except KeyboardInterrupt:
         print("\n⏹️ 用户中断程序")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""浏览器池测试：池中的"浏览器"是 FakeBrowserManager"""
+
+import pytest
+
+from core.browser_pool import BrowserLease, BrowserPool
+from core.crawler import ZhilianCrawler
+from core.driver import FakeBrowserManager, FakeDriver, synthetic_pages
+from utils.rate_limiter import AdaptivePacer
+
+KEYWORD = "python"
+
+
+class Factory:
+    """记录启动过的浏览器；fail=True 时启动失败"""
+
+    def __init__(self, pages=None, rss_mb=None, fail=False):
+        self.pages = pages
+        self.rss_mb = rss_mb
+        self.fail = fail
+        self.launched = []
+
+    def __call__(self, slot):
+        if self.fail:
+            raise RuntimeError("chrome failed to start")
+        manager = FakeBrowserManager(FakeDriver(self.pages), rss_mb=self.rss_mb)
+        self.launched.append(manager)
+        return manager
+
+
+def make_pool(factory, **kwargs):
+    kwargs.setdefault("size", 1)
+    kwargs.setdefault("max_pages", 0)
+    kwargs.setdefault("max_rss_mb", 0)
+    return BrowserPool(factory=factory, **kwargs)
+
+
+def test_released_browser_is_leased_again():
+    factory = Factory()
+    with make_pool(factory) as pool:
+        browser = pool.lease(timeout=5)
+        pool.release(browser, pages=1)
+        assert pool.lease(timeout=5) is browser
+    assert len(factory.launched) == 1
+    assert browser.pages == 1
+
+
+def test_browser_is_recycled_after_max_pages():
+    factory = Factory()
+    with make_pool(factory, max_pages=3, prewarm_ratio=1.0) as pool:
+        first = pool.lease(timeout=5)
+        pool.release(first, pages=2)
+        assert pool.lease(timeout=5) is first
+        pool.release(first, pages=1)
+        second = pool.lease(timeout=5)
+    assert second is not first
+    assert first.manager.closed
+    assert len(factory.launched) == 2
+
+
+def test_browser_is_recycled_when_memory_exceeds_limit():
+    factory = Factory(rss_mb=800)
+    with make_pool(factory, max_rss_mb=500) as pool:
+        first = pool.lease(timeout=5)
+        pool.release(first, pages=1)
+        assert first.rss_mb == 800
+        assert pool.lease(timeout=5) is not first
+    assert first.manager.closed
+
+
+def test_replacement_is_prewarmed_before_recycling():
+    factory = Factory()
+    with make_pool(factory, max_pages=10, prewarm_ratio=0.5) as pool:
+        first = pool.lease(timeout=5)
+        pool.release(first, pages=5)
+        # 替补浏览器在原浏览器回收之前已经就绪，两个可以同时租出
+        leased = {pool.lease(timeout=5), pool.lease(timeout=5)}
+    assert first in leased and len(leased) == 2
+    assert len(factory.launched) == 2
+
+
+def test_close_shuts_every_browser():
+    factory = Factory()
+    torn_down = []
+    pool = make_pool(factory, size=2, teardown=torn_down.append).start()
+    leased = pool.lease(timeout=5)
+    pool.lease(timeout=5)
+    pool.close()
+    assert all(manager.closed for manager in factory.launched)
+    assert sorted(map(id, torn_down)) == sorted(map(id, factory.launched))
+    with pytest.raises(RuntimeError):
+        pool.lease(timeout=1)
+    assert leased.manager.closed
+
+
+def test_lease_fails_after_repeated_start_failures():
+    with make_pool(Factory(fail=True), max_start_failures=2) as pool:
+        with pytest.raises(RuntimeError):
+            pool.lease(timeout=5)
+
+
+def test_lease_renews_into_replacement_browser():
+    factory = Factory()
+    pool = make_pool(factory, max_pages=2, prewarm_ratio=1.0)
+    adopted = FakeBrowserManager()
+    pool.adopt(adopted)
+    lease = BrowserLease(pool, timeout=5)
+    assert lease.manager is adopted
+    assert lease.renew(1) is adopted.driver
+    replacement = lease.renew(1)
+    assert adopted.closed
+    assert replacement is factory.launched[0].driver
+    lease.release()
+    pool.close()
+
+
+def test_sequential_crawl_switches_to_replacement_browser():
+    crawler = ZhilianCrawler(FakeDriver(), pagination_mode="url")
+    site = synthetic_pages(crawler, KEYWORD, pages=5)
+    factory = Factory(pages=site)
+    pool = make_pool(factory, max_pages=2, prewarm_ratio=1.0)
+    adopted = FakeBrowserManager(FakeDriver(site))
+    first_driver = adopted.driver
+    pool.adopt(adopted)
+    lease = BrowserLease(pool, timeout=5)
+    crawler = ZhilianCrawler(lease.driver, extract_mode="lxml", pagination_mode="url", fetch_mode="browser",
+                             pacer=AdaptivePacer(max_rate=0), browser_lease=lease)
+    try:
+        records = crawler.search_jobs(KEYWORD, max_pages=5)
+    finally:
+        lease.release()
+        pool.close()
+
+    assert len(records) == 100
+    assert sorted({record["页码"] for record in records}) == [1, 2, 3, 4, 5]
+    # 首个浏览器达到页数阈值后被回收，剩余页面由替补浏览器加载
+    assert adopted.closed
+    assert crawler.driver is not first_driver
+    assert 0 < first_driver.calls["get"] < 5
+    assert first_driver.calls["get"] + crawler.driver.calls["get"] == 5
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""断点续爬测试：使用 FakeDriver 与合成页面，无需浏览器"""
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+import main
+from core.crawler import ZhilianCrawler
+from core.driver import FakeDriver, synthetic_pages
+from utils.checkpoint import CheckpointStore
+from utils.rate_limiter import AdaptivePacer
+
+KEYWORD = "python"
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoint.db"))
+    yield store
+    store.close()
+
+
+def make_crawler(store, pages=5, fail_at=None):
+    """返回爬虫和它打开过的页码列表；打开第 fail_at 页时浏览器出错，模拟中途中断"""
+    driver = FakeDriver()
+    crawler = ZhilianCrawler(driver, extract_mode="lxml", pagination_mode="url", fetch_mode="browser",
+                             pacer=AdaptivePacer(max_rate=0), checkpoint=store)
+    site = {url: (page, source) for page, (url, source) in
+            enumerate(synthetic_pages(crawler, KEYWORD, pages=pages).items(), 1)}
+    visited = []
+
+    def serve(url):
+        page, source = site.get(url, (None, None))
+        if page == fail_at:
+            raise WebDriverException("chrome not reachable")
+        visited.append(page)
+        return source
+
+    driver.pages = serve
+    return crawler, visited
+
+
+def test_store_commits_pages_in_order(store):
+    store.commit_page(KEYWORD, 2, [{"职位名称": "b"}])
+    store.commit_page(KEYWORD, 1, [{"职位名称": "a"}])
+    assert store.last_page(KEYWORD) == 2
+    assert [r["职位名称"] for r in store.iter_records(KEYWORD)] == ["a", "b"]
+    assert not store.is_finished(KEYWORD)
+    assert store.resumable(KEYWORD, 5)
+    assert not store.resumable(KEYWORD, 2)
+
+    store.mark_finished(KEYWORD)
+    assert store.is_finished(KEYWORD)
+    assert not store.resumable(KEYWORD, 5)
+    store.reset(KEYWORD)
+    assert store.last_page(KEYWORD) == 0
+    assert list(store.iter_records(KEYWORD)) == []
+
+
+def test_interrupted_crawl_is_left_resumable(store):
+    crawler, _ = make_crawler(store, fail_at=3)
+    assert len(crawler.search_jobs(KEYWORD, max_pages=5)) == 40
+    assert store.last_page(KEYWORD) == 2
+    assert store.resumable(KEYWORD, 5)
+
+
+def test_resume_continues_after_last_committed_page(store):
+    crawler, _ = make_crawler(store, fail_at=3)
+    crawler.search_jobs(KEYWORD, max_pages=4)
+
+    crawler, visited = make_crawler(store)
+    pages = [page for page, _ in crawler.iter_pages(KEYWORD, max_pages=4, resume=True)]
+    assert pages == [3, 4]
+    assert visited == [3, 4]
+    assert store.is_finished(KEYWORD)
+
+
+def test_resume_restores_committed_records(store):
+    crawler, _ = make_crawler(store, fail_at=3)
+    crawler.search_jobs(KEYWORD, max_pages=4)
+
+    crawler, _ = make_crawler(store)
+    records = crawler.search_jobs(KEYWORD, max_pages=4, resume=True)
+    assert len(records) == 80
+    assert sorted({record["页码"] for record in records}) == [1, 2, 3, 4]
+
+
+def test_crawl_reaching_max_pages_is_finished(store, monkeypatch):
+    crawler, _ = make_crawler(store)
+    crawler.search_jobs(KEYWORD, max_pages=3)
+    assert store.last_page(KEYWORD) == 3
+    assert store.is_finished(KEYWORD)
+
+    # 不再提示续爬，也就不会重新产出上次已导出的数据
+    monkeypatch.setattr("builtins.input", lambda prompt: pytest.fail("不应提示续爬"))
+    assert main.input_resume(store, [KEYWORD], 3) is False
+
+
+def test_finished_keyword_is_not_crawled_again(store):
+    crawler, _ = make_crawler(store, pages=3)
+    crawler.search_jobs(KEYWORD, max_pages=5)
+    assert store.is_finished(KEYWORD)
+
+    crawler, visited = make_crawler(store, pages=3)
+    assert list(crawler.iter_pages(KEYWORD, max_pages=5, resume=True)) == []
+    assert visited == []
+
+
+def test_input_resume_offers_only_unfinished_keywords(store, monkeypatch):
+    crawler, _ = make_crawler(store, fail_at=2)
+    crawler.search_jobs(KEYWORD, max_pages=5)
+    prompts = []
+    monkeypatch.setattr("builtins.input", lambda prompt: prompts.append(prompt) or "")
+    assert main.input_resume(store, [KEYWORD, "java"], 5) is True
+    assert "'python'（已完成 1 页）" in prompts[0] and "java" not in prompts[0]
+
+
+def test_without_resume_checkpoint_is_reset(store):
+    crawler, _ = make_crawler(store, fail_at=4)
+    crawler.search_jobs(KEYWORD, max_pages=5)
+
+    crawler, _ = make_crawler(store)
+    pages = [page for page, _ in crawler.iter_pages(KEYWORD, max_pages=1)]
+    assert pages == [1]
+    assert store.last_page(KEYWORD) == 1
+
+
+def test_batch_without_resume_resets_every_keyword(store):
+    store.commit_page("java", 1, [{"职位名称": "更早运行的数据"}])
+    store.mark_finished("java")
+    crawler, _ = make_crawler(store)
+    # 爬到第一个关键词时就中断，第二个关键词的旧断点也不能留到下次续爬
+    next(crawler.iter_batch([KEYWORD, "java"], max_pages=3))
+    assert not store.is_finished("java")
+    assert list(store.iter_records("java")) == []
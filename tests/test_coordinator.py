@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""并行爬取协调器测试：每个"浏览器"是一个 FakeBrowserManager"""
+
+import threading
+from collections import Counter
+
+from selenium.common.exceptions import WebDriverException
+
+from core.coordinator import CrawlCoordinator
+from core.crawler import ZhilianCrawler
+from core.driver import FakeBrowserManager, FakeDriver, synthetic_pages
+
+KEYWORD = "python"
+NO_RESULTS_PAGE = '<html><body><div class="search-empty">暂无职位</div></body></html>'
+
+
+class FakeCoordinator(CrawlCoordinator):
+    """用假驱动代替真实浏览器；site(slot, url) 返回页面源码或抛出异常"""
+
+    def __init__(self, site, **kwargs):
+        kwargs.setdefault("rate_limit", 0)
+        super().__init__(**kwargs)
+        self.site = site
+        self.launched = []
+
+    def _launch_browser(self, slot):
+        manager = FakeBrowserManager(FakeDriver(lambda url: self.site(slot, url)))
+        self.launched.append(manager)
+        return manager
+
+
+def make_site(pages=3, jobs_per_page=20):
+    crawler = ZhilianCrawler(FakeDriver(), pagination_mode="url")
+    urls = list(synthetic_pages(crawler, KEYWORD, pages=pages, jobs_per_page=jobs_per_page).items())
+    return {url: source for url, source in urls}, [url for url, _ in urls], crawler
+
+
+def test_results_are_merged_in_page_order():
+    site, _, _ = make_site(pages=5)
+    coordinator = FakeCoordinator(lambda slot, url: site.get(url, NO_RESULTS_PAGE), workers=3)
+    records = coordinator.crawl(KEYWORD, max_pages=5)
+    assert len(records) == 100
+    assert [record["页码"] for record in records] == sorted(record["页码"] for record in records)
+    assert all(record["关键词"] == KEYWORD for record in records)
+    assert coordinator.failed == []
+
+
+def test_failed_page_is_retried():
+    site, urls, _ = make_site(pages=3)
+    attempts = Counter()
+    lock = threading.Lock()
+
+    def flaky(slot, url):
+        with lock:
+            attempts[url] += 1
+            first = attempts[url] == 1
+        if url == urls[1] and first:
+            raise WebDriverException("net::ERR_CONNECTION_RESET")
+        return site.get(url, NO_RESULTS_PAGE)
+
+    coordinator = FakeCoordinator(flaky, workers=2)
+    records = coordinator.crawl(KEYWORD, max_pages=3)
+    assert len(records) == 60
+    assert attempts[urls[1]] == 2
+    assert coordinator.failed == []
+
+
+def test_empty_extraction_is_retried_instead_of_ending_keyword():
+    site, urls, _ = make_site(pages=4)
+    broken = site[urls[1]].replace("position-list__item", "broken-item")
+    served = Counter()
+    lock = threading.Lock()
+
+    def flaky(slot, url):
+        with lock:
+            served[url] += 1
+            first = served[url] == 1
+        if url == urls[1] and first:
+            return broken
+        return site.get(url, NO_RESULTS_PAGE)
+
+    coordinator = FakeCoordinator(flaky, workers=2)
+    records = coordinator.crawl(KEYWORD, max_pages=4)
+    assert len(records) == 80
+    assert coordinator.last_pages[KEYWORD] == 4
+    assert served[urls[1]] == 2
+
+
+def test_failing_browser_does_not_affect_other_workers():
+    site, _, _ = make_site(pages=6)
+
+    def one_bad_browser(slot, url):
+        if slot == 1:
+            raise WebDriverException("chrome not reachable")
+        return site.get(url, NO_RESULTS_PAGE)
+
+    coordinator = FakeCoordinator(one_bad_browser, workers=2)
+    records = coordinator.crawl(KEYWORD, max_pages=6)
+    assert len(records) == 120
+    assert coordinator.failed == []
+    assert coordinator.launched[0].closed
+
+
+def test_pages_past_the_end_are_cut_off():
+    site, _, _ = make_site(pages=3)
+    coordinator = FakeCoordinator(lambda slot, url: site.get(url, NO_RESULTS_PAGE), workers=2)
+    records = coordinator.crawl(KEYWORD, max_pages=6)
+    assert len(records) == 60
+    assert coordinator.last_pages[KEYWORD] == 3
+    assert {record["页码"] for record in records} == {1, 2, 3}
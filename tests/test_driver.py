@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""假驱动测试：接口一致性与模拟延迟计数"""
+
+from selenium.common.exceptions import WebDriverException
+
+from core.driver import DriverProtocol, FakeDriver
+
+PAGE = "<html><body><p id='x'>hello</p></body></html>"
+
+
+def test_fake_driver_satisfies_protocol():
+    assert isinstance(FakeDriver(), DriverProtocol)
+    assert not isinstance(object(), DriverProtocol)
+
+
+def test_every_protocol_call_is_a_round_trip():
+    driver = FakeDriver({"https://example.com/": PAGE}, latency={"get_cookies": 0.01})
+    driver.get("https://example.com/")
+    driver.refresh()
+    driver.implicitly_wait(0)
+    driver.add_cookie({"name": "a", "value": "1"})
+    assert driver.get_cookies() == [{"name": "a", "value": "1"}]
+    driver.find_elements("id", "x")
+    for name in ("get", "refresh", "implicitly_wait", "add_cookie", "get_cookies", "find_elements"):
+        assert driver.calls[name] == 1, name
+
+
+def test_chrome_only_calls_fail_like_a_non_chrome_browser():
+    driver = FakeDriver()
+    for call in (lambda: driver.get_log("performance"), lambda: driver.execute_cdp_cmd("Network.enable", {})):
+        try:
+            call()
+        except WebDriverException:
+            pass
+        else:
+            raise AssertionError("应抛出 WebDriverException")
+    assert driver.calls["get_log"] == driver.calls["execute_cdp_cmd"] == 1
+
+
+def test_tab_calls_are_round_trips():
+    driver = FakeDriver()
+    driver.switch_to.new_window("tab")
+    assert len(driver.window_handles) == 2
+    driver.switch_to.window(driver.window_handles[0])
+    assert driver.current_window_handle == driver.window_handles[0]
+    assert driver.calls["window_handles"] == 3
+    assert driver.calls["current_window_handle"] == 1
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""驱动路径缓存测试，浏览器版本检测与 webdriver-manager 均用替身代替"""
+
+import os
+import json
+
+import pytest
+
+from utils import driver_cache
+from utils.driver_cache import DriverCache
+
+
+@pytest.fixture
+def version(monkeypatch):
+    """可修改的本机浏览器主版本号"""
+    current = {"chrome": "120"}
+    monkeypatch.setattr(driver_cache, "browser_major_version", lambda browser_type: current.get(browser_type))
+    return current
+
+
+class Installer:
+    """记录调用次数的安装函数，每次返回一个新建的驱动文件"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        path = os.path.join(str(self.directory), f"chromedriver-{self.calls}")
+        with open(path, "w") as f:
+            f.write("#!/bin/sh\n")
+        return path
+
+
+def make_cache(tmp_path, offline=False):
+    return DriverCache(str(tmp_path / "cache" / "drivers.json"), offline=offline), Installer(tmp_path)
+
+
+def test_second_resolve_skips_install(tmp_path, version):
+    cache, install = make_cache(tmp_path)
+    first = cache.resolve("chrome", install)
+    assert cache.resolve("chrome", install) == first
+    assert install.calls == 1
+    with open(cache.path, encoding="utf-8") as f:
+        assert json.load(f)["chrome"]["120"]["path"] == first
+
+
+def test_browser_upgrade_resolves_new_driver(tmp_path, version):
+    cache, install = make_cache(tmp_path)
+    old = cache.resolve("chrome", install)
+    version["chrome"] = "121"
+    assert cache.resolve("chrome", install) != old
+    assert install.calls == 2
+
+
+def test_missing_driver_file_is_reinstalled(tmp_path, version):
+    cache, install = make_cache(tmp_path)
+    os.remove(cache.resolve("chrome", install))
+    assert os.path.isfile(cache.resolve("chrome", install))
+    assert install.calls == 2
+
+
+def test_unknown_version_bypasses_cache(tmp_path, version):
+    cache, install = make_cache(tmp_path)
+    assert cache.resolve("firefox", install)
+    assert cache.resolve("firefox", install)
+    assert install.calls == 2
+    assert not os.path.exists(cache.path)
+
+    offline, install = make_cache(tmp_path, offline=True)
+    assert offline.resolve("firefox", install) is None
+    assert install.calls == 0
+
+
+def test_offline_falls_back_to_latest_cached_driver(tmp_path, version):
+    cache, install = make_cache(tmp_path)
+    cached = cache.resolve("chrome", install)
+    version["chrome"] = "121"
+    offline = DriverCache(cache.path, offline=True)
+    assert offline.resolve("chrome", install) == cached
+    assert install.calls == 1
+
+    empty, install = make_cache(tmp_path / "empty", offline=True)
+    assert empty.resolve("chrome", install) is None
+
+
+def test_evict_removes_entries_for_driver(tmp_path, version):
+    cache, install = make_cache(tmp_path)
+    stale = cache.resolve("chrome", install)
+    cache.evict("chrome", stale)
+    cache.evict("chrome", "/not/cached")
+    assert cache.resolve("chrome", install) != stale
+    assert install.calls == 2
+
+
+def test_corrupt_cache_file_is_ignored(tmp_path, version):
+    cache, install = make_cache(tmp_path)
+    os.makedirs(os.path.dirname(cache.path))
+    with open(cache.path, "w", encoding="utf-8") as f:
+        f.write("{")
+    assert os.path.isfile(cache.resolve("chrome", install))
+    assert install.calls == 1
+
+
+@pytest.mark.skipif(os.name == "nt", reason="使用 shell 脚本模拟浏览器")
+def test_detect_version_reads_browser_output(tmp_path, monkeypatch):
+    browser = tmp_path / "fake-chrome"
+    browser.write_text("#!/bin/sh\necho 'Google Chrome 120.0.6099.109'\n")
+    browser.chmod(0o755)
+    monkeypatch.setitem(driver_cache.BROWSER_BINARIES, "chrome", [str(browser)])
+    assert driver_cache._detect_version("chrome") == "120"
+    monkeypatch.setitem(driver_cache.BROWSER_BINARIES, "chrome", [str(tmp_path / "missing")])
+    assert driver_cache._detect_version("chrome") is None
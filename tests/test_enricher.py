@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""详情补充与磁盘缓存测试，HTTP 会话用不发出请求的替身"""
+
+import os
+import shutil
+import time
+
+import requests
+
+from core.driver import FakeDriver
+from core.enricher import DetailEnricher, posting_id
+from core.session import HttpSession
+from utils.cache import DiskCache
+from utils.rate_limiter import AdaptivePacer
+
+DETAIL_PAGE = (
+    '<html><body><div class="describtion__detail-content">负责后端开发</div>'
+    '<div class="describtion__skills-content">Python</div>'
+    '<div class="describtion__skills-content">SQL</div></body></html>'
+)
+
+
+class DetailSession(requests.Session):
+    """按 URL 返回详情页的会话，verify 页面返回验证页"""
+
+    def __init__(self, requested):
+        super().__init__()
+        self.requested = requested
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers["Content-Type"] = "text/html"
+        response._content = ("<div>安全验证</div>" if "verify" in url else DETAIL_PAGE).encode("utf-8")
+        response.encoding = "utf-8"
+        return response
+
+
+def make_enricher(cache_dir):
+    requested = []
+    http = HttpSession(FakeDriver())
+    http.session = DetailSession(requested)
+    http.clone = lambda: http
+    enricher = DetailEnricher(http, workers=2, pacer=AdaptivePacer(max_rate=0), cache=DiskCache(str(cache_dir)))
+    return enricher, requested
+
+
+def job(number):
+    return {"职位名称": f"职位{number}", "职位链接": f"https://jobs.zhaopin.com/CC{number:04d}.htm"}
+
+
+def test_posting_id_prefers_id_field_then_link():
+    assert posting_id({"职位ID": 12, "职位链接": "https://x/CC1.htm"}) == "12"
+    assert posting_id({"职位链接": "https://jobs.zhaopin.com/CC0001.htm?from=list"}) == "CC0001"
+    assert posting_id({"职位名称": "无链接"}) is None
+
+
+def test_disk_cache_round_trip_and_ttl(tmp_path):
+    cache = DiskCache(str(tmp_path), ttl=60)
+    assert cache.get("CC1") is None
+    assert cache.set("CC1", {"职位描述": "描述"})
+    assert cache.get("CC1") == {"职位描述": "描述"}
+
+    old = time.time() - 120
+    os.utime(cache._path("CC1"), (old, old))
+    assert cache.get("CC1") is None
+    assert DiskCache(str(tmp_path)).get("CC1") == {"职位描述": "描述"}
+
+
+def test_disk_cache_ignores_corrupt_entries(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    with open(cache._path("CC1"), "w", encoding="utf-8") as f:
+        f.write("{半个文件")
+    assert cache.get("CC1") is None
+
+
+def test_disk_cache_write_failure_is_not_raised(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache"))
+    shutil.rmtree(cache.directory)
+    assert cache.set("CC1", {"职位描述": "描述"}) is False
+    assert cache.get("CC1") is None
+
+
+def test_enrich_merges_details_in_order_and_caches(tmp_path):
+    enricher, requested = make_enricher(tmp_path)
+    records = enricher.enrich([job(i) for i in range(5)] + [{"职位名称": "无链接"}])
+    assert [record["职位名称"] for record in records] == [f"职位{i}" for i in range(5)] + ["无链接"]
+    assert records[0]["职位描述"] == "负责后端开发"
+    assert records[0]["任职要求"] == "Python\nSQL"
+    assert "职位描述" not in records[-1]
+    assert len(requested) == 5
+
+    enricher.enrich([job(i) for i in range(5)])
+    assert len(requested) == 5
+
+
+def test_challenge_leaves_record_unchanged(tmp_path):
+    enricher, _ = make_enricher(tmp_path)
+    record = {"职位名称": "需验证", "职位链接": "https://jobs.zhaopin.com/verify/CC9.htm"}
+    assert enricher.enrich([record]) == [record]
+
+
+def test_cache_write_failure_does_not_abort_enrichment(tmp_path):
+    enricher, requested = make_enricher(tmp_path / "cache")
+    shutil.rmtree(enricher.cache.directory)
+    records = enricher.enrich([job(i) for i in range(3)])
+    assert all(record["职位描述"] == "负责后端开发" for record in records)
+    assert len(requested) == 3
+
+
+def test_iter_enrich_chunked_is_lazy(tmp_path):
+    enricher, requested = make_enricher(tmp_path)
+
+    def records():
+        for i in range(4):
+            yield job(i)
+        raise AssertionError("不应读取第二块之后的数据")
+
+    stream = enricher.iter_enrich_chunked(records(), chunk_size=2)
+    assert [next(stream)["职位名称"] for _ in range(2)] == ["职位0", "职位1"]
+    assert len(requested) == 2
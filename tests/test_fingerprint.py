@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""指纹索引测试：跨运行去重与连续已知页提前停止翻页"""
+
+import pytest
+
+from core.crawler import ZhilianCrawler
+from core.driver import FakeDriver, synthetic_pages
+from utils.fingerprint import FingerprintIndex, job_fingerprint
+from utils.rate_limiter import AdaptivePacer
+
+KEYWORD = "python"
+JOB = {"职位名称": "Python开发工程师", "公司名称": "某某科技有限公司", "工作地点": "北京·海淀", "薪资": "1.5-2.5万"}
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = FingerprintIndex(str(tmp_path / "fingerprints.db"))
+    yield index
+    index.close()
+
+
+def make_crawler(index, pages=6):
+    driver = FakeDriver()
+    crawler = ZhilianCrawler(driver, extract_mode="lxml", pagination_mode="url", fetch_mode="browser",
+                             pacer=AdaptivePacer(max_rate=0), fingerprints=index)
+    crawler.known_pages_stop = 2
+    crawler.only_new = True
+    driver.pages = synthetic_pages(crawler, KEYWORD, pages=pages)
+    return crawler
+
+
+def test_fingerprint_normalizes_whitespace_and_case():
+    variant = dict(JOB, 职位名称="  python开发工程师 ", 工作地点="北京·海淀\n")
+    assert job_fingerprint(variant) == job_fingerprint(JOB)
+    assert job_fingerprint(dict(JOB, 薪资="2-3万")) != job_fingerprint(JOB)
+
+
+def test_lookup_does_not_write(index):
+    fp = job_fingerprint(JOB)
+    assert index.lookup([fp]) == set()
+    assert len(index) == 0
+
+    index.commit([fp], keyword=KEYWORD)
+    assert index.lookup([fp, "other"]) == {fp}
+    assert fp in index
+
+
+def test_uncommitted_run_is_not_remembered(index):
+    crawler = make_crawler(index)
+    assert len(crawler.search_jobs(KEYWORD, max_pages=3)) == 60
+    assert len(crawler.pending_fingerprints) == 60
+
+    # 上次运行没有导出成功，指纹未提交，再次运行仍然输出全部职位
+    crawler = make_crawler(index)
+    assert len(crawler.search_jobs(KEYWORD, max_pages=3)) == 60
+
+
+def test_known_pages_stop_pagination_early(index):
+    crawler = make_crawler(index)
+    crawler.search_jobs(KEYWORD, max_pages=4)
+    crawler.commit_fingerprints()
+    assert len(index) == 80
+    assert crawler.pending_fingerprints == {}
+
+    crawler = make_crawler(index)
+    pages = [(page, data) for page, data in crawler.iter_pages(KEYWORD, max_pages=6)]
+    assert [page for page, _ in pages] == [1, 2]
+    assert all(data == [] for _, data in pages)
+
+
+def test_new_jobs_reset_known_streak(index):
+    crawler = make_crawler(index)
+    crawler.search_jobs(KEYWORD, max_pages=1)
+    crawler.commit_fingerprints()
+
+    crawler = make_crawler(index)
+    pages = dict(crawler.iter_pages(KEYWORD, max_pages=3))
+    assert sorted(pages) == [1, 2, 3]
+    assert pages[1] == [] and len(pages[2]) == 20 and len(pages[3]) == 20
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""登录时间预算测试"""
+
+import time
+
+from types import SimpleNamespace
+
+import pytest
+from cryptography.fernet import Fernet
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+from core.driver import FakeDriver
+from core.login import LoginBudget, ZhilianLoginHandler
+
+
+def test_until_returns_condition_result():
+    budget = LoginBudget(FakeDriver(), deadline=5)
+    assert budget.until(lambda driver: "ready", timeout=1) == "ready"
+
+
+def test_until_is_capped_by_remaining_budget():
+    budget = LoginBudget(FakeDriver(), deadline=0.3)
+    started = time.monotonic()
+    with pytest.raises(TimeoutException):
+        budget.until(lambda driver: False, timeout=10)
+    assert time.monotonic() - started < 1.5
+
+    with pytest.raises(TimeoutException):
+        budget.until(lambda driver: True)
+
+
+def test_backoff_gives_up_when_budget_is_short():
+    budget = LoginBudget(FakeDriver(), deadline=1)
+    started = time.monotonic()
+    assert budget.backoff(1) is False
+    assert time.monotonic() - started < 0.1
+
+
+def test_step_records_timings():
+    budget = LoginBudget(FakeDriver(), deadline=5)
+    with budget.step("打开登录页"):
+        pass
+    assert [name for name, _ in budget.timings] == ["打开登录页"]
+    budget.report(1)
+    assert budget.timings == []
+
+
+def test_missing_login_form_raises_within_budget(monkeypatch):
+    monkeypatch.setattr("core.login.CredentialsManager",
+                        lambda: SimpleNamespace(cipher_suite=Fernet(Fernet.generate_key())))
+    handler = ZhilianLoginHandler(FakeDriver())
+    handler.budget = LoginBudget(handler.driver, deadline=0.5)
+    started = time.monotonic()
+    with pytest.raises(NoSuchElementException):
+        handler._input_credentials("alice", "secret")
+    assert time.monotonic() - started < 2
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""接口响应映射与网络捕获测试"""
+
+import json
+import time
+
+from core.crawler import ZhilianCrawler
+from core.driver import FakeDriver
+from core.network import ApiRecordMapper, NetworkCapture, get_path
+
+API_URL = "https://www.zhaopin.com/api/sou/search?kw=python"
+
+
+class LogDriver:
+    """按批次返回性能日志条目的驱动替身；entries 为 None 时模拟不支持性能日志"""
+
+    def __init__(self, batches=None, bodies=None):
+        self.batches = batches
+        self.bodies = bodies or {}
+        self.log_reads = 0
+
+    def get_log(self, log_type):
+        self.log_reads += 1
+        if self.batches is None:
+            raise RuntimeError("log type 'performance' not found")
+        return self.batches.pop(0) if self.batches else []
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {"body": json.dumps(self.bodies[params["requestId"]])}
+
+
+def log_entry(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+def test_get_path_reads_nested_values():
+    data = {"data": {"list": [{"company": {"name": "某某"}}]}}
+    assert get_path(data, "data.list.0.company.name") == "某某"
+    assert get_path(data, "data.list.5.company") is None
+    assert get_path(data, "data.missing") is None
+
+
+def test_api_mapper_uses_list_path():
+    payload = {"data": {"list": [{"name": "Python", "companyName": "某某"}, "bad"]}}
+    mapper = ApiRecordMapper(list_path="data.list", field_map={"职位名称": "name", "公司名称": "companyName"})
+    assert mapper.extract_records(payload, page=2) == [{"职位名称": "Python", "公司名称": "某某", "页码": 2}]
+
+
+def test_api_mapper_finds_item_list_without_path():
+    payload = {"code": 200, "data": {"meta": [1, 2], "results": [{"name": "Go"}, {"name": "Rust"}]}}
+    mapper = ApiRecordMapper(list_path="", field_map={"职位名称": "name"})
+    assert [record["职位名称"] for record in mapper.extract_records(payload)] == ["Go", "Rust"]
+    assert mapper.extract_records({"data": {}}) == []
+
+
+def test_capture_reads_matching_json_responses():
+    driver = LogDriver(
+        batches=[[
+            log_entry("Network.requestWillBeSent", requestId="1", request={"url": API_URL}),
+            log_entry("Network.responseReceived", requestId="1",
+                      response={"url": API_URL, "mimeType": "application/json"}),
+            log_entry("Network.responseReceived", requestId="2",
+                      response={"url": "https://example.com/a.css", "mimeType": "text/css"}),
+            log_entry("Network.loadingFinished", requestId="1"),
+        ]],
+        bodies={"1": {"data": {"list": [{"name": "Python"}]}}},
+    )
+    capture = NetworkCapture(driver, list_path="data.list", field_map={"职位名称": "name"})
+    assert capture.wait_for_records(timeout=1) == [{"职位名称": "Python"}]
+
+
+def test_unsupported_log_disables_capture_after_first_failure():
+    driver = LogDriver()
+    capture = NetworkCapture(driver)
+    started = time.monotonic()
+    assert capture.wait_for_records(timeout=5) is None
+    assert capture.wait_for_records(timeout=5) is None
+    capture.drain()
+    assert time.monotonic() - started < 0.5
+    assert driver.log_reads == 1
+    assert not capture.available
+
+
+def test_settled_page_without_api_request_stops_waiting():
+    capture = NetworkCapture(LogDriver(batches=[]))
+    started = time.monotonic()
+    assert capture.wait_for_records(timeout=5, poll_interval=0.01, settled=lambda: True) is None
+    assert time.monotonic() - started < 0.5
+
+
+def test_settled_page_waits_for_request_in_flight():
+    driver = LogDriver(batches=[
+        [log_entry("Network.requestWillBeSent", requestId="1", request={"url": API_URL})],
+        [],
+        [log_entry("Network.responseReceived", requestId="1",
+                   response={"url": API_URL, "mimeType": "application/json"}),
+         log_entry("Network.loadingFinished", requestId="1")],
+    ], bodies={"1": {"data": {"list": [{"name": "Go"}]}}})
+    capture = NetworkCapture(driver, list_path="data.list", field_map={"职位名称": "name"})
+    assert capture.wait_for_records(timeout=5, poll_interval=0.01, settled=lambda: True) == [{"职位名称": "Go"}]
+
+
+def test_crawler_skips_capture_without_performance_log():
+    crawler = ZhilianCrawler(FakeDriver(), extract_mode="network", capture_network=False)
+    assert crawler.network is None
+    assert ZhilianCrawler(FakeDriver(), extract_mode="network").network is not None
@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""列表页 lxml 解析测试"""
+
+from core.crawler import ZhilianCrawler
+from core.driver import FakeDriver, synthetic_pages
+from core.parser import JobListParser
+
+
+def sample_page(jobs_per_page=3):
+    crawler = ZhilianCrawler(FakeDriver(), pagination_mode="url")
+    url, html = next(iter(synthetic_pages(crawler, pages=1, jobs_per_page=jobs_per_page).items()))
+    return url, html
+
+
+def test_job_list_parser_extracts_cards():
+    url, html = sample_page()
+    records = JobListParser().parse(html, page=1, base_url=url)
+    assert len(records) == 3
+    first = records[0]
+    assert first["职位名称"] == "Python开发工程师 1-0"
+    assert first["公司名称"] == "某某科技有限公司"
+    assert first["薪资"] == "1.5-2.5万"
+    assert first["页码"] == 1
+    assert first["职位链接"].startswith("https://")
+
+
+def test_job_list_parser_marks_incomplete_cards():
+    html = '<div class="position-list__item"><span class="position-card__salary">1万</span></div>'
+    assert JobListParser().parse(html) == [None]
+    assert JobListParser().parse("  ") == []
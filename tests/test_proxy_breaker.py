@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""代理熔断器状态转换测试"""
+
+import time
+
+from utils.proxys_pool import CircuitBreaker
+
+
+def test_opens_after_threshold_failures():
+    breaker = CircuitBreaker(threshold=3, cooldown=60, max_cooldown=600)
+    assert not breaker.record(False)
+    assert not breaker.record(False)
+    assert breaker.record(False)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.available()
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker(threshold=2, cooldown=60)
+    breaker.record(False)
+    breaker.record(True)
+    breaker.record(False)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_allows_single_trial():
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    breaker.trip()
+    later = time.time() + 61
+    assert breaker.available(later)
+
+    breaker.acquire(later)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.available(later)
+
+    assert breaker.record(True)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.available()
+
+
+def test_failed_trial_doubles_cooldown_up_to_max():
+    breaker = CircuitBreaker(threshold=1, cooldown=60, max_cooldown=100)
+    breaker.trip()
+    breaker.acquire(time.time() + 61)
+    breaker.record(False)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.cooldown == 100
+    assert not breaker.available(time.time() + 61)
+    assert breaker.available(time.time() + 101)
+
+
+def test_round_trips_through_dict():
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    breaker.trip()
+    restored = CircuitBreaker(threshold=1, cooldown=60)
+    restored.load(breaker.to_dict())
+    assert restored.state == CircuitBreaker.OPEN
+    assert restored.opened_at == breaker.opened_at
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""代理池管理器测试：从临时文件加载代理，验证器为替身，不发起网络请求"""
+
+import random
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from utils.proxys_pool import ProxyPoolManager
+
+PROXIES = ["10.0.0.1:8000", "10.0.0.2:8000", "10.0.0.3:8000"]
+
+
+class FakeValidator:
+    """记录验证次数；results 中未列出的代理视为可用"""
+
+    def __init__(self, results=None, delay=0):
+        self.results = results or {}
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def validate(self, proxies):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return {proxy: self.results.get(proxy, (True, 0.1)) for proxy in proxies}
+
+
+@pytest.fixture
+def make_pool(tmp_path, monkeypatch):
+    proxy_file = tmp_path / "proxies.txt"
+    proxy_file.write_text("\n".join(PROXIES), encoding="utf-8")
+    monkeypatch.setattr("utils.proxys_pool.PROXY_POOL_FROM_FILE", True)
+    monkeypatch.setattr("utils.proxys_pool.PROXY_POOL_FILE_PATH", str(proxy_file))
+    scoreboard = str(tmp_path / "scoreboard.json")
+
+    def make(validator=None, health_check=False):
+        return ProxyPoolManager(validator=validator, health_check=health_check, scoreboard_path=scoreboard)
+
+    return make
+
+
+def test_lease_is_sticky_until_breaker_opens(make_pool):
+    pool = make_pool()
+    proxy = pool.lease("browser-1")
+    assert proxy in PROXIES
+    assert all(pool.lease("browser-1") == proxy for _ in range(20))
+
+    pool.remove_proxy(proxy)
+    replacement = pool.lease("browser-1")
+    assert replacement != proxy
+    assert pool.leases["browser-1"] == replacement
+    assert pool.release("browser-1") == replacement
+    assert "browser-1" not in pool.leases
+
+
+def test_single_failure_does_not_open_breaker(make_pool):
+    pool = make_pool()
+    proxy = PROXIES[0]
+    pool.report(proxy, False)
+    assert proxy not in pool.dead
+    pool.report(proxy, False)
+    pool.report(proxy, False)
+    assert proxy in pool.dead
+
+
+def test_selection_is_weighted_by_score(make_pool):
+    pool = make_pool()
+    fast, slow, broken = PROXIES
+    for _ in range(5):
+        pool.report(fast, True, 0.1)
+        pool.report(slow, True, 2.0)
+    pool.report(broken, False)
+
+    random.seed(0)
+    picks = Counter(pool.get_proxy() for _ in range(500))
+    assert picks[fast] > picks[slow] * 5
+    assert picks[fast] > picks[broken] * 5
+
+
+def test_leased_proxy_weight_is_shared(make_pool):
+    pool = make_pool()
+    for owner in range(4):
+        pool.leases[f"browser-{owner}"] = PROXIES[0]
+
+    random.seed(0)
+    picks = Counter(pool.get_proxy() for _ in range(600))
+    assert picks[PROXIES[0]] < picks[PROXIES[1]] / 2
+
+
+def test_scoreboard_round_trip(make_pool):
+    pool = make_pool()
+    good, tripped = PROXIES[:2]
+    pool.report(good, True, 0.2)
+    pool.report(good, False)
+    pool.remove_proxy(tripped)
+    pool.save_scoreboard()
+
+    restored = make_pool()
+    assert restored.stats[good].success_rate == 0.5
+    assert restored.stats[good].latency == pytest.approx(0.2)
+    assert restored.dead == {tripped}
+    # 熔断中的代理在冷却期内不会被分配
+    assert all(restored.get_proxy() != tripped for _ in range(50))
+
+
+def test_corrupt_scoreboard_is_ignored(make_pool, tmp_path):
+    (tmp_path / "scoreboard.json").write_text("{not json", encoding="utf-8")
+    pool = make_pool()
+    assert pool.stats == {}
+    assert pool.get_proxy() in PROXIES
+
+
+def test_first_validation_runs_once_for_concurrent_callers(make_pool):
+    validator = FakeValidator(results={PROXIES[2]: (False, None)}, delay=0.2)
+    pool = make_pool(validator=validator, health_check=True)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pool.healthy_proxies())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert validator.calls == 1
+    assert all(sorted(healthy) == sorted(PROXIES) for healthy in results)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""自适应节流器测试"""
+
+import time
+
+from utils.rate_limiter import AdaptivePacer, TokenBucket
+
+HOST = "https://sou.zhaopin.com/?jl=530&kw=python"
+
+
+def make_pacer(**kwargs):
+    options = dict(rate=1.0, min_rate=0.1, max_rate=2.0, burst=1, jitter=0,
+                   slow_threshold=5.0, recover_step=0.1)
+    options.update(kwargs)
+    return AdaptivePacer(**options)
+
+
+def test_token_bucket_allows_burst_then_waits():
+    bucket = TokenBucket(rate=2.0, capacity=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert 0.4 < bucket.reserve() <= 0.5
+
+
+def test_slow_response_halves_rate():
+    pacer = make_pacer()
+    pacer.record(HOST, latency=6.0)
+    assert pacer.rate(HOST) == 0.5
+
+
+def test_refresh_and_failure_halve_rate():
+    pacer = make_pacer()
+    pacer.record(HOST, refreshed=True)
+    pacer.record(HOST, ok=False)
+    assert pacer.rate(HOST) == 0.25
+
+
+def test_captcha_quarters_rate_down_to_min():
+    pacer = make_pacer()
+    pacer.record(HOST, captcha=True)
+    assert pacer.rate(HOST) == 0.25
+    pacer.record(HOST, captcha=True)
+    assert pacer.rate(HOST) == 0.1
+
+
+def test_recovers_additively_up_to_max():
+    pacer = make_pacer(rate=1.8)
+    pacer.record(HOST, latency=0.2)
+    assert abs(pacer.rate(HOST) - 1.9) < 1e-9
+    for _ in range(5):
+        pacer.record(HOST, latency=0.2)
+    assert pacer.rate(HOST) == 2.0
+
+
+def test_hosts_are_paced_independently():
+    pacer = make_pacer()
+    pacer.record(HOST, captcha=True)
+    assert pacer.rate("https://jobs.zhaopin.com/CC1.htm") == 1.0
+    assert pacer.rate("sou.zhaopin.com") == 0.25
+
+
+def test_backoff_delays_next_request():
+    pacer = make_pacer(rate=20.0, max_rate=20.0)
+    pacer.wait(HOST)
+    pacer.record(HOST, captcha=True)
+    started = time.monotonic()
+    pacer.wait(HOST)
+    assert time.monotonic() - started >= 0.15
+
+
+def test_non_positive_max_rate_is_unlimited():
+    pacer = AdaptivePacer(max_rate=0, jitter=1.0)
+    started = time.monotonic()
+    for _ in range(20):
+        pacer.wait(HOST)
+        pacer.record(HOST, captcha=True)
+    assert time.monotonic() - started < 0.1
+    assert pacer.rate(HOST) == float("inf")
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""远程代理池客户端测试：在本机启动一个假的代理池接口"""
+
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils.proxys_pool import RemoteProxyClient
+
+
+class FakeProxyApi:
+    """假代理池接口：/random 每次返回一个新代理，/batch 返回 batch 中的内容，/broken 返回 500"""
+
+    def __init__(self):
+        self.hits = Counter()
+        self.batch = ["10.0.0.1:8000", {"proxy": "10.0.0.2:8000"}, "10.0.0.1:8000"]
+        self.batch_type = "application/json"
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                api.hits[self.path] += 1
+                if self.path == "/random":
+                    self._reply(200, f"10.1.0.{api.hits[self.path]}:8000", "text/plain")
+                elif self.path == "/batch":
+                    body = api.batch if isinstance(api.batch, str) else json.dumps(api.batch)
+                    self._reply(200, body, api.batch_type)
+                else:
+                    self._reply(500, "error", "text/plain")
+
+            def _reply(self, status, body, content_type):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def url(self, path):
+        return self.base_url + path
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def api():
+    api = FakeProxyApi()
+    yield api
+    api.close()
+
+
+@pytest.fixture
+def make_client():
+    clients = []
+
+    def make(**kwargs):
+        client = RemoteProxyClient(**kwargs)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "等待超时"
+        time.sleep(0.01)
+
+
+def test_batch_endpoint_fills_buffer_without_duplicates(api, make_client):
+    client = make_client(url=api.url("/random"), batch_url=api.url("/batch"), low_water=0)
+    wait_for(lambda: len(client) == 2)
+    assert client.get(timeout=1) == "10.0.0.1:8000"
+    assert client.get(timeout=1) == "10.0.0.2:8000"
+    assert api.hits["/random"] == 0
+
+
+def test_get_is_served_from_buffer(api, make_client):
+    client = make_client(url=api.url("/random"), batch_url="", batch_size=5, low_water=1)
+    assert client.get(timeout=5) == "10.1.0.1:8000"
+    wait_for(lambda: len(client) == 4)
+    requests_before = api.hits["/random"]
+    # 缓冲区高于低水位时取代理不访问接口
+    assert client.get(timeout=1) == "10.1.0.2:8000"
+    assert client.get(timeout=1) == "10.1.0.3:8000"
+    time.sleep(0.1)
+    assert api.hits["/random"] == requests_before
+
+
+def test_low_water_triggers_background_refill(api, make_client):
+    client = make_client(url=api.url("/random"), batch_url="", batch_size=3, low_water=1)
+    wait_for(lambda: len(client) == 3)
+    client.get(timeout=1)
+    client.get(timeout=1)
+    assert api.hits["/random"] == 3
+    # 取出时缓冲区已降到低水位，后台补充下一批
+    client.get(timeout=1)
+    wait_for(lambda: len(client) == 3)
+    assert api.hits["/random"] == 6
+
+
+def test_expired_proxies_are_dropped(api, make_client):
+    client = make_client(url=api.url("/random"), batch_url=api.url("/batch"), low_water=0, ttl=0.2)
+    wait_for(lambda: len(client) == 2)
+    time.sleep(0.3)
+    # 过期的代理不再分配；批量接口仍返回相同代理，重新获取后有效期重新计算
+    api.batch = ["10.0.0.3:8000"]
+    assert client.get(timeout=5) == "10.0.0.3:8000"
+
+
+def test_text_batch_is_parsed_line_by_line(api, make_client):
+    api.batch = "10.0.0.5:8000\n\n10.0.0.6:8000\n"
+    api.batch_type = "text/plain"
+    client = make_client(url=api.url("/random"), batch_url=api.url("/batch"), low_water=0)
+    assert [client.get(timeout=5), client.get(timeout=5)] == ["10.0.0.5:8000", "10.0.0.6:8000"]
+
+
+def test_wrapped_json_batch_is_parsed(api, make_client):
+    api.batch = {"data": [{"proxy": "10.0.0.7:8000"}, {"ip": "missing"}, "10.0.0.8:8000"]}
+    client = make_client(url=api.url("/random"), batch_url=api.url("/batch"), low_water=0, batch_size=5)
+    wait_for(lambda: len(client) == 2)
+    assert [client.get(timeout=1), client.get(timeout=1)] == ["10.0.0.7:8000", "10.0.0.8:8000"]
+
+
+def test_failing_endpoint_returns_none(api, make_client):
+    client = make_client(url=api.url("/broken"), batch_url=api.url("/broken"), low_water=0)
+    started = time.monotonic()
+    assert client.get(timeout=0.3) is None
+    assert time.monotonic() - started < 2
+    assert api.hits["/broken"] >= 1
+
+
+def test_closed_client_returns_none(api, make_client):
+    client = make_client(url=api.url("/broken"), batch_url=api.url("/broken"))
+    client.close()
+    started = time.monotonic()
+    assert client.get(timeout=5) is None
+    assert time.monotonic() - started < 1
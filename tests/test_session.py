@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""HTTP 会话测试：Cookie 同步、挑战页识别与回退浏览器加载，requests 会话用替身代替"""
+
+import pytest
+import requests
+
+from core.crawler import ZhilianCrawler
+from core.driver import FakeDriver, synthetic_pages
+from core.session import ChallengeDetected, HttpSession
+from utils.rate_limiter import AdaptivePacer
+
+KEYWORD = "python"
+
+
+def make_response(url, text="", status=200, content_type="text/html; charset=utf-8"):
+    response = requests.Response()
+    response.url = url
+    response.status_code = status
+    response.headers["Content-Type"] = content_type
+    response._content = text.encode("utf-8")
+    response.encoding = "utf-8"
+    return response
+
+
+class StubSession(requests.Session):
+    """不发出网络请求，记录请求并按 handler(url) 返回响应的会话"""
+
+    def __init__(self, handler):
+        super().__init__()
+        self.handler = handler
+        self.requested = []
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        return self.handler(url)
+
+
+def make_driver(pages=None):
+    driver = FakeDriver(pages)
+    driver.add_cookie({"name": "at", "value": "token", "domain": ".zhaopin.com"})
+    driver.calls.clear()
+    return driver
+
+
+def test_sync_from_driver_copies_cookies_and_user_agent():
+    http = HttpSession(make_driver())
+    assert http.session.cookies.get("at", domain=".zhaopin.com") == "token"
+    assert http.session.headers["User-Agent"] == "Mozilla/5.0 (FakeDriver)"
+
+    clone = http.clone()
+    assert clone.session is not http.session
+    assert clone.session.cookies.get("at") == "token"
+
+
+@pytest.mark.parametrize("response", [
+    make_response("https://sou.zhaopin.com/", status=403),
+    make_response("https://passport.zhaopin.com/login"),
+    make_response("https://sou.zhaopin.com/", "<div>请完成安全验证</div>"),
+])
+def test_challenge_pages_raise(response):
+    http = HttpSession()
+    http.session = StubSession(lambda url: response)
+    with pytest.raises(ChallengeDetected):
+        http.get_text("https://sou.zhaopin.com/")
+
+
+def test_json_responses_skip_body_markers():
+    http = HttpSession()
+    http.session = StubSession(lambda url: make_response(
+        url, '{"message": "安全验证"}', content_type="application/json"))
+    assert http.get_json("https://sou.zhaopin.com/api") == {"message": "安全验证"}
+
+
+def make_http_crawler(handler):
+    driver = make_driver()
+    crawler = ZhilianCrawler(driver, pagination_mode="url", fetch_mode="http", pacer=AdaptivePacer(max_rate=0))
+    site = synthetic_pages(crawler, KEYWORD, pages=3)
+    driver.pages = site
+    crawler.http = HttpSession()
+    crawler.http.session = StubSession(lambda url: handler(site, url))
+    crawler.http.sync_from_driver(driver)
+    return crawler, driver
+
+
+def test_http_fetch_parses_pages_without_the_browser():
+    crawler, driver = make_http_crawler(lambda site, url: make_response(url, site[url]))
+    records = crawler.fetch_page(KEYWORD, 2)
+    assert len(records) == 20
+    assert records[0]["页码"] == 2
+    assert driver.calls["get"] == 0
+    assert not crawler.is_last_page(records)
+
+
+def test_challenge_falls_back_to_the_browser_and_resyncs_cookies():
+    def handler(site, url):
+        return make_response("https://passport.zhaopin.com/login?redirect=" + url)
+
+    crawler, driver = make_http_crawler(handler)
+    driver.add_cookie({"name": "fresh", "value": "1", "domain": ".zhaopin.com"})
+    records = crawler.fetch_page(KEYWORD, 1)
+    assert len(records) == 20
+    assert driver.calls["get"] == 1
+    assert crawler.http.session.requested
+    # 浏览器加载后重新同步，HTTP 会话带上了浏览器中的新 Cookie
+    assert crawler.http.session.cookies.get("fresh") == "1"
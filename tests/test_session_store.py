@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""登录会话存储与复用测试：会话写入临时文件，使用临时生成的密钥"""
+
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+from cryptography.fernet import Fernet
+
+from core.driver import FakeDriver
+from core.login import SessionStore, ZhilianLoginHandler
+
+COOKIES = [
+    {"name": "zp_token", "value": "abc", "domain": ".zhaopin.com", "path": "/"},
+    {"name": "stale", "value": "x", "domain": ".zhaopin.com", "path": "/", "expiry": 1},
+]
+
+
+def fake_credentials():
+    """只提供 cipher_suite 的凭据管理器替身，不读写 data/.key"""
+    return SimpleNamespace(cipher_suite=Fernet(Fernet.generate_key()))
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / ".session")
+
+
+@pytest.fixture
+def store(path):
+    return SessionStore(path, fake_credentials())
+
+
+def test_round_trip_is_encrypted(store, path):
+    store.save("zhilian", COOKIES, {"https://www.zhaopin.com": {"k": "v"}}, "alice")
+    with open(path, encoding="utf-8") as f:
+        assert "zp_token" not in f.read()
+
+    session = store.load("zhilian", "alice")
+    assert session["username"] == "alice"
+    assert session["local_storage"] == {"https://www.zhaopin.com": {"k": "v"}}
+    # 已过期的 Cookie 不再注入
+    assert [cookie["name"] for cookie in session["cookies"]] == ["zp_token"]
+
+
+def test_session_expires_after_max_age(path):
+    store = SessionStore(path, fake_credentials(), max_age=0.05)
+    store.save("zhilian", COOKIES, {}, "alice")
+    assert store.load("zhilian", "alice")
+    time.sleep(0.1)
+    assert store.load("zhilian", "alice") is None
+
+
+def test_other_username_is_rejected(store):
+    store.save("zhilian", COOKIES, {}, "alice")
+    assert store.load("zhilian", "bob") is None
+    assert store.load("zhilian", "alice")
+    # 未指定账号时（如只复用会话）接受保存的会话
+    assert store.load("zhilian")
+
+
+def test_corrupt_file_is_ignored(store, path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{not json")
+    assert store.load("zhilian") is None
+
+    # 损坏的文件会被下一次保存覆盖
+    store.save("zhilian", COOKIES, {}, "alice")
+    assert store.load("zhilian", "alice")
+
+
+def test_session_encrypted_with_other_key_is_ignored(store, path):
+    store.save("zhilian", COOKIES, {}, "alice")
+    assert SessionStore(path, fake_credentials()).load("zhilian", "alice") is None
+
+
+def test_clear_removes_only_that_site(store):
+    store.save("zhilian", COOKIES, {}, "alice")
+    store.save("other", COOKIES, {}, "alice")
+    store.clear("zhilian")
+    assert store.load("zhilian") is None
+    assert store.load("other")
+
+
+@pytest.fixture
+def handler(monkeypatch, path):
+    monkeypatch.setattr("core.login.CredentialsManager", fake_credentials)
+    handler = ZhilianLoginHandler(FakeDriver())
+    handler.session_store = SessionStore(path, handler.credentials_manager)
+    return handler
+
+
+def test_restore_injects_cookies_and_saves_again(handler, path, monkeypatch):
+    handler.session_store.save("zhilian", COOKIES, {}, "alice")
+    with open(path, encoding="utf-8") as f:
+        first_token = json.load(f)["zhilian"]
+    monkeypatch.setattr(handler, "_probe_session", lambda cookies: True)
+
+    assert handler.restore_session("alice")
+    assert [cookie["name"] for cookie in handler.driver.get_cookies()] == ["zp_token"]
+    # 成功复用后重新保存，有效期从本次复用起算
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["zhilian"] != first_token
+    assert handler.session_store.load("zhilian", "alice")["username"] == "alice"
+
+
+def test_restore_fails_when_probe_is_rejected(handler, monkeypatch):
+    handler.session_store.save("zhilian", COOKIES, {}, "alice")
+    monkeypatch.setattr(handler, "_probe_session", lambda cookies: False)
+    assert not handler.restore_session("alice")
+    assert handler.driver.get_cookies() == []
+
+
+def test_restore_without_saved_session(handler):
+    assert not handler.restore_session("alice")
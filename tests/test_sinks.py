@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""流式输出与逐条清洗测试"""
+
+import csv
+import json
+
+import main
+from core.crawler import ZhilianCrawler
+from core.driver import FakeDriver, synthetic_pages
+from utils.data_cleaner import DataCleaner
+from utils.rate_limiter import AdaptivePacer
+from utils.sinks import CsvSink, JsonLinesSink, drain_to
+
+JOB = {"职位名称": " Python 开发 ", "公司名称": "某某科技", "薪资": "1.5-2.5万", "工作地点": "北京·海淀", "页码": 1}
+
+
+class CountingSink:
+    def __init__(self):
+        self.records = []
+        self.flushes = 0
+
+    def write(self, record):
+        self.records.append(record)
+
+    def flush(self):
+        self.flushes += 1
+
+
+def test_iter_clean_skips_empty_and_broken_records():
+    cleaned = list(DataCleaner.iter_clean([JOB, None, {}, {"职位名称": 123}, dict(JOB, 职位ID="CC1")]))
+    assert len(cleaned) == 2
+    assert cleaned[0]["职位名称"] == "Python 开发"
+    assert cleaned[0]["工作地点"] == "北京,海淀"
+    assert cleaned[0]["最低薪资(K)"] == 15
+    assert cleaned[1]["职位ID"] == "CC1"
+
+
+def test_iter_clean_is_lazy():
+    def records():
+        yield JOB
+        raise AssertionError("不应读取第二条")
+
+    assert next(DataCleaner.iter_clean(records()))["薪资"] == "1.5-2.5万"
+
+
+def test_drain_to_writes_every_sink_and_flushes_in_batches():
+    first, second = CountingSink(), CountingSink()
+    assert drain_to(iter([JOB] * 5), first, second, flush_every=2) == 5
+    assert len(first.records) == len(second.records) == 5
+    assert first.flushes == 3
+
+
+def test_jsonl_sink_appends_lines(tmp_path):
+    path = str(tmp_path / "out" / "jobs.jsonl")
+    with JsonLinesSink(path) as sink:
+        drain_to([JOB, JOB], sink)
+    with JsonLinesSink(path) as sink:
+        sink.write(JOB)
+    with open(path, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert len(lines) == 3
+    assert lines[0]["职位名称"] == JOB["职位名称"]
+
+
+def test_csv_sink_writes_header_once_and_ignores_extra_fields(tmp_path):
+    path = str(tmp_path / "jobs.csv")
+    with CsvSink(path) as sink:
+        sink.write({"a": 1, "b": 2})
+        sink.write({"a": 3, "b": 4, "c": 5})
+    with CsvSink(path) as sink:
+        sink.write({"a": 6, "b": 7})
+    with open(path, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert rows == [{"a": "1", "b": "2"}, {"a": "3", "b": "4"}, {"a": "6", "b": "7"}]
+
+
+def test_stream_crawl_writes_without_collecting(tmp_path):
+    driver = FakeDriver()
+    crawler = ZhilianCrawler(driver, pagination_mode="url", pacer=AdaptivePacer(max_rate=0))
+    driver.pages = synthetic_pages(crawler, "python", pages=3)
+
+    path = str(tmp_path / "jobs.jsonl")
+    with JsonLinesSink(path) as sink:
+        assert main.stream_crawl(crawler, ["python"], 3, False, sink) == 60
+    assert crawler.job_data == []
+
+    records = main.load_stream_output(path)
+    assert len(records) == 60
+    assert records[0]["关键词"] == "python"
+    assert records[0]["最高薪资(K)"] == 25
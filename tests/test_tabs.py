@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""标签页模式测试：FakeDriver 模拟多个标签页的后台跳转"""
+
+import pytest
+
+from core.crawler import ZhilianCrawler
+from core.driver import FakeDriver, synthetic_pages
+from utils.checkpoint import CheckpointStore
+from utils.rate_limiter import AdaptivePacer
+
+KEYWORD = "python"
+NO_RESULTS_PAGE = '<html><body><div class="search-empty">暂无职位</div></body></html>'
+
+
+@pytest.fixture(autouse=True)
+def short_tab_timeout(monkeypatch):
+    # 超时只作为兜底，缩短后误判为加载超时的用例也能很快结束
+    monkeypatch.setattr("core.crawler.TAB_LOAD_TIMEOUT", 0.5)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoint.db"))
+    yield store
+    store.close()
+
+
+def make_crawler(fetch_mode, store, pages=0):
+    driver = FakeDriver()
+    crawler = ZhilianCrawler(driver, extract_mode="lxml", pagination_mode="url", fetch_mode=fetch_mode,
+                             pacer=AdaptivePacer(max_rate=0), checkpoint=store, tabs=3)
+    site = synthetic_pages(crawler, KEYWORD, pages=pages) if pages else {}
+    driver.pages = lambda url: site.get(url, NO_RESULTS_PAGE)
+    return crawler
+
+
+def test_tabs_yield_pages_in_order(store):
+    crawler = make_crawler("tabs", store, pages=7)
+    pages = [(page, len(data)) for page, data in crawler.iter_pages(KEYWORD, max_pages=7)]
+    assert pages == [(page, 20) for page in range(1, 8)]
+    assert store.is_finished(KEYWORD)
+
+
+def test_tabs_stop_at_last_page(store):
+    crawler = make_crawler("tabs", store, pages=4)
+    pages = [page for page, _ in crawler.iter_pages(KEYWORD, max_pages=10)]
+    assert pages == [1, 2, 3, 4]
+    assert store.is_finished(KEYWORD)
+
+
+@pytest.mark.parametrize("fetch_mode", ["tabs", "browser"])
+def test_zero_result_keyword_ends_after_first_page(store, fetch_mode):
+    crawler = make_crawler(fetch_mode, store)
+    pages = list(crawler.iter_pages(KEYWORD, max_pages=4))
+    assert pages == [(1, [])]
+    assert crawler._reached_end
+    assert store.is_finished(KEYWORD)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+磁盘缓存模块，按键保存 JSON 数据并支持过期时间
+"""
+
+import os
+import json
+import time
+import hashlib
+
+from utils.logger import logger
+
+
+class DiskCache:
+    """基于文件的 JSON 缓存，每个键一个文件，按文件修改时间判断是否过期"""
+
+    def __init__(self, directory, ttl=None):
+        """
+        Args:
+            directory: 缓存目录
+            ttl: 有效期（秒），None 表示永不过期
+        """
+        self.directory = directory
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key):
+        """读取缓存，不存在或已过期返回 None"""
+        path = self._path(key)
+        try:
+            if self.ttl is not None and time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取缓存失败 {key}: {e}")
+            return None
+
+    def set(self, key, value):
+        """
+        写入缓存（先写临时文件再替换，避免并发读到半个文件）
+
+        磁盘已满、无权限等写入失败只记录警告并返回 False，不影响调用方
+        """
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{id(value)}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            logger.warning(f"写入缓存失败 {key}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+
+    def _path(self, key):
+        digest = hashlib.sha1(str(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
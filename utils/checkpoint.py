@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+断点续爬模块，基于 SQLite 按页提交爬取结果，进程崩溃或重启后可从最后提交的页继续
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+from utils.logger import logger
+from config.settings import CHECKPOINT_FILE
+
+
+class CheckpointStore:
+    """爬取断点存储，每完成一页提交一次（关键词、页码、该页数据）"""
+
+    def __init__(self, path=None):
+        self.path = path or CHECKPOINT_FILE
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pages (
+                keyword TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                records TEXT NOT NULL,
+                committed_at TEXT NOT NULL,
+                PRIMARY KEY (keyword, page)
+            );
+            CREATE TABLE IF NOT EXISTS keywords (
+                keyword TEXT PRIMARY KEY,
+                finished INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT NOT NULL
+            );
+        """)
+        self.conn.commit()
+
+    def commit_page(self, keyword, page, records):
+        """提交一页数据"""
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (keyword, page, records, committed_at) VALUES (?, ?, ?, ?)",
+                (keyword, page, json.dumps(records, ensure_ascii=False), now)
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO keywords (keyword, finished, updated_at) VALUES (?, 0, ?)",
+                (keyword, now)
+            )
+            self.conn.commit()
+
+    def mark_finished(self, keyword):
+        """标记关键词的爬取已正常结束（到达最后一页或爬满请求的页数）"""
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO keywords (keyword, finished, updated_at) VALUES (?, 1, ?)",
+                (keyword, datetime.now().isoformat(timespec="seconds"))
+            )
+            self.conn.commit()
+
+    def is_finished(self, keyword):
+        with self._lock:
+            row = self.conn.execute("SELECT finished FROM keywords WHERE keyword = ?", (keyword,)).fetchone()
+        return bool(row and row[0])
+
+    def last_page(self, keyword):
+        """最后提交的页码，没有断点时返回 0"""
+        with self._lock:
+            row = self.conn.execute("SELECT MAX(page) FROM pages WHERE keyword = ?", (keyword,)).fetchone()
+        return row[0] or 0
+
+    def resumable(self, keyword, max_pages):
+        """关键词是否有未完成、且在 max_pages 页以内还能继续的断点"""
+        return not self.is_finished(keyword) and 0 < self.last_page(keyword) < max_pages
+
+    def iter_records(self, keyword):
+        """按页码顺序逐页读取已提交的数据"""
+        with self._lock:
+            pages = [
+                row[0] for row in
+                self.conn.execute("SELECT page FROM pages WHERE keyword = ? ORDER BY page", (keyword,))
+            ]
+        for page in pages:
+            with self._lock:
+                row = self.conn.execute(
+                    "SELECT records FROM pages WHERE keyword = ? AND page = ?", (keyword, page)
+                ).fetchone()
+            if row:
+                yield from json.loads(row[0])
+
+    def reset(self, keyword):
+        """清除关键词的断点，下次从第一页开始"""
+        with self._lock:
+            self.conn.execute("DELETE FROM pages WHERE keyword = ?", (keyword,))
+            self.conn.execute("DELETE FROM keywords WHERE keyword = ?", (keyword,))
+            self.conn.commit()
+        logger.debug(f"已清除 '{keyword}' 的爬取断点")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
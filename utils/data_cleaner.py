@@ -23,47 +23,67 @@ class DataCleaner:
             logger.warning("没有数据需要清洗")
             return []
         
-        cleaned_data = []
-        for idx, job in enumerate(job_data):
+        cleaned_data = list(DataCleaner.iter_clean(job_data))
+        logger.info(f"数据清洗完成，处理了 {len(cleaned_data)} 条记录")
+        return cleaned_data
+
+    @staticmethod
+    def iter_clean(job_iter):
+        """
+        逐条清洗职位数据，可直接消费 iter_jobs 等生成器
+
+        Args:
+            job_iter: 原始职位字典的可迭代对象
+
+        Yields:
+            dict: 清洗后的职位数据
+        """
+        for idx, job in enumerate(job_iter):
             if not job:
                 continue
             try:
-                cleaned_job = {}
-                
-                # 职位名称
-                cleaned_job["职位名称"] = DataCleaner._clean_job_title(job.get("职位名称", ""))
-                
-                # 公司名称
-                cleaned_job["公司名称"] = DataCleaner._clean_company_name(job.get("公司名称", ""))
-                
-                # 薪资
-                salary_raw = job.get("薪资", "")
-                cleaned_job["薪资"] = DataCleaner._clean_salary(salary_raw)
-                
-                # 提取薪资范围（单位K）
-                salary_range = DataCleaner._extract_salary_range(salary_raw)
-                if salary_range:
-                    cleaned_job["最低薪资(K)"] = salary_range[0]
-                    cleaned_job["最高薪资(K)"] = salary_range[1]
-                    cleaned_job["平均薪资(K)"] = (salary_range[0] + salary_range[1]) / 2
-                else:
-                    cleaned_job["最低薪资(K)"] = None
-                    cleaned_job["最高薪资(K)"] = None
-                    cleaned_job["平均薪资(K)"] = None
-                
-                # 工作地点，去掉「」和中点，统一为逗号分隔
-                location_raw = job.get("工作地点", "")
-                cleaned_job["工作地点"] = DataCleaner._clean_location(location_raw)
-                
-                # 页码
-                cleaned_job["页码"] = job.get("页码", None)
-                
-                cleaned_data.append(cleaned_job)
+                yield DataCleaner.clean_job(job)
             except Exception as e:
                 logger.error(f"清洗第{idx}条数据异常: {e}")
+
+    @staticmethod
+    def clean_job(job):
+        """清洗单条职位数据"""
+        cleaned_job = {}
         
-        logger.info(f"数据清洗完成，处理了 {len(cleaned_data)} 条记录")
-        return cleaned_data
+        # 职位名称
+        cleaned_job["职位名称"] = DataCleaner._clean_job_title(job.get("职位名称", ""))
+        
+        # 公司名称
+        cleaned_job["公司名称"] = DataCleaner._clean_company_name(job.get("公司名称", ""))
+        
+        # 薪资
+        salary_raw = job.get("薪资", "")
+        cleaned_job["薪资"] = DataCleaner._clean_salary(salary_raw)
+        
+        # 提取薪资范围（单位K）
+        salary_range = DataCleaner._extract_salary_range(salary_raw)
+        if salary_range:
+            cleaned_job["最低薪资(K)"] = salary_range[0]
+            cleaned_job["最高薪资(K)"] = salary_range[1]
+            cleaned_job["平均薪资(K)"] = (salary_range[0] + salary_range[1]) / 2
+        else:
+            cleaned_job["最低薪资(K)"] = None
+            cleaned_job["最高薪资(K)"] = None
+            cleaned_job["平均薪资(K)"] = None
+        
+        # 工作地点，去掉「」和中点，统一为逗号分隔
+        location_raw = job.get("工作地点", "")
+        cleaned_job["工作地点"] = DataCleaner._clean_location(location_raw)
+        
+        # 页码
+        cleaned_job["页码"] = job.get("页码", None)
+
+        # 其余字段（如接口返回的职位ID、更新时间）原样保留
+        for key, value in job.items():
+            cleaned_job.setdefault(key, value)
+
+        return cleaned_job
     
     @staticmethod
     def _clean_job_title(title):
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+驱动程序缓存模块，按本机浏览器主版本号记录 webdriver-manager 解析出的驱动路径，
+命中缓存时跳过 webdriver-manager 的版本解析与联网检查
+"""
+
+import os
+import re
+import json
+import shutil
+import threading
+import subprocess
+from datetime import datetime
+
+from utils.logger import logger
+from config.settings import DRIVER_CACHE_FILE, DRIVER_OFFLINE
+
+# 各浏览器的可执行文件候选名称 / 路径
+BROWSER_BINARIES = {
+    "chrome": [
+        "google-chrome", "google-chrome-stable", "chromium", "chromium-browser",
+        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    ],
+    "firefox": [
+        "firefox", "/Applications/Firefox.app/Contents/MacOS/firefox",
+    ],
+}
+
+# Windows 注册表中的版本号位置
+WINDOWS_REGISTRY_KEYS = {
+    "chrome": [("HKEY_CURRENT_USER", r"Software\Google\Chrome\BLBeacon", "version")],
+    "firefox": [("HKEY_LOCAL_MACHINE", r"SOFTWARE\Mozilla\Mozilla Firefox", "CurrentVersion")],
+}
+
+_version_memo = {}
+_lock = threading.Lock()
+
+
+def browser_major_version(browser_type):
+    """检测本机浏览器主版本号，检测不到返回 None；同一进程内只检测一次"""
+    with _lock:
+        if browser_type not in _version_memo:
+            _version_memo[browser_type] = _detect_version(browser_type)
+        return _version_memo[browser_type]
+
+
+def _detect_version(browser_type):
+    if os.name == "nt":
+        version = _version_from_registry(browser_type)
+        if version:
+            return version
+    for binary in BROWSER_BINARIES.get(browser_type, []):
+        path = shutil.which(binary) or (binary if os.path.isfile(binary) else None)
+        if not path:
+            continue
+        try:
+            output = subprocess.run(
+                [path, "--version"], capture_output=True, text=True, timeout=10
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = re.search(r'(\d+)\.\d+', output)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _version_from_registry(browser_type):
+    try:
+        import winreg
+    except ImportError:
+        return None
+    for hive, key, value_name in WINDOWS_REGISTRY_KEYS.get(browser_type, []):
+        try:
+            with winreg.OpenKey(getattr(winreg, hive), key) as handle:
+                value = winreg.QueryValueEx(handle, value_name)[0]
+        except OSError:
+            continue
+        match = re.match(r'(\d+)\.', str(value))
+        if match:
+            return match.group(1)
+    return None
+
+
+class DriverCache:
+    """驱动路径缓存，JSON 格式：{浏览器: {主版本号: {"path": 驱动路径, "resolved_at": 时间}}}"""
+
+    def __init__(self, path=None, offline=None):
+        self.path = path or DRIVER_CACHE_FILE
+        self.offline = DRIVER_OFFLINE if offline is None else offline
+        self._lock = threading.Lock()
+
+    def resolve(self, browser_type, install):
+        """
+        返回驱动路径
+
+        Args:
+            browser_type: chrome / firefox
+            install: 未命中缓存时调用的安装函数（如 ChromeDriverManager().install），返回驱动路径
+
+        Returns:
+            str: 驱动路径；离线模式下没有可用缓存时返回 None，交给 Selenium 在 PATH 中查找
+        """
+        version = browser_major_version(browser_type)
+        if version is None:
+            # 检测不到版本时无法判断缓存是否过期（如浏览器已升级），不使用缓存
+            logger.debug(f"未检测到 {browser_type} 版本，跳过驱动缓存")
+            return None if self.offline else install()
+
+        with self._lock:
+            entries = self._load().get(browser_type, {})
+
+        entry = entries.get(version)
+        if entry and os.path.isfile(entry["path"]):
+            logger.debug(f"使用缓存的 {browser_type} 驱动（浏览器版本 {version}）: {entry['path']}")
+            return entry["path"]
+
+        if self.offline:
+            fallback = self._latest_existing(entries)
+            if fallback:
+                logger.warning(f"⚠️ 离线模式：没有与浏览器版本 {version} 匹配的驱动，使用最近缓存的 {fallback}")
+            else:
+                logger.warning("⚠️ 离线模式：没有缓存的驱动，交给 Selenium 在 PATH 中查找")
+            return fallback
+
+        driver_path = install()
+        self._store(browser_type, version, driver_path)
+        logger.info(f"🧩 已缓存 {browser_type} 驱动（浏览器版本 {version}）: {driver_path}")
+        return driver_path
+
+    def evict(self, browser_type, driver_path):
+        """移除指向 driver_path 的缓存条目（如驱动与浏览器版本不匹配导致无法创建会话）"""
+        with self._lock:
+            data = self._load()
+            entries = data.get(browser_type, {})
+            stale = [version for version, entry in entries.items() if entry.get("path") == driver_path]
+            if not stale:
+                return
+            for version in stale:
+                del entries[version]
+            self._save(data)
+        logger.warning(f"⚠️ 已移除失效的 {browser_type} 驱动缓存: {driver_path}")
+
+    def _store(self, browser_type, version, driver_path):
+        with self._lock:
+            data = self._load()
+            data.setdefault(browser_type, {})[version] = {
+                "path": driver_path,
+                "resolved_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            self._save(data)
+
+    def _save(self, data):
+        """调用方需持有 self._lock"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取驱动缓存失败，将重新解析: {e}")
+            return {}
+
+    @staticmethod
+    def _latest_existing(entries):
+        existing = [entry for entry in entries.values() if os.path.isfile(entry["path"])]
+        if not existing:
+            return None
+        return max(existing, key=lambda entry: entry.get("resolved_at", ""))["path"]
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+职位指纹索引模块，跨运行记录已爬取过的职位，用于去重和增量爬取时提前结束翻页
+"""
+
+import os
+import re
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime
+
+from config.settings import FINGERPRINT_FILE
+
+# 参与指纹计算的字段
+FINGERPRINT_FIELDS = ("职位名称", "公司名称", "工作地点", "薪资")
+
+
+def job_fingerprint(record):
+    """计算职位指纹：标题、公司、地点、薪资归一化后取 SHA1"""
+    parts = []
+    for field in FINGERPRINT_FIELDS:
+        value = record.get(field) or ""
+        parts.append(re.sub(r'\s+', ' ', str(value)).strip().lower())
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class FingerprintIndex:
+    """基于 SQLite 的持久化职位指纹索引"""
+
+    def __init__(self, path=None):
+        self.path = path or FINGERPRINT_FILE
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen (
+                fp TEXT PRIMARY KEY,
+                keyword TEXT,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def lookup(self, fingerprints):
+        """返回其中已存在于索引中的指纹，不写入"""
+        fingerprints = list(dict.fromkeys(fingerprints))
+        known = set()
+        with self._lock:
+            for i in range(0, len(fingerprints), 500):
+                chunk = fingerprints[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                known.update(
+                    row[0] for row in
+                    self.conn.execute(f"SELECT fp FROM seen WHERE fp IN ({placeholders})", chunk)
+                )
+        return known
+
+    def commit(self, fingerprints, keyword=None):
+        """
+        将指纹写入索引，应在对应职位已成功导出后调用，避免未保存的职位在下次运行中被当作已爬取
+
+        Args:
+            fingerprints: 指纹列表，或 {指纹: 关键词} 字典
+            keyword: fingerprints 为列表时使用的关键词
+        """
+        if not isinstance(fingerprints, dict):
+            fingerprints = dict.fromkeys(fingerprints, keyword)
+        if not fingerprints:
+            return
+
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            self.conn.executemany(
+                "INSERT INTO seen (fp, keyword, first_seen, last_seen) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(fp) DO UPDATE SET last_seen = excluded.last_seen",
+                [(fp, kw, now, now) for fp, kw in fingerprints.items()]
+            )
+            self.conn.commit()
+
+    def __contains__(self, fingerprint):
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM seen WHERE fp = ?", (fingerprint,)).fetchone() is not None
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
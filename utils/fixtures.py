@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+页面录制与回放模块，把爬取过的结果页保存为 gzip 压缩的 JSON Lines 归档，离线回放给解析和清洗代码
+
+基准测试：python -m utils.fixtures [归档路径]
+回放爬取：python -m utils.fixtures [归档路径] --crawl [--keyword 关键词]
+"""
+
+import os
+import gzip
+import json
+import time
+import argparse
+import threading
+from datetime import datetime
+
+from core.parser import JobListParser
+from core.crawler import ZhilianCrawler
+from core.driver import FakeDriver
+from utils.rate_limiter import AdaptivePacer
+from utils.data_cleaner import DataCleaner
+from utils.logger import logger
+from config.settings import FIXTURE_FILE
+
+
+class FixtureRecorder:
+    """结果页录制器，每页一行：url、页码、关键词、时间戳、页面源码"""
+
+    def __init__(self, path=None):
+        self.path = path or FIXTURE_FILE
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.count = 0
+        self._lock = threading.Lock()
+        # 追加模式会产生多段 gzip，读取时 gzip 模块会自动拼接
+        self._file = gzip.open(self.path, 'at', encoding='utf-8')
+
+    def record(self, html, url, page=None, keyword=None):
+        fixture = {
+            "url": url,
+            "page": page,
+            "keyword": keyword,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "html": html,
+        }
+        with self._lock:
+            self._file.write(json.dumps(fixture, ensure_ascii=False) + "\n")
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+                logger.info(f"已录制 {self.count} 个页面到 {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def iter_fixtures(path=None):
+    """逐个读取录制的页面"""
+    with gzip.open(path or FIXTURE_FILE, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def replay_crawl(path=None, keyword=None, pacer=None):
+    """
+    用录制的页面驱动 ZhilianCrawler 完整跑一遍翻页、等待与提取流程，不需要浏览器和网络
+
+    Args:
+        path: 归档路径
+        keyword: 只回放该关键词；为空时回放归档中的全部关键词
+        pacer: 节流器，默认不限速
+
+    Returns:
+        dict: {关键词: 职位数据列表}
+    """
+    fixtures = [f for f in iter_fixtures(path) if f.get("keyword") and (keyword is None or f["keyword"] == keyword)]
+    pacer = pacer or AdaptivePacer(max_rate=0)
+    driver = FakeDriver({fixture["url"]: fixture["html"] for fixture in fixtures})
+    crawler = ZhilianCrawler(driver, pagination_mode="url", fetch_mode="browser", pacer=pacer)
+
+    results = {}
+    for kw in dict.fromkeys(fixture["keyword"] for fixture in fixtures):
+        max_pages = max(fixture["page"] or 1 for fixture in fixtures if fixture["keyword"] == kw)
+        crawler.reset()
+        results[kw] = crawler.search_jobs(kw, max_pages)
+    return results
+
+
+def replay(path=None, parser=None):
+    """回放归档中的全部页面，逐页产出 (录制信息, 解析结果)"""
+    parser = parser or JobListParser()
+    for fixture in iter_fixtures(path):
+        yield fixture, parser.parse(fixture["html"], fixture["page"], fixture["url"])
+
+
+def benchmark(path=None):
+    """离线测量解析与清洗吞吐量"""
+    fixtures = list(iter_fixtures(path))
+    if not fixtures:
+        print("⚠️ 归档中没有录制页面")
+        return None
+
+    parser = JobListParser()
+
+    start = time.perf_counter()
+    parsed = [parser.parse(f["html"], f["page"], f["url"]) for f in fixtures]
+    parse_seconds = time.perf_counter() - start
+
+    records = [record for page in parsed for record in page if record]
+    start = time.perf_counter()
+    cleaned = DataCleaner.clean_job_data(records)
+    clean_seconds = time.perf_counter() - start
+
+    stats = {
+        "页面数": len(fixtures),
+        "职位数": len(records),
+        "清洗后职位数": len(cleaned),
+        "解析耗时(秒)": round(parse_seconds, 3),
+        "解析速度(页/秒)": round(len(fixtures) / parse_seconds, 1) if parse_seconds else None,
+        "清洗耗时(秒)": round(clean_seconds, 3),
+    }
+    for k, v in stats.items():
+        print(f"{k}: {v}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="录制页面的离线基准测试与回放")
+    parser.add_argument("path", nargs="?", default=None, help="归档路径，默认为 FIXTURE_FILE")
+    parser.add_argument("--crawl", action="store_true", help="用录制页面驱动爬虫完整回放翻页与提取流程")
+    parser.add_argument("--keyword", default=None, help="只回放该关键词（配合 --crawl）")
+    args = parser.parse_args()
+
+    if not args.crawl:
+        benchmark(args.path)
+        return
+    start = time.perf_counter()
+    results = replay_crawl(args.path, args.keyword)
+    for kw, records in results.items():
+        print(f"{kw}: {len(records)} 条职位")
+    print(f"回放耗时(秒): {time.perf_counter() - start:.3f}")
+
+
+if __name__ == "__main__":
+    main()
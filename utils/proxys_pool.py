@@ -1,19 +1,333 @@
 import random
 import os
+import json
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from config.settings import PROXY_POOL_FROM_FILE, PROXY_POOL_FILE_PATH, PROXY_POOL_URL
+from requests.adapters import HTTPAdapter
+from utils.logger import logger
+from config.settings import (
+    PROXY_POOL_FROM_FILE, PROXY_POOL_FILE_PATH, PROXY_POOL_URL,
+    PROXY_POOL_BATCH_URL, PROXY_BATCH_SIZE, PROXY_LOW_WATER, PROXY_TTL, PROXY_GET_TIMEOUT,
+    PROXY_HEALTH_CHECK, PROXY_TEST_URL, PROXY_TEST_TIMEOUT, PROXY_CHECK_WORKERS,
+    PROXY_STATS_WINDOW, PROXY_MAX_FAILURES, PROXY_REVALIDATE_INTERVAL,
+    PROXY_BREAKER_COOLDOWN, PROXY_BREAKER_MAX_COOLDOWN,
+    PROXY_SCOREBOARD_FILE, PROXY_SCOREBOARD_SAVE_INTERVAL
+)
+
+
+def proxy_url(proxy):
+    """补全代理协议前缀，文件中的 ip:port 视为 HTTP 代理"""
+    return proxy if "://" in proxy else f"http://{proxy}"
+
+
+class CircuitBreaker:
+    """
+    单个代理的熔断器
+
+    closed: 正常分配；连续失败达到阈值后转为 open
+    open: 冷却期内不再分配；冷却期满后转为 half_open
+    half_open: 只放行一次试探，成功则恢复 closed，失败则重新 open 且冷却期加倍
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold=None, cooldown=None, max_cooldown=None):
+        self.threshold = threshold or PROXY_MAX_FAILURES
+        self.base_cooldown = cooldown or PROXY_BREAKER_COOLDOWN
+        self.max_cooldown = max_cooldown or PROXY_BREAKER_MAX_COOLDOWN
+        self.cooldown = self.base_cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0         # 使用墙上时间，便于跨运行保存
+        self.trial_in_flight = False
+
+    def available(self, now=None):
+        """当前是否可以分配（不改变状态）"""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            return (now or time.time()) - self.opened_at >= self.cooldown
+        return not self.trial_in_flight
+
+    def acquire(self, now=None):
+        """分配前调用：冷却期满的 open 转为 half_open，并占用唯一的试探名额"""
+        if self.state == self.OPEN and self.available(now):
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            self.trial_in_flight = True
+
+    def record(self, ok):
+        """记录一次结果，返回状态是否发生变化"""
+        previous = self.state
+        self.trial_in_flight = False
+        if ok:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.cooldown = self.base_cooldown
+            return previous != self.state
+
+        self.failures += 1
+        if self.state == self.HALF_OPEN:
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            self._open()
+        elif self.state == self.OPEN:
+            # 熔断期间的探测失败，从现在起重新计算冷却期
+            self.opened_at = time.time()
+        elif self.failures >= self.threshold:
+            self._open()
+        return previous != self.state
+
+    def trip(self):
+        """立即熔断"""
+        previous = self.state
+        self.trial_in_flight = False
+        self._open()
+        return previous != self.state
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = time.time()
+
+    def to_dict(self):
+        return {
+            "state": self.state, "failures": self.failures,
+            "opened_at": self.opened_at, "cooldown": self.cooldown,
+        }
+
+    def load(self, data):
+        self.state = data.get("state", self.CLOSED)
+        if self.state == self.HALF_OPEN:
+            # 上次运行中未完成的试探不再有结果，按冷却期已满的 open 处理
+            self.state = self.OPEN
+        self.failures = data.get("failures", 0)
+        self.opened_at = data.get("opened_at", 0.0)
+        self.cooldown = data.get("cooldown", self.base_cooldown)
+
+
+class ProxyStats:
+    """单个代理的滚动统计：最近若干次结果的成功率与平均延迟，以及该代理的熔断器"""
+
+    def __init__(self, window=None):
+        self.results = deque(maxlen=window or PROXY_STATS_WINDOW)
+        self.breaker = CircuitBreaker()
+
+    def record(self, ok, latency=None):
+        self.results.append((ok, latency))
+
+    @property
+    def success_rate(self):
+        if not self.results:
+            return None
+        return sum(1 for ok, _ in self.results if ok) / len(self.results)
+
+    @property
+    def latency(self):
+        latencies = [latency for ok, latency in self.results if ok and latency is not None]
+        return sum(latencies) / len(latencies) if latencies else None
+
+    @property
+    def score(self):
+        """选择权重：成功率越高、延迟越低越大；尚无统计时给中等权重"""
+        rate = self.success_rate
+        if rate is None:
+            return 1.0
+        return rate * rate / max(self.latency or PROXY_TEST_TIMEOUT, 0.05)
+
+    @property
+    def dead(self):
+        """熔断器未处于 closed 状态"""
+        return self.breaker.state != CircuitBreaker.CLOSED
+
+    def to_dict(self):
+        return {"results": [list(result) for result in self.results], "breaker": self.breaker.to_dict()}
+
+    def load(self, data):
+        for ok, latency in data.get("results", []):
+            self.record(ok, latency)
+        self.breaker.load(data.get("breaker", {}))
+
+
+class ProxyValidator:
+    """并发探测代理可用性与延迟"""
+
+    def __init__(self, test_url=None, timeout=None, workers=None):
+        self.test_url = test_url or PROXY_TEST_URL
+        self.timeout = timeout or PROXY_TEST_TIMEOUT
+        self.workers = workers or PROXY_CHECK_WORKERS
+
+    def probe(self, proxy):
+        """通过代理请求测试地址，返回 (是否可用, 延迟秒数)"""
+        url = proxy_url(proxy)
+        started = time.monotonic()
+        try:
+            response = requests.get(
+                self.test_url, proxies={"http": url, "https": url}, timeout=self.timeout
+            )
+            ok = response.status_code < 500
+        except requests.RequestException:
+            return False, None
+        return ok, time.monotonic() - started
+
+    def validate(self, proxies):
+        """并发探测一批代理，返回 {代理: (是否可用, 延迟)}"""
+        proxies = list(proxies)
+        if not proxies:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(proxies))) as executor:
+            return dict(zip(proxies, executor.map(self.probe, proxies)))
+
+
+class RemoteProxyClient:
+    """
+    远程代理池客户端
+
+    通过长连接会话批量获取代理放入本地缓冲区，缓冲区低于低水位时由后台线程补充；
+    get() 只从缓冲区取出，缓冲区有货时不发起任何网络请求。
+    """
+
+    def __init__(self, url=None, batch_url=None, batch_size=None, low_water=None, ttl=None):
+        self.url = url or PROXY_POOL_URL
+        self.batch_url = PROXY_POOL_BATCH_URL if batch_url is None else batch_url
+        self.batch_size = batch_size or PROXY_BATCH_SIZE
+        self.low_water = PROXY_LOW_WATER if low_water is None else low_water
+        self.ttl = ttl or PROXY_TTL
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._buffer = deque()               # (代理, 过期时间)
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._refill = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._refill_loop, name="proxy-prefetch", daemon=True)
+        self._thread.start()
+        self._refill.set()
+
+    def get(self, timeout=None):
+        """取出一个未过期的代理；缓冲区为空时最多等待 timeout 秒，仍没有则返回 None"""
+        timeout = PROXY_GET_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self._available:
+            while True:
+                now = time.monotonic()
+                while self._buffer and self._buffer[0][1] <= now:
+                    self._buffer.popleft()
+                if len(self._buffer) <= self.low_water:
+                    self._refill.set()
+                if self._buffer:
+                    return self._buffer.popleft()[0]
+                remaining = deadline - now
+                if remaining <= 0 or self._closed:
+                    return None
+                self._available.wait(remaining)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._buffer)
+
+    def close(self):
+        with self._available:
+            self._closed = True
+            self._available.notify_all()
+        self._refill.set()
+        self.session.close()
+
+    def fetch_batch(self):
+        """从远程代理池获取一批代理"""
+        if self.batch_url:
+            response = self.session.get(self.batch_url, timeout=5)
+            response.raise_for_status()
+            return self._parse_batch(response)[:self.batch_size]
+
+        proxies = []
+        for _ in range(self.batch_size):
+            try:
+                response = self.session.get(self.url, timeout=5)
+            except requests.RequestException:
+                if not proxies:
+                    raise
+                break
+            if response.ok and response.text.strip():
+                proxies.append(response.text.strip())
+        return proxies
+
+    def _refill_loop(self):
+        while True:
+            self._refill.wait()
+            self._refill.clear()
+            if self._closed:
+                return
+            try:
+                proxies = self.fetch_batch()
+            except Exception as e:
+                logger.warning(f"⚠️ 获取远程代理失败: {e}")
+                # 避免接口故障时空转，稍后由下一次 get() 重新触发
+                time.sleep(1)
+                continue
+
+            expires_at = time.monotonic() + self.ttl
+            with self._available:
+                known = {proxy for proxy, _ in self._buffer}
+                fresh = [proxy for proxy in dict.fromkeys(proxies) if proxy not in known]
+                self._buffer.extend((proxy, expires_at) for proxy in fresh)
+                self._available.notify_all()
+            logger.debug(f"远程代理缓冲区补充 {len(fresh)} 条，当前 {len(self._buffer)} 条")
+
+    @staticmethod
+    def _parse_batch(response):
+        """解析批量接口：JSON 列表（元素为字符串或含 proxy 字段的对象）或每行一个代理的文本"""
+        try:
+            payload = response.json()
+        except ValueError:
+            return [line.strip() for line in response.text.splitlines() if line.strip()]
+        if isinstance(payload, dict):
+            payload = payload.get("data") or payload.get("proxies") or []
+        return [
+            item.get("proxy") if isinstance(item, dict) else str(item)
+            for item in payload
+            if item and (not isinstance(item, dict) or item.get("proxy"))
+        ]
+
 
 class ProxyPoolManager:
-    """代理池管理器，支持从文件或URL获取"""
+    """
+    代理池管理器，支持从文件或URL获取
+
+    每个代理带有熔断器与滚动统计，统计结果保存在记分板文件中，重启后继续沿用；
+    lease(owner) 把代理固定分配给一个浏览器或会话，直到其熔断或被释放。
+    """
 
-    def __init__(self):
+    def __init__(self, validator=None, health_check=None, scoreboard_path=None):
         self.from_file = PROXY_POOL_FROM_FILE
         self.file_path = PROXY_POOL_FILE_PATH
         self.pool_url = PROXY_POOL_URL
         self.proxies = []
+        self.health_check = PROXY_HEALTH_CHECK if health_check is None else health_check
+        self.validator = validator or ProxyValidator()
+        self.stats = {}
+        self.leases = {}             # 租借方 -> 代理
+        self.scoreboard_path = PROXY_SCOREBOARD_FILE if scoreboard_path is None else scoreboard_path
+        self._validated = False
+        self._lock = threading.Lock()
+        self._validate_lock = threading.Lock()   # 保证首次验证只执行一次
+        self._revalidate_thread = None
+        self._stop = threading.Event()
+        self._last_saved = time.monotonic()
+        self.remote = None
 
+        self._load_scoreboard()
         if self.from_file:
             self._load_proxies_from_file()
+        else:
+            self.remote = RemoteProxyClient(self.pool_url)
 
     def _load_proxies_from_file(self):
         """加载本地代理池文本"""
@@ -25,17 +339,185 @@ class ProxyPoolManager:
             self.proxies = [line.strip() for line in f if line.strip()]
         print(f"📄 已加载 {len(self.proxies)} 条代理")
 
+    @property
+    def dead(self):
+        """熔断中的代理"""
+        with self._lock:
+            return {proxy for proxy, stats in self.stats.items() if stats.dead}
+
     def get_proxy(self):
-        """获取一个代理（从文件或API）"""
+        """
+        获取一个代理（从文件或API）
+
+        只在熔断器允许分配的代理中按得分加权选择，已被租借的代理权重按租借数摊薄
+        """
         if self.from_file:
-            if not self.proxies:
+            candidates = self.healthy_proxies() if self.health_check else self.proxies
+            if not candidates:
                 return None
-            return random.choice(self.proxies)
+            with self._lock:
+                now = time.time()
+                candidates = [proxy for proxy in candidates if self._stats(proxy).breaker.available(now)]
+                if not candidates:
+                    return None
+                leased = list(self.leases.values())
+                weights = [self._stats(proxy).score / (1 + leased.count(proxy)) for proxy in candidates]
+                proxy = random.choices(candidates, weights=weights)[0]
+                self._stats(proxy).breaker.acquire(now)
+            return proxy
         else:
-            try:
-                response = requests.get(self.pool_url, timeout=5)
-                if response.ok:
-                    return response.text.strip()
-            except Exception as e:
-                print(f"⚠️ 获取远程代理失败: {e}")
-        return None
+            # 跳过熔断中的代理
+            while True:
+                proxy = self.remote.get()
+                if proxy is None:
+                    return None
+                with self._lock:
+                    breaker = self._stats(proxy).breaker
+                    if breaker.available():
+                        breaker.acquire()
+                        return proxy
+
+    get_random_proxy = get_proxy
+
+    def lease(self, owner):
+        """
+        为租借方（浏览器、会话等）分配固定代理
+
+        同一租借方再次调用时返回同一个代理，除非该代理已熔断，此时换一个新的
+        """
+        with self._lock:
+            proxy = self.leases.get(owner)
+            if proxy is not None and not self._stats(proxy).dead:
+                return proxy
+        if proxy is not None:
+            logger.info(f"🔀 代理 {proxy} 已熔断，为 {owner} 更换代理")
+
+        proxy = self.get_proxy()
+        with self._lock:
+            if proxy is None:
+                self.leases.pop(owner, None)
+            else:
+                self.leases[owner] = proxy
+        return proxy
+
+    def release(self, owner):
+        """租借方结束时释放其代理"""
+        with self._lock:
+            return self.leases.pop(owner, None)
+
+    def healthy_proxies(self):
+        """可分配的代理列表，按得分从高到低排序；首次调用时先完成一次并发验证"""
+        if self.health_check and not self._validated:
+            # 并发的首次调用只有一个执行验证，其余等待其完成后直接使用结果
+            with self._validate_lock:
+                if not self._validated:
+                    self.validate()
+        with self._lock:
+            now = time.time()
+            alive = [proxy for proxy in self.proxies if self._stats(proxy).breaker.available(now)]
+            return sorted(alive, key=lambda proxy: self._stats(proxy).score, reverse=True)
+
+    def validate(self, proxies=None):
+        """并发探测代理并更新统计，失效的熔断、恢复的放回；远程模式下默认探测已使用过的代理"""
+        if proxies is None:
+            with self._lock:
+                proxies = self.proxies if self.from_file else list(self.stats)
+        targets = list(proxies)
+        started = time.monotonic()
+        results = self.validator.validate(targets)
+        for proxy, (ok, latency) in results.items():
+            self.report(proxy, ok, latency)
+        self._validated = True
+        logger.info(
+            f"🩺 代理验证完成：{sum(ok for ok, _ in results.values())}/{len(results)} 可用，"
+            f"耗时 {time.monotonic() - started:.1f} 秒"
+        )
+        return results
+
+    def report(self, proxy, ok, latency=None):
+        """反馈一次代理使用结果（探测或实际使用），据此熔断或恢复代理"""
+        with self._lock:
+            stats = self._stats(proxy)
+            stats.record(ok, latency)
+            changed = stats.breaker.record(ok)
+            state = stats.breaker.state
+        if changed and state == CircuitBreaker.OPEN:
+            logger.info(f"🪦 代理已熔断: {proxy}（冷却 {stats.breaker.cooldown} 秒）")
+        elif changed and state == CircuitBreaker.CLOSED:
+            logger.info(f"💚 代理已恢复: {proxy}")
+        if time.monotonic() - self._last_saved >= PROXY_SCOREBOARD_SAVE_INTERVAL:
+            self.save_scoreboard()
+
+    def remove_proxy(self, proxy):
+        """立即熔断代理（如浏览器通过该代理启动失败），冷却期满后再试探"""
+        with self._lock:
+            stats = self._stats(proxy)
+            stats.record(False)
+            stats.breaker.trip()
+        logger.info(f"🪦 代理已熔断: {proxy}")
+
+    def start_background_validation(self, interval=None):
+        """启动后台线程，定期重新验证全部代理（包括熔断中的）；未开启健康检查时不启动"""
+        if not self.health_check:
+            return
+        if self._revalidate_thread and self._revalidate_thread.is_alive():
+            return
+        interval = interval or PROXY_REVALIDATE_INTERVAL
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(interval):
+                try:
+                    self.validate()
+                except Exception as e:
+                    logger.warning(f"后台代理验证失败: {e}")
+
+        self._revalidate_thread = threading.Thread(target=loop, name="proxy-revalidate", daemon=True)
+        self._revalidate_thread.start()
+
+    def stop_background_validation(self):
+        self._stop.set()
+
+    def close(self):
+        """停止后台任务并保存记分板"""
+        self.stop_background_validation()
+        if self.remote:
+            self.remote.close()
+        self.save_scoreboard()
+
+    def save_scoreboard(self):
+        """把各代理的统计与熔断状态写入记分板文件"""
+        if not self.scoreboard_path:
+            return
+        with self._lock:
+            data = {proxy: stats.to_dict() for proxy, stats in self.stats.items()}
+            self._last_saved = time.monotonic()
+        try:
+            os.makedirs(os.path.dirname(self.scoreboard_path) or ".", exist_ok=True)
+            tmp_path = f"{self.scoreboard_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.scoreboard_path)
+        except OSError as e:
+            logger.warning(f"保存代理记分板失败: {e}")
+
+    def _load_scoreboard(self):
+        if not self.scoreboard_path:
+            return
+        try:
+            with open(self.scoreboard_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取代理记分板失败，将重新统计: {e}")
+            return
+        for proxy, entry in data.items():
+            self._stats(proxy).load(entry)
+        logger.info(f"📋 已加载 {len(data)} 个代理的历史记分")
+
+    def _stats(self, proxy):
+        """调用方需持有 self._lock"""
+        if proxy not in self.stats:
+            self.stats[proxy] = ProxyStats()
+        return self.stats[proxy]
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+速率限制工具模块，提供按主机划分、可自适应调整的令牌桶节流器，供多个爬虫线程共享
+"""
+
+import time
+import random
+import threading
+from urllib.parse import urlsplit
+
+from utils.logger import logger
+from config.settings import (
+    PACER_RATE, PACER_MIN_RATE, PACER_MAX_RATE, PACER_BURST,
+    PACER_JITTER, PACER_SLOW_THRESHOLD, PACER_RECOVER_STEP
+)
+
+
+class TokenBucket:
+    """线程安全的令牌桶"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """预订一个令牌，返回需要等待的秒数"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class AdaptivePacer:
+    """
+    按主机节流的自适应限速器
+
+    每个主机一个令牌桶；响应变慢、页面被刷新或遇到验证码时降低速率（乘性减小），
+    响应正常时逐步恢复（加性增加），速率始终限制在 [min_rate, max_rate] 之间。
+    max_rate 显式传入 0 或负数时表示不限速，wait / record 均不做任何事。
+    """
+
+    def __init__(self, rate=None, min_rate=None, max_rate=None, burst=None, jitter=None,
+                 slow_threshold=None, recover_step=None):
+        self.unlimited = max_rate is not None and max_rate <= 0
+        self.max_rate = float("inf") if self.unlimited else (max_rate or PACER_MAX_RATE)
+        self.min_rate = min(min_rate or PACER_MIN_RATE, self.max_rate)
+        self.initial_rate = min(rate or PACER_RATE, self.max_rate)
+        self.burst = burst or PACER_BURST
+        self.jitter = PACER_JITTER if jitter is None else jitter
+        self.slow_threshold = slow_threshold or PACER_SLOW_THRESHOLD
+        self.recover_step = recover_step or PACER_RECOVER_STEP
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host):
+        """阻塞直到允许向 host 发出下一次请求，host 也可以是完整 URL"""
+        if self.unlimited:
+            return
+        delay = self._bucket(host).reserve()
+        if self.jitter:
+            delay += random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def record(self, host, latency=None, ok=True, captcha=False, refreshed=False):
+        """反馈一次请求的结果，用于调整该主机的速率"""
+        if self.unlimited:
+            return
+        bucket = self._bucket(host)
+        with bucket.lock:
+            old_rate = bucket.rate
+            if captcha:
+                bucket.rate = max(self.min_rate, bucket.rate / 4)
+            elif not ok or refreshed or (latency is not None and latency > self.slow_threshold):
+                bucket.rate = max(self.min_rate, bucket.rate / 2)
+            else:
+                bucket.rate = min(self.max_rate, bucket.rate + self.recover_step)
+            new_rate = bucket.rate
+
+        if new_rate < old_rate:
+            logger.info(f"🐢 {self._host(host)} 降速: {old_rate:.2f} -> {new_rate:.2f} 次/秒")
+
+    def rate(self, host):
+        """当前速率（次/秒），不限速时为 inf"""
+        if self.unlimited:
+            return self.max_rate
+        return self._bucket(host).rate
+
+    def _bucket(self, host):
+        host = self._host(host)
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.initial_rate, self.burst)
+            return self._buckets[host]
+
+    @staticmethod
+    def _host(host):
+        return urlsplit(host).netloc or host
+
+
+# 全局共享节流器，所有爬虫默认共用
+shared_pacer = AdaptivePacer()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+流式输出模块，逐条写入职位数据，配合 iter_jobs / DataCleaner.iter_clean 使用，内存占用与数据量无关
+"""
+
+import os
+import csv
+import json
+
+from utils.logger import logger
+
+
+class JsonLinesSink:
+    """JSON Lines 输出，每行一条职位数据"""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+            logger.info(f"已写入 {self.count} 条数据到 {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class CsvSink(JsonLinesSink):
+    """CSV 输出，表头取第一条数据的字段，之后多出的字段忽略"""
+
+    def __init__(self, path, fieldnames=None):
+        super().__init__(path)
+        self.fieldnames = fieldnames
+        self._writer = None
+
+    def write(self, record):
+        if self._writer is None:
+            self._writer = csv.DictWriter(
+                self._file, fieldnames=self.fieldnames or list(record), extrasaction="ignore"
+            )
+            if self._file.tell() == 0:
+                self._writer.writeheader()
+        self._writer.writerow(record)
+        self.count += 1
+
+
+def drain_to(records, *sinks, flush_every=100):
+    """
+    将记录流写入一个或多个输出
+
+    Args:
+        records: 职位字典的可迭代对象
+        sinks: 输出对象（需实现 write/flush）
+        flush_every: 每写入多少条刷新一次
+
+    Returns:
+        int: 写入条数
+    """
+    count = 0
+    for record in records:
+        for sink in sinks:
+            sink.write(record)
+        count += 1
+        if count % flush_every == 0:
+            for sink in sinks:
+                sink.flush()
+    for sink in sinks:
+        sink.flush()
+    return count